@@ -2,16 +2,13 @@
 import asyncio
 from typing import Dict, Any
 from agent.schemas import Plan
-from backend.tools import newsapi, normalize, classify, summarize, ner_geo, present
+from backend.tools import newsapi, dag
 
 async def run_pipeline(topic: str, language: str = "en") -> Dict[str, Any]:
     plan = Plan(topic=topic, is_conflict=False, language=language)
     raw = await newsapi.search_today(q=plan.topic, language=plan.language or "en")
-    norm = normalize.normalize_articles(raw)
-    tagged = classify.classify_local_foreign(norm)
-    summed = summarize.summarize(tagged)
-    enriched = ner_geo.add_locations(summed)
-    stacks = present.stack_by_country(enriched)
+    result = await dag.run_article_pipeline(raw, enhance=False, perspective=False)
+    stacks = result["stacks"]
     return {"stacks": stacks, "disclaimer": "AI-generated elements — verify originals."}
 
 if __name__ == "__main__":
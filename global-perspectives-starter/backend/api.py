@@ -6,17 +6,37 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from fastapi import FastAPI, HTTPException, Query, Form
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Optional
+from typing import Optional, List, Tuple
 import asyncio
+import json
 
 from backend.schemas import SearchResponse
-from backend.tools import newsapi, normalize, classify, summarize, ner_geo, present
+from backend.responses import (
+    search_payload, render_search, parse_fields, wants_any, decode_cursor,
+    StaleCursorError, sse_event, ndjson_line,
+)
+from backend.services.search_stream import stream_enhanced_search
+from backend.tools import newsapi, ner_geo, present, dag
 from backend.services.bedrock_service import bedrock_service
 from backend.services.lambda_service import lambda_service
 from backend.services.ai_orchestrator import ai_orchestrator
-app = FastAPI(title="Global Perspectives API", version="0.1.0")
+from backend.services.resilience import provider_metrics, render_prometheus
+from backend.services.trending_refresher import trending_refresher
+from backend.services.singleflight import search_flights, search_key
+from backend.services.country_window import country_window
+from contextlib import asynccontextmanager
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Precompute trending topics in the background; requests read the snapshot
+    if os.getenv("TRENDING_REFRESH_ENABLED", "true").lower() == "true":
+        trending_refresher.start()
+    yield
+    await trending_refresher.stop()
+
+app = FastAPI(title="Global Perspectives API", version="0.1.0", lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -31,13 +51,20 @@ app.add_middleware(
 async def healthz():
     return {"ok": True}
 
+@app.get("/api/metrics/providers")
+async def get_provider_metrics(format: str = Query("json", pattern="^(json|prometheus)$")):
+    """Retry, circuit breaker and hedging metrics for each LLM provider"""
+    metrics = provider_metrics()
+    if format == "prometheus":
+        return PlainTextResponse(render_prometheus(metrics))
+    return {"providers": metrics}
+
 # Gemini-only topics endpoint (no articles fetched)
 @app.get("/api/topics/gemini")
 async def get_gemini_topics():
     try:
-        from backend.services.gemini_verification_service import gemini_verification
-        topics = gemini_verification.discover_trending_topics()
-        return {"topics": topics, "ai_powered": True}
+        snapshot = await trending_refresher.get()
+        return {"topics": snapshot["topics"], "ai_powered": True, "refreshed_at": snapshot["refreshed_at"]}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching Gemini topics: {str(e)}")
 
@@ -45,20 +72,15 @@ async def get_gemini_topics():
 async def get_headlines(language: Optional[str] = "en"):
     """Get today's top headlines using AI-powered discovery"""
     try:
-        # Use AI orchestrator for intelligent news discovery
-        ai_result = ai_orchestrator.get_todays_headlines()
+        # AI-discovered topics are precomputed by the trending refresher
+        snapshot = await trending_refresher.get(language)
+        ai_result = snapshot["headlines"]
         
         if not ai_result.get('success'):
             # Fallback to traditional method if AI fails
             raw = await newsapi.get_todays_headlines(language=language)
-            normalized = normalize.normalize_articles(raw)
-            tagged = classify.classify_local_foreign(normalized)
-            summarized = summarize.summarize(tagged)
-            enriched = ner_geo.add_locations(summarized)
-            
-            # Generate enhanced metadata and analysis
-            enhanced_articles = present.enhance_articles_metadata(enriched)
-            stacks = present.stack_by_country(enhanced_articles)
+            result = await dag.run_article_pipeline(raw, perspective=False)
+            stacks = result["stacks"]
             
             # If traditional headlines produced no stacks, build stacks from search queries
             if not stacks:
@@ -72,63 +94,25 @@ async def get_headlines(language: Optional[str] = "en"):
                 for q in default_queries:
                     try:
                         sr = await newsapi.search_today(q=q, language=language)
-                        sr_norm = normalize.normalize_articles(sr)
-                        sr_tagged = classify.classify_local_foreign(sr_norm)
-                        sr_sum = summarize.summarize(sr_tagged)
-                        sr_enriched = ner_geo.add_locations(sr_sum)
-                        collected_articles.extend(sr_enriched)
+                        sr_result = await dag.run_article_pipeline(
+                            sr, enhance=False, stack=False, perspective=False
+                        )
+                        collected_articles.extend(sr_result["articles"])
                     except Exception:
                         continue
                 if collected_articles:
-                    enhanced_articles = present.enhance_articles_metadata(collected_articles)
+                    enhanced_articles = present.enhance_articles_metadata(collected_articles, copy=False)
                     stacks = present.stack_by_country(enhanced_articles)
             
             # Build traditional response
-            resp = SearchResponse(
-                stacks=stacks, 
-                origin_country=None, 
-                map=None, 
-                trending=None
-            )
-            return resp
+            return render_search(search_payload(stacks))
         
         # Process AI-discovered topics into the expected format
         enhanced_articles = []
         stacks_dict = {}
 
-        # If Gemini topics have no articles yet, fetch via NewsAPI using keywords
+        # Topics already carry their NewsAPI-fallback articles from the snapshot
         ai_topics = ai_result.get('topics', [])
-        for topic in ai_topics:
-            if not topic.get('articles'):
-                topic_articles = []
-                keywords = topic.get('search_keywords', []) or [topic.get('title', '')]
-                regions = topic.get('regions', [])
-                region = regions[0] if regions else 'Global'
-                try:
-                    # Use first keyword to fetch a small set of fresh articles
-                    kw = (keywords[0] if keywords else topic.get('title', 'world')) or 'world'
-                    raw = await newsapi.search_today(q=kw, language=language)
-                    for art in (raw[:6] if raw else []):
-                        source_name = art.get('source', {}).get('name') or art.get('source_name', '')
-                        topic_articles.append({
-                            'title': art.get('title', ''),
-                            'description': art.get('description', ''),
-                            'content': art.get('content', ''),
-                            'url': art.get('url', ''),
-                            'source_name': source_name,
-                            'publish_date': art.get('publishedAt', ''),
-                            'image_url': art.get('urlToImage', ''),
-                            'author': art.get('author', ''),
-                            'language': language,
-                            'word_count': 0,
-                            'region': region,
-                            'verification_analysis': {}
-                        })
-                except Exception:
-                    # Keep topic articles empty if fetching fails
-                    topic_articles = []
-                topic['articles'] = topic_articles
-
         for topic in ai_topics:
             for article in topic.get('articles', []):
                 # Convert AI article format to expected format
@@ -187,59 +171,78 @@ async def get_headlines(language: Optional[str] = "en"):
         }
         
         # Build AI-enhanced response
-        resp = SearchResponse(
-            stacks=stacks, 
-            origin_country=None, 
-            map=None, 
-            trending=None
-        )
-        return resp
+        return render_search(search_payload(stacks))
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching headlines: {str(e)}")
 
+def _cursor_offset(cursor: Optional[str], key) -> Tuple[int, Optional[str]]:
+    """(offset, result version) of a request's cursor; 400 if it is invalid"""
+    try:
+        return decode_cursor(cursor, key)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @app.get("/api/search", response_model=SearchResponse)
-async def search(q: str = Query(..., min_length=2), language: Optional[str] = "en"):
+async def search(q: str = Query(..., min_length=2), language: Optional[str] = "en", format: Optional[str] = "full",
+                 fields: Optional[str] = None, cursor: Optional[str] = None,
+                 limit: Optional[int] = Query(None, ge=1, le=100)):
+    """
+    Search today's news. Optional cursor/limit paginate the stacks, fields=
+    projects articles to a comma-separated field list (location NER is only
+    run when a location field is requested) and format=compact lists each
+    article once.
+    """
+    projection = parse_fields(fields)
+    offset, version = _cursor_offset(cursor, search_key("search", q, language))
     try:
-        # Fetch and process articles
-        raw = await newsapi.search_today(q=q, language=language)
-        normalized = normalize.normalize_articles(raw)
-        tagged = classify.classify_local_foreign(normalized)
-        summarized = summarize.summarize(tagged)
-        enriched = ner_geo.add_locations(summarized)  # no-op placeholder
-        
-        # Generate enhanced metadata and analysis
-        enhanced_articles = present.enhance_articles_metadata(enriched)
-        stacks = present.stack_by_country(enhanced_articles)
-        perspective_summary = present.generate_perspective_summary(enhanced_articles)
-        
-        # Build enhanced response
-        resp = SearchResponse(
-            stacks=stacks, 
-            origin_country=None, 
-            map=None, 
-            trending=None
-        )
-        
-        # Add enhanced metadata to response
-        response_data = resp.model_dump()
-        response_data.update({
-            "perspective_summary": perspective_summary,
-            "articles": enhanced_articles,  # Include articles in regular search
-            "enhanced_articles": enhanced_articles,
-            "query_metadata": {
-                "query": q,
-                "language": language,
-                "total_articles": len(enhanced_articles),
-                "processing_timestamp": None  # Could add timestamp if needed
-            }
-        })
-        
-        return JSONResponse(response_data)
+        with_locations = wants_any(projection, ner_geo.LOCATION_FIELDS)
+        response_data = await _cached_search(q, language, with_locations)
+        return render_search(response_data, format, projection, offset, limit,
+                             search_key("search", q, language), version)
+    except StaleCursorError as e:
+        raise HTTPException(status_code=410, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _cached_search(q: str, language: Optional[str], with_locations: bool = True) -> dict:
+    # Identical concurrent searches share one pipeline run
+    return await search_flights.do(
+        search_key("search", q, language) + (with_locations,),
+        lambda: _search_payload(q, language, with_locations)
+    )
+
+
+async def _search_payload(q: str, language: Optional[str], with_locations: bool = True) -> dict:
+    """Run the NewsAPI pipeline for a query and build the search response body"""
+    # Fetch and process articles
+    raw = await newsapi.search_today(q=q, language=language)
+    result = await dag.run_article_pipeline(raw, locations=with_locations)
+    enhanced_articles = result["articles"]
+    stacks = result["stacks"]
+    perspective_summary = result["perspective_summary"]
+    
+    # Build enhanced response
+    response_data = search_payload(stacks)
+    
+    # Add enhanced metadata to response
+    response_data.update({
+        "perspective_summary": perspective_summary,
+        "articles": enhanced_articles,  # Include articles in regular search
+        "enhanced_articles": enhanced_articles,
+        "query_metadata": {
+            "query": q,
+            "language": language,
+            "total_articles": len(enhanced_articles),
+            "processing_timestamp": None  # Could add timestamp if needed
+        }
+    })
+    
+    return response_data
+
+
 @app.post("/api/test/gemini")
 async def test_gemini_only(text: str = Form(...)):
     """
@@ -273,116 +276,129 @@ async def test_gemini_only(text: str = Form(...)):
         )
 
 @app.get("/api/search/ai")
-async def search_ai(q: str = Query(..., min_length=2), language: Optional[str] = "en"):
+async def search_ai(q: str = Query(..., min_length=2), language: Optional[str] = "en", format: Optional[str] = "full"):
     """AI-powered search using ChatGPT discovery and Gemini verification"""
     try:
-        # Use AI orchestrator for intelligent search
-        ai_result = ai_orchestrator.search_news_by_topic(q)
-        
-        if not ai_result.get('success') or ai_result.get('total_articles', 0) == 0:
-            # Fallback to traditional search if AI fails or returns no results
-            return await search(q=q, language=language)
-        
-        # Process AI search results into the expected format
-        enhanced_articles = []
-        stacks_dict = {}
-        
-        for article in ai_result.get('articles', []):
-            # Convert AI article format to expected format
-            enhanced_article = {
-                'title': article.get('title', ''),
-                'description': article.get('description', ''),
-                'content': article.get('content', ''),
-                'url': article.get('url', ''),
-                'source': article.get('source_name', ''),
-                'publishedAt': article.get('publish_date', ''),
-                'urlToImage': article.get('image_url', ''),
-                'author': article.get('author', ''),
-                'language': article.get('language', language),
-                'word_count': article.get('word_count', 0),
-                'ai_perspective': article.get('perspective', {}),
-                'ai_source_info': article.get('source_info', {}),
-                'ai_powered': True
-            }
-            enhanced_articles.append(enhanced_article)
-            
-            # Group by perspective region for stacks
-            perspective = article.get('perspective', {})
-            region = perspective.get('region', 'Unknown')
-            if region not in stacks_dict:
-                stacks_dict[region] = []
-            stacks_dict[region].append(enhanced_article)
-        
-        # Convert stacks dictionary to list format expected by SearchResponse
-        stacks = []
-        for region, articles in stacks_dict.items():
-            stack_data = {
-                "origin_country": region,
-                "local": articles,  # For AI results, treat all as local to the region
-                "foreign_by_country": {},
-                "regional": [],
-                "neutral": [],
-                "statistics": {
-                    "total_articles": len(articles),
-                    "local_count": len(articles),
-                    "foreign_count": 0,
-                    "regional_count": 0,
-                    "neutral_count": 0
-                }
-            }
-            stacks.append(stack_data)
-        
-        # Generate AI-powered perspective summary
-        perspective_summary = {
-            'query': ai_result.get('query', q),
-            'keywords': ai_result.get('keywords', []),
-            'perspectives': ai_result.get('perspectives', []),
-            'total_articles': ai_result.get('total_articles', 0),
-            'verification_analysis': ai_result.get('verification_analysis', {}),
-            'fact_check': ai_result.get('fact_check', {}),
-            'regions_covered': list(stacks_dict.keys()),
-            'ai_powered': True,
-            'searched_at': ai_result.get('searched_at', '')
-        }
-        
-        # Build AI-enhanced response
-        resp = SearchResponse(
-            stacks=stacks, 
-            origin_country=None, 
-            map=None, 
-            trending=None
+        # Identical concurrent searches share one AI fan-out
+        response_data = await search_flights.do(
+            search_key("search_ai", q, language), lambda: _search_ai_payload(q, language)
         )
-        
-        # Add AI metadata to response
-        response_data = resp.model_dump()
-        response_data.update({
-            "perspective_summary": perspective_summary,
-            "articles": enhanced_articles,
-            "enhanced_articles": enhanced_articles,
-            "ai_metadata": {
-                "query": q,
-                "language": language,
-                "total_articles": len(enhanced_articles),
-                "ai_powered": True,
-                "service_used": "ai_orchestrator",
-                "processing_timestamp": ai_result.get('searched_at', '')
-            }
-        })
-        
-        return JSONResponse(response_data)
+        return render_search(response_data, format)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AI search failed: {str(e)}")
 
+
+async def _search_ai_payload(q: str, language: Optional[str]) -> dict:
+    """Run AI discovery for a query and build the search response body"""
+    # Use AI orchestrator for intelligent search
+    ai_result = await ai_orchestrator.search_news_by_topic_async(q)
+    
+    if not ai_result.get('success') or ai_result.get('total_articles', 0) == 0:
+        # Fallback to traditional search if AI fails or returns no results
+        return await _cached_search(q, language)
+    
+    # Process AI search results into the expected format
+    enhanced_articles = []
+    stacks_dict = {}
+    
+    for article in ai_result.get('articles', []):
+        # Convert AI article format to expected format
+        enhanced_article = {
+            'title': article.get('title', ''),
+            'description': article.get('description', ''),
+            'content': article.get('content', ''),
+            'url': article.get('url', ''),
+            'source': article.get('source_name', ''),
+            'publishedAt': article.get('publish_date', ''),
+            'urlToImage': article.get('image_url', ''),
+            'author': article.get('author', ''),
+            'language': article.get('language', language),
+            'word_count': article.get('word_count', 0),
+            'ai_perspective': article.get('perspective', {}),
+            'ai_source_info': article.get('source_info', {}),
+            'ai_powered': True
+        }
+        enhanced_articles.append(enhanced_article)
+        
+        # Group by perspective region for stacks
+        perspective = article.get('perspective', {})
+        region = perspective.get('region', 'Unknown')
+        if region not in stacks_dict:
+            stacks_dict[region] = []
+        stacks_dict[region].append(enhanced_article)
+    
+    # Convert stacks dictionary to list format expected by SearchResponse
+    stacks = []
+    for region, articles in stacks_dict.items():
+        stack_data = {
+            "origin_country": region,
+            "local": articles,  # For AI results, treat all as local to the region
+            "foreign_by_country": {},
+            "regional": [],
+            "neutral": [],
+            "statistics": {
+                "total_articles": len(articles),
+                "local_count": len(articles),
+                "foreign_count": 0,
+                "regional_count": 0,
+                "neutral_count": 0
+            }
+        }
+        stacks.append(stack_data)
+    
+    # Generate AI-powered perspective summary
+    perspective_summary = {
+        'query': ai_result.get('query', q),
+        'keywords': ai_result.get('keywords', []),
+        'perspectives': ai_result.get('perspectives', []),
+        'total_articles': ai_result.get('total_articles', 0),
+        'verification_analysis': ai_result.get('verification_analysis', {}),
+        'fact_check': ai_result.get('fact_check', {}),
+        'regions_covered': list(stacks_dict.keys()),
+        'ai_powered': True,
+        'searched_at': ai_result.get('searched_at', '')
+    }
+    
+    # Build AI-enhanced response
+    response_data = search_payload(stacks)
+    
+    # Add AI metadata to response
+    response_data.update({
+        "perspective_summary": perspective_summary,
+        "articles": enhanced_articles,
+        "enhanced_articles": enhanced_articles,
+        "ai_metadata": {
+            "query": q,
+            "language": language,
+            "total_articles": len(enhanced_articles),
+            "ai_powered": True,
+            "service_used": "ai_orchestrator",
+            "processing_timestamp": ai_result.get('searched_at', '')
+        }
+    })
+    
+    return response_data
+
 @app.post("/api/analyze/credibility")
 async def analyze_credibility(url: str = Form(...)):
     """Analyze the credibility of a specific article using AI"""
     try:
-        analysis = ai_orchestrator.analyze_article_credibility(url)
+        analysis = await ai_orchestrator.analyze_article_credibility_async(url)
         return analysis
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Credibility analysis failed: {str(e)}")
 
+@app.post("/api/analyze/articles")
+async def analyze_articles_batch(articles: List[dict]):
+    """Verify many articles with batched Gemini prompts; verdicts are keyed by article ID"""
+    try:
+        from backend.services.gemini_verification_service import gemini_verification
+        verdicts = await gemini_verification.verify_articles_batch_async(articles)
+        return {"verdicts": verdicts, "total_articles": len(articles)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch verification failed: {str(e)}")
+
 @app.get("/api/lambda/test")
 async def test_lambda_connection():
     """Test the Lambda service connection via GraphQL"""
@@ -432,39 +448,60 @@ async def generate_bedrock_summary(article: dict):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Bedrock summary proxy failed: {str(e)}")
 
+@app.post("/api/bedrock/summary/stream")
+async def stream_bedrock_summary(article: dict):
+    """Stream an article summary from the Bedrock summarization agent as server-sent events"""
+    title = article.get("title", "")
+    description = article.get("description", "")
+
+    async def event_stream():
+        try:
+            async for text in bedrock_service.stream_summary(title, description):
+                yield f"data: {json.dumps({'text': text})}\n\n"
+            yield f"event: done\ndata: {json.dumps({'service': 'bedrock_direct'})}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'detail': f'Bedrock summary stream failed: {str(e)}'})}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/api/search/enhanced", response_model=SearchResponse)
-async def search_enhanced(q: str = Query(..., min_length=2), language: Optional[str] = "en", use_lambda: bool = False):
-    """Enhanced search with optional Lambda service integration"""
+async def search_enhanced(q: str = Query(..., min_length=2), language: Optional[str] = "en", use_lambda: bool = False,
+                          format: Optional[str] = "full", fields: Optional[str] = None, cursor: Optional[str] = None,
+                          limit: Optional[int] = Query(None, ge=1, le=100)):
+    """Enhanced search with optional Lambda service integration (same paging/fields/format options as /api/search)"""
+    projection = parse_fields(fields)
+    offset, version = _cursor_offset(cursor, search_key("search_enhanced", q, language))
     try:
         # Fetch and process articles
         raw = await newsapi.search_today(q=q, language=language)
-        normalized = normalize.normalize_articles(raw)
-        tagged = classify.classify_local_foreign(normalized)
-        summarized = summarize.summarize(tagged)
-        enriched = ner_geo.add_locations(summarized)
         
         # Choose service based on parameter
         if use_lambda:
             # Use Lambda service for AI processing
-            enhanced_articles = await lambda_service.batch_process_articles(enriched)
+            ai_summaries = dag.io_enrichment("ai_summary", lambda_service.summary_fields)
             service_used = "lambda_graphql"
         else:
             # Use existing Bedrock service
-            enhanced_articles = await bedrock_service.batch_process_articles(enriched)
+            ai_summaries = dag.io_enrichment("ai_summary", bedrock_service.summary_fields)
             service_used = "bedrock_direct"
         
-        # Generate enhanced metadata and analysis
-        enhanced_articles = present.enhance_articles_metadata(enhanced_articles)
-        stacks = present.stack_by_country(enhanced_articles)
-        perspective_summary = present.generate_perspective_summary(enhanced_articles)
+        # AI summaries overlap with classification and NER; location NER is
+        # the heaviest enrichment, so it is skipped unless requested
+        result = await dag.run_article_pipeline(
+            raw,
+            locations=wants_any(projection, ner_geo.LOCATION_FIELDS),
+            enrichments=[ai_summaries]
+        )
+        enhanced_articles = result["articles"]
+        stacks = result["stacks"]
+        perspective_summary = result["perspective_summary"]
         
         # Build enhanced response
-        resp = SearchResponse(
-            stacks=stacks, 
-            origin_country=None, 
-            map=None, 
-            trending=None
-        )
+        response_data = search_payload(stacks)
         
         # Debug logging before response
         if enhanced_articles:
@@ -476,7 +513,6 @@ async def search_enhanced(q: str = Query(..., min_length=2), language: Optional[
                 print(f"DEBUG: Detected locations: {first_article['detected_locations']}")
         
         # Add enhanced metadata to response
-        response_data = resp.model_dump()
         response_data.update({
             "perspective_summary": perspective_summary,
             "enhanced_articles": enhanced_articles,
@@ -489,9 +525,52 @@ async def search_enhanced(q: str = Query(..., min_length=2), language: Optional[
             }
         })
         
-        return JSONResponse(response_data)
+        return render_search(response_data, format, projection, offset, limit,
+                             search_key("search_enhanced", q, language), version)
+    except StaleCursorError as e:
+        raise HTTPException(status_code=410, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/search/enhanced/stream")
+async def search_enhanced_stream(q: str = Query(..., min_length=2), language: Optional[str] = "en",
+                                 use_lambda: bool = False, locations: bool = True,
+                                 format: Optional[str] = Query("sse", pattern="^(sse|ndjson)$")):
+    """
+    Streaming /api/search/enhanced. Emits an `articles` event with the
+    compact payload (articles_by_id + stacks of IDs) once articles are
+    classified, then one `patch` event per article as locations and AI
+    summaries complete, then `done`. format=ndjson emits the same events as
+    {"event", "data"} lines.
+    """
+    encode = ndjson_line if format == "ndjson" else sse_event
+
+    async def event_stream():
+        try:
+            async for event, data in stream_enhanced_search(q, language, use_lambda, with_locations=locations):
+                yield encode(event, data)
+        except Exception as e:
+            yield encode("error", {"detail": f"Search stream failed: {str(e)}"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="application/x-ndjson" if format == "ndjson" else "text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/api/countries/last24h")
+async def get_rolling_countries():
+    """Origin countries covered in the last 24 hours, maintained by the batch pipeline"""
+    return {"countries": country_window.countries()}
+
+@app.get("/api/countries/{country}/last24h")
+async def get_rolling_country(country: str):
+    """Perspective statistics for one origin country over the last 24 hours"""
+    summary = country_window.get(country)
+    if summary is None:
+        raise HTTPException(status_code=404, detail=f"No articles from {country} in the last 24 hours")
+    return {"origin_country": country.upper(), **summary}
+
 @app.get("/config/maps-key")
 async def get_maps_key():
     """Return Google Maps API key from environment for frontend use."""
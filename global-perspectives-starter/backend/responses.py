@@ -0,0 +1,299 @@
+"""
+Fast JSON responses
+
+ORJSONResponse-style response class used by the search endpoints, plus a
+payload builder that produces the SearchResponse shape as a plain dict so
+large responses are not copied through model_dump() before serialization.
+render_search() applies the opt-in cursor pagination, ?fields= projection
+and ?format=compact (each article listed once) to a cached payload. orjson
+is optional; without it responses fall back to the stdlib encoder.
+"""
+
+import os
+import json
+import base64
+import hashlib
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+from fastapi.responses import JSONResponse
+
+from backend.schemas import Article, SearchResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson installed
+    orjson = None
+
+SEARCH_DISCLAIMER = SearchResponse.model_fields["disclaimer"].default
+
+# Search payloads are built internally and served without pydantic
+# validation. VALIDATE_RESPONSES=true checks every rendered payload against
+# SearchResponse and Article instead (the test suite turns it on).
+VALIDATE_RESPONSES = os.getenv("VALIDATE_RESPONSES", "false").lower() == "true"
+
+
+def _default(obj: Any) -> Any:
+    """Encode the few non-JSON types the pipeline can leave in articles"""
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content to compact UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def sse_event(event: str, data: Any) -> bytes:
+    """Encode one server-sent event"""
+    return b"event: " + event.encode("utf-8") + b"\ndata: " + dumps(data) + b"\n\n"
+
+
+def ndjson_line(event: str, data: Any) -> bytes:
+    """Encode one newline-delimited JSON record"""
+    return dumps({"event": event, "data": data}) + b"\n"
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when available"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def search_payload(stacks: List[Dict[str, Any]], origin_country: Optional[str] = None,
+                   map: Optional[Dict[str, Any]] = None,
+                   trending: Optional[List[Dict[str, Any]]] = None, **extra: Any) -> Dict[str, Any]:
+    """
+    Build a SearchResponse-shaped dict without constructing and dumping the
+    model; the stacks and articles are referenced, not copied.
+    """
+    payload = {
+        "origin_country": origin_country,
+        "stacks": stacks,
+        "map": map,
+        "trending": trending,
+        "disclaimer": SEARCH_DISCLAIMER,
+    }
+    payload.update(extra)
+    return payload
+
+
+STACK_ARTICLE_LISTS = ("local", "regional", "neutral")
+TOP_LEVEL_ARTICLE_LISTS = ("articles", "enhanced_articles")
+
+
+def map_article_lists(payload: Dict[str, Any], fn: Callable[[List[Dict[str, Any]]], list]) -> Dict[str, Any]:
+    """
+    Shallow-copy a search payload, replacing every article list (top-level
+    lists and those inside stacks, including foreign_by_country_enhanced)
+    with fn(list).
+    """
+    result = dict(payload)
+    for field in TOP_LEVEL_ARTICLE_LISTS:
+        if isinstance(payload.get(field), list):
+            result[field] = fn(payload[field])
+
+    stacks = []
+    for stack in payload.get("stacks") or []:
+        stack = dict(stack)
+        for field in STACK_ARTICLE_LISTS:
+            if isinstance(stack.get(field), list):
+                stack[field] = fn(stack[field])
+        if isinstance(stack.get("foreign_by_country"), dict):
+            stack["foreign_by_country"] = {
+                country: fn(articles) for country, articles in stack["foreign_by_country"].items()
+            }
+        if isinstance(stack.get("foreign_by_country_enhanced"), dict):
+            stack["foreign_by_country_enhanced"] = {
+                country: {**info, "articles": fn(info.get("articles") or [])}
+                for country, info in stack["foreign_by_country_enhanced"].items()
+            }
+        stacks.append(stack)
+    result["stacks"] = stacks
+    return result
+
+
+def _stack_article_lists(stack: Dict[str, Any]):
+    for field in STACK_ARTICLE_LISTS:
+        if isinstance(stack.get(field), list):
+            yield stack[field]
+    for articles in (stack.get("foreign_by_country") or {}).values():
+        yield articles
+    for info in (stack.get("foreign_by_country_enhanced") or {}).values():
+        yield info.get("articles") or []
+
+
+def compact_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Opt-in compact form of a search response (?format=compact).
+
+    Every distinct article object is emitted once in `articles_by_id`; the
+    top-level `articles`/`enhanced_articles` lists and every list inside the
+    stacks (including foreign_by_country_enhanced) hold article IDs instead.
+    Articles are identified by object identity, so the same dict referenced
+    from several places gets one ID.
+    """
+    table: Dict[str, Dict[str, Any]] = {}
+    ids: Dict[int, str] = {}
+
+    def ref(article: Dict[str, Any]) -> str:
+        key = id(article)
+        article_id = ids.get(key)
+        if article_id is None:
+            article_id = ids[key] = f"a{len(ids)}"
+            table[article_id] = article
+        return article_id
+
+    compact = map_article_lists(payload, lambda articles: [ref(a) for a in articles])
+    compact["format"] = "compact"
+    compact["articles_by_id"] = table
+    return compact
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Set[str]]:
+    """Parse a comma-separated ?fields= value; None means all fields"""
+    if not fields:
+        return None
+    return {f.strip() for f in fields.split(",") if f.strip()} or None
+
+
+def wants_any(projection: Optional[Set[str]], names) -> bool:
+    """True if a projection (None = everything) includes any of names"""
+    return projection is None or not projection.isdisjoint(names)
+
+
+def project_payload(payload: Dict[str, Any], projection: Optional[Set[str]]) -> Dict[str, Any]:
+    """Keep only the projected fields on every article, preserving shared references"""
+    if projection is None:
+        return payload
+    projected: Dict[int, Dict[str, Any]] = {}
+
+    def project(article: Dict[str, Any]) -> Dict[str, Any]:
+        key = id(article)
+        if key not in projected:
+            projected[key] = {k: v for k, v in article.items() if k in projection}
+        return projected[key]
+
+    return map_article_lists(payload, lambda articles: [project(a) for a in articles])
+
+
+class StaleCursorError(ValueError):
+    """The results a cursor was issued for have since been recomputed"""
+
+
+def encode_cursor(offset: int, key: Hashable, version: Optional[str] = None) -> str:
+    token = {"o": offset, "k": _cursor_fingerprint(key)}
+    if version is not None:
+        token["v"] = version
+    token = json.dumps(token, separators=(",", ":"))
+    return base64.urlsafe_b64encode(token.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], key: Hashable) -> Tuple[int, Optional[str]]:
+    """
+    (offset, result version) encoded in a cursor; ValueError if it is
+    malformed or belongs to another query
+    """
+    if not cursor:
+        return 0, None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        token = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        offset, fingerprint, version = int(token["o"]), token["k"], token.get("v")
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if fingerprint != _cursor_fingerprint(key) or offset < 0:
+        raise ValueError("Cursor does not belong to this query")
+    return offset, version
+
+
+def _cursor_fingerprint(key: Hashable) -> str:
+    return hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:12]
+
+
+def result_version(payload: Dict[str, Any]) -> str:
+    """
+    Fingerprint of a payload's stack order. Offsets in a cursor only make
+    sense against the same order, which changes when a search is recomputed.
+    """
+    keys = [stack.get("origin_country") for stack in payload.get("stacks") or []]
+    return hashlib.sha1(repr(keys).encode("utf-8")).hexdigest()[:12]
+
+
+def paginate_payload(payload: Dict[str, Any], offset: int, limit: Optional[int],
+                     key: Hashable, version: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Return one page of stacks (stacks are already sorted by size). The
+    top-level article lists are narrowed to the articles in that page's
+    stacks; query-wide fields such as perspective_summary are kept.
+    `version` is the result version from the request's cursor; if the
+    stacks have changed since, StaleCursorError is raised so the client
+    starts over instead of skipping or repeating stacks.
+    """
+    if version is not None and version != result_version(payload):
+        raise StaleCursorError("Search results have changed since this cursor was issued; start again without it")
+    if limit is None and offset == 0:
+        return payload
+    stacks = payload.get("stacks") or []
+    end = len(stacks) if limit is None else offset + limit
+    page_stacks = stacks[offset:end]
+
+    page = dict(payload, stacks=page_stacks)
+    in_page = {id(a) for stack in page_stacks for articles in _stack_article_lists(stack) for a in articles}
+    for field in TOP_LEVEL_ARTICLE_LISTS:
+        if isinstance(payload.get(field), list):
+            page[field] = [a for a in payload[field] if id(a) in in_page]
+
+    page["page"] = {
+        "offset": offset,
+        "limit": limit,
+        "total_stacks": len(stacks),
+        "next_cursor": encode_cursor(end, key, result_version(payload)) if end < len(stacks) else None,
+    }
+    return page
+
+
+def validate_search_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Check a search payload against SearchResponse, and each distinct article
+    in it against Article; raises pydantic.ValidationError on a mismatch.
+    """
+    SearchResponse.model_validate({name: payload[name] for name in SearchResponse.model_fields if name in payload})
+    lists = [payload[field] for field in TOP_LEVEL_ARTICLE_LISTS if isinstance(payload.get(field), list)]
+    for stack in payload.get("stacks") or []:
+        lists.extend(_stack_article_lists(stack))
+    seen = set()
+    for articles in lists:
+        for article in articles:
+            if id(article) not in seen:
+                seen.add(id(article))
+                Article.model_validate(article)
+    return payload
+
+
+def render_search(payload: Dict[str, Any], format: Optional[str] = None,
+                  projection: Optional[Set[str]] = None, offset: int = 0,
+                  limit: Optional[int] = None, key: Hashable = None,
+                  version: Optional[str] = None) -> FastJSONResponse:
+    """
+    Response for a search payload: paginated, projected to the requested
+    article fields, then rendered in the requested format ('full' or 'compact').
+    """
+    if VALIDATE_RESPONSES:
+        validate_search_payload(payload)
+    payload = paginate_payload(payload, offset, limit, key, version)
+    payload = project_payload(payload, projection)
+    if format == "compact":
+        payload = compact_payload(payload)
+    return FastJSONResponse(payload)
@@ -24,12 +24,17 @@ class AIOrchestrator:
         # Enable AI discovery and use Gemini-only for topic discovery
         self.ai_discovery_enabled = True
         self.max_sources_per_topic = int(os.getenv('MAX_SOURCES_PER_TOPIC', 5))
+        # 'combined' asks for keywords, perspectives and sources in one LLM call
+        self.discovery_mode = os.getenv('AI_DISCOVERY_MODE', 'combined')
         self.executor = ThreadPoolExecutor(max_workers=4)
         
-    def get_todays_headlines(self) -> Dict[str, Any]:
+    def get_todays_headlines(self, topics: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Get today's headlines using AI-powered discovery and verification.
         
+        Args:
+            topics: Already-discovered trending topics; discovered with Gemini if omitted
+        
         Returns:
             Dictionary with discovered topics, articles, and analysis
         """
@@ -40,7 +45,8 @@ class AIOrchestrator:
             logger.info("Starting Gemini-powered news discovery...")
             
             # Step 1: Discover trending topics with Gemini
-            topics = gemini_verification.discover_trending_topics()
+            if topics is None:
+                topics = gemini_verification.discover_trending_topics()
             
             if not topics:
                 logger.warning("No topics discovered, using fallback")
@@ -93,11 +99,19 @@ class AIOrchestrator:
             
             logger.info(f"Starting AI-powered search for: {query}")
             
-            # Step 1: Generate search keywords
-            keywords = chatgpt_discovery.generate_search_keywords(query)
-            
-            # Step 2: Get regional perspectives
-            perspectives = chatgpt_discovery.get_regional_perspectives(query)
+            if self.discovery_mode == 'combined':
+                # Steps 1-3 in a single LLM round-trip
+                plan = chatgpt_discovery.discover_search_plan(query)
+                keywords = plan['keywords']
+                perspectives = plan['perspectives']
+                sources_by_region = plan['sources_by_region']
+            else:
+                # Step 1: Generate search keywords
+                keywords = chatgpt_discovery.generate_search_keywords(query)
+                
+                # Step 2: Get regional perspectives
+                perspectives = chatgpt_discovery.get_regional_perspectives(query)
+                sources_by_region = None
             
             # Step 3: Find local sources for each perspective
             all_articles = []
@@ -105,28 +119,12 @@ class AIOrchestrator:
             for perspective in perspectives[:3]:  # Limit to 3 perspectives
                 try:
                     region = perspective.get('region', 'Unknown')
-                    sources = chatgpt_discovery.find_local_sources(query, region)
+                    if sources_by_region is not None:
+                        sources = sources_by_region.get(region, [])
+                    else:
+                        sources = chatgpt_discovery.find_local_sources(query, region)
+                    all_articles.extend(self._collect_region_articles(perspective, sources, keywords))
                     
-                    # Extract articles from sources
-                    for source in sources[:2]:  # Limit to 2 sources per region
-                        try:
-                            source_url = f"https://{source.get('url', '')}"
-                            articles = content_extractor.search_articles_by_keywords(
-                                source_url, keywords[:3]
-                            )
-                            
-                            # Extract content for top articles
-                            for article in articles[:2]:  # Limit to 2 articles per source
-                                content = content_extractor.extract_article_content(article['url'])
-                                if content.get('extraction_success'):
-                                    content['perspective'] = perspective
-                                    content['source_info'] = source
-                                    all_articles.append(content)
-                                    
-                        except Exception as e:
-                            logger.warning(f"Error extracting from source {source.get('name', 'Unknown')}: {str(e)}")
-                            continue
-                            
                 except Exception as e:
                     logger.warning(f"Error processing perspective {perspective.get('region', 'Unknown')}: {str(e)}")
                     continue
@@ -139,18 +137,7 @@ class AIOrchestrator:
                 verification_analysis = {}
                 fact_check = {}
             
-            result = {
-                'success': True,
-                'query': query,
-                'keywords': keywords,
-                'perspectives': perspectives,
-                'articles': all_articles,
-                'total_articles': len(all_articles),
-                'verification_analysis': verification_analysis,
-                'fact_check': fact_check,
-                'searched_at': datetime.now().isoformat(),
-                'ai_powered': True
-            }
+            result = self._build_search_result(query, keywords, perspectives, all_articles, verification_analysis, fact_check)
             
             logger.info(f"AI search completed: {len(all_articles)} articles found")
             return result
@@ -159,6 +146,117 @@ class AIOrchestrator:
             logger.error(f"Error in AI search: {str(e)}")
             return self._get_fallback_search(query)
     
+    async def search_news_by_topic_async(self, query: str) -> Dict[str, Any]:
+        """
+        Async variant of search_news_by_topic.
+        
+        Discovery is a single combined LLM call (or, in granular mode,
+        concurrent keyword/perspective/source calls), and each region's
+        scraping runs in its own worker thread.
+        
+        Args:
+            query: Search query or topic
+            
+        Returns:
+            Dictionary with search results and analysis
+        """
+        try:
+            if not self.ai_discovery_enabled:
+                return self._get_fallback_search(query)
+            
+            logger.info(f"Starting AI-powered search for: {query}")
+            
+            selected_limit = 3  # Limit to 3 perspectives
+            if self.discovery_mode == 'combined':
+                # Steps 1-3 in a single LLM round-trip
+                plan = await chatgpt_discovery.discover_search_plan_async(query, max_regions=selected_limit)
+                keywords = plan['keywords']
+                perspectives = plan['perspectives']
+                selected = perspectives[:selected_limit]
+                regions = [perspective.get('region', 'Unknown') for perspective in selected]
+                sources_by_region = plan['sources_by_region']
+            else:
+                # Steps 1-2: Keywords and regional perspectives in parallel
+                keywords, perspectives = await asyncio.gather(
+                    chatgpt_discovery.generate_search_keywords_async(query),
+                    chatgpt_discovery.get_regional_perspectives_async(query)
+                )
+                
+                # Step 3: Find local sources for all regions at once
+                selected = perspectives[:selected_limit]
+                regions = [perspective.get('region', 'Unknown') for perspective in selected]
+                sources_by_region = await chatgpt_discovery.find_local_sources_for_regions(query, regions)
+            
+            # Scrape each region in its own worker thread
+            region_results = await asyncio.gather(*(
+                asyncio.to_thread(self._collect_region_articles, perspective, sources_by_region.get(region, []), keywords)
+                for perspective, region in zip(selected, regions)
+            ), return_exceptions=True)
+            
+            all_articles = []
+            for region, articles in zip(regions, region_results):
+                if isinstance(articles, Exception):
+                    logger.warning(f"Error processing perspective {region}: {str(articles)}")
+                    continue
+                all_articles.extend(articles)
+            
+            # Step 4: Verify and analyze articles
+            if all_articles:
+                verification_analysis, fact_check = await asyncio.gather(
+                    asyncio.to_thread(gemini_verification.detect_misinformation_patterns, all_articles),
+                    asyncio.to_thread(gemini_verification.generate_fact_check_summary, query, all_articles)
+                )
+            else:
+                verification_analysis = {}
+                fact_check = {}
+            
+            result = self._build_search_result(query, keywords, perspectives, all_articles, verification_analysis, fact_check)
+            
+            logger.info(f"AI search completed: {len(all_articles)} articles found")
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error in AI search: {str(e)}")
+            return self._get_fallback_search(query)
+    
+    def _collect_region_articles(self, perspective: Dict[str, Any], sources: List[Dict[str, Any]], keywords: List[str]) -> List[Dict[str, Any]]:
+        """Scrape articles from a region's local sources (blocking)."""
+        articles_found = []
+        for source in sources[:2]:  # Limit to 2 sources per region
+            try:
+                source_url = f"https://{source.get('url', '')}"
+                articles = content_extractor.search_articles_by_keywords(
+                    source_url, keywords[:3]
+                )
+                
+                # Extract content for top articles
+                for article in articles[:2]:  # Limit to 2 articles per source
+                    content = content_extractor.extract_article_content(article['url'])
+                    if content.get('extraction_success'):
+                        content['perspective'] = perspective
+                        content['source_info'] = source
+                        articles_found.append(content)
+                        
+            except Exception as e:
+                logger.warning(f"Error extracting from source {source.get('name', 'Unknown')}: {str(e)}")
+                continue
+        return articles_found
+    
+    def _build_search_result(self, query: str, keywords: List[str], perspectives: List[Dict[str, Any]], articles: List[Dict[str, Any]],
+                             verification_analysis: Dict[str, Any], fact_check: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'success': True,
+            'query': query,
+            'keywords': keywords,
+            'perspectives': perspectives,
+            'articles': articles,
+            'total_articles': len(articles),
+            'verification_analysis': verification_analysis,
+            'fact_check': fact_check,
+            'searched_at': datetime.now().isoformat(),
+            'ai_powered': True
+        }
+    
     def analyze_article_credibility(self, url: str) -> Dict[str, Any]:
         """
         Analyze the credibility of a specific article.
@@ -192,15 +290,52 @@ class AIOrchestrator:
                 article.get('source_name', ''), url
             )
             
-            result = {
-                'success': True,
-                'url': url,
-                'article': article,
-                'authenticity_analysis': authenticity,
-                'source_analysis': source_analysis,
-                'overall_score': self._calculate_overall_credibility_score(authenticity, source_analysis),
-                'analyzed_at': datetime.now().isoformat()
+            result = self._build_credibility_result(url, article, authenticity, source_analysis)
+            
+            logger.info(f"Credibility analysis completed for: {article.get('title', 'Unknown')}")
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error analyzing article credibility: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e),
+                'url': url
             }
+    
+    async def analyze_article_credibility_async(self, url: str) -> Dict[str, Any]:
+        """
+        Async variant of analyze_article_credibility.
+        
+        Authenticity and source checks are independent Gemini calls, so they
+        run concurrently instead of back to back.
+        
+        Args:
+            url: URL of the article to analyze
+            
+        Returns:
+            Dictionary with credibility analysis
+        """
+        try:
+            logger.info(f"Analyzing article credibility: {url}")
+            
+            # Step 1: Extract article content (blocking HTTP client)
+            article = await asyncio.to_thread(content_extractor.extract_article_content, url)
+            
+            if not article.get('extraction_success'):
+                return {
+                    'success': False,
+                    'error': 'Failed to extract article content',
+                    'url': url
+                }
+            
+            # Steps 2-3: Verify authenticity and source credibility in parallel
+            authenticity, source_analysis = await asyncio.gather(
+                gemini_verification.verify_article_authenticity_async(article.get('content', ''), url),
+                gemini_verification.analyze_source_credibility_async(article.get('source_name', ''), url)
+            )
+            
+            result = self._build_credibility_result(url, article, authenticity, source_analysis)
             
             logger.info(f"Credibility analysis completed for: {article.get('title', 'Unknown')}")
             return result
@@ -213,6 +348,18 @@ class AIOrchestrator:
                 'url': url
             }
     
+    def _build_credibility_result(self, url: str, article: Dict[str, Any], authenticity: Dict[str, Any], source_analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Assemble the credibility response from the two Gemini analyses."""
+        return {
+            'success': True,
+            'url': url,
+            'article': article,
+            'authenticity_analysis': authenticity,
+            'source_analysis': source_analysis,
+            'overall_score': self._calculate_overall_credibility_score(authenticity, source_analysis),
+            'analyzed_at': datetime.now().isoformat()
+        }
+    
     def _process_topic(self, topic: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Process a single topic by extracting articles and analyzing them."""
         try:
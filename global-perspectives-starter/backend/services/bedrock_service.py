@@ -6,14 +6,23 @@ Handles all AI-powered features using Bedrock Agents
 import json
 import os
 import asyncio
+import codecs
+import collections
+import functools
 import uuid
-from typing import List, Dict, Any, Optional
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, AsyncIterable, AsyncIterator, Iterable, Iterator, Tuple, TypeVar, Union
 import boto3
 from botocore.exceptions import ClientError, BotoCoreError
 import logging
 
+from .resilience import get_provider, CircuitOpenError
+
 logger = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
 class BedrockService:
     """AWS Bedrock Agent service for AI interactions with dual agents"""
     
@@ -50,10 +59,53 @@ class BedrockService:
         except Exception as e:
             logger.error(f"Failed to initialize Bedrock Agent client: {e}")
             self.bedrock_agent_client = None
+        
+        # Pool for the blocking client; the semaphore caps in-flight agent calls
+        # from every caller of this service (API requests, batch runners)
+        self.max_workers = int(os.getenv('BEDROCK_MAX_WORKERS', 8))
+        self.max_concurrency = int(os.getenv('BEDROCK_MAX_CONCURRENCY', self.max_workers))
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='bedrock')
+        self._semaphores = weakref.WeakKeyDictionary()
+        self.resilience = get_provider('bedrock')
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Concurrency semaphore bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+    
+    async def _run_blocking(self, fn, *args, timeout: Optional[float] = None, **kwargs):
+        """
+        Run a blocking client call in the Bedrock pool, within the concurrency limit.
+        
+        The slot is held until the worker thread finishes, even when the caller
+        stops waiting (timeout, cancellation), so the limit counts real calls.
+        `timeout` starts once the slot is acquired; a call that overruns it
+        raises TimeoutError, which the resilience layer treats as retryable.
+        """
+        semaphore = self._get_semaphore()
+        await semaphore.acquire()
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+        
+        def release(done: asyncio.Future):
+            semaphore.release()
+            if not done.cancelled():
+                done.exception()  # retrieved here when nobody awaits it any more
+        
+        future.add_done_callback(release)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Bedrock call timed out after {timeout} seconds") from None
     
-    async def _invoke_agent(self, input_text: str, agent_id: str, agent_alias_id: str, session_id: Optional[str] = None) -> Optional[str]:
+    async def _invoke_agent(self, input_text: str, agent_id: str, agent_alias_id: str, session_id: Optional[str] = None,
+                            timeout: Optional[float] = None) -> Optional[str]:
         """
-        Invoke specific Bedrock Agent with error handling
+        Invoke specific Bedrock Agent with error handling; `timeout` bounds each attempt
         """
         logger.info(f"_invoke_agent called with agent_id: {agent_id}, agent_alias_id: {agent_alias_id}")
         
@@ -70,29 +122,12 @@ class BedrockService:
             if not session_id:
                 session_id = f"session-{uuid.uuid4()}"
             
-            # Invoke the specific agent with minimal parameters
-            response = self.bedrock_agent_client.invoke_agent(
-                agentId=agent_id,
-                agentAliasId=agent_alias_id,
-                sessionId=session_id,
-                inputText=input_text
+            # Retry transient failures; fail fast while the breaker is open
+            completion = await self.resilience.call(
+                lambda: self._run_blocking(self._invoke_agent_once, input_text, agent_id, agent_alias_id, session_id,
+                                           timeout=timeout)
             )
             
-            # Parse the streaming response
-            completion = ""
-            if 'completion' in response:
-                for event in response['completion']:
-                    if 'chunk' in event:
-                        chunk = event['chunk']
-                        if 'bytes' in chunk:
-                            completion += chunk['bytes'].decode('utf-8')
-                        elif 'attribution' in chunk:
-                            # Handle attribution chunks if present
-                            continue
-                    elif 'trace' in event:
-                        # Handle trace events if present
-                        continue
-            
             return completion.strip() if completion else None
             
         except ClientError as e:
@@ -101,10 +136,101 @@ class BedrockService:
         except BotoCoreError as e:
             logger.error(f"BotoCoreError invoking Bedrock Agent: {e}")
             return None
+        except CircuitOpenError as e:
+            logger.warning(f"Skipping Bedrock Agent call: {e}")
+            return None
         except Exception as e:
             logger.error(f"Unexpected error invoking Bedrock Agent: {e}")
             return None
     
+    def _invoke_agent_once(self, input_text: str, agent_id: str, agent_alias_id: str, session_id: str) -> str:
+        """
+        Single blocking invoke_agent round-trip; raises on failure
+        """
+        response = self.bedrock_agent_client.invoke_agent(
+            agentId=agent_id,
+            agentAliasId=agent_alias_id,
+            sessionId=session_id,
+            inputText=input_text
+        )
+        
+        # Parse the streaming response
+        return "".join(self._iter_completion_text(response))
+    
+    def _iter_completion_text(self, response: Dict[str, Any]) -> Iterator[str]:
+        """
+        Yield decoded text from an invoke_agent response as chunks arrive.
+        
+        Uses an incremental UTF-8 decoder so multi-byte characters split across
+        chunk boundaries are decoded correctly.
+        """
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        for event in response.get('completion') or []:
+            if 'chunk' in event:
+                chunk = event['chunk']
+                if 'bytes' in chunk:
+                    text = decoder.decode(chunk['bytes'])
+                    if text:
+                        yield text
+                # Attribution chunks carry no completion text
+            # Trace events carry no completion text
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            yield tail
+    
+    async def stream_agent(self, input_text: str, agent_id: str, agent_alias_id: str, session_id: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Invoke a Bedrock Agent and yield completion text incrementally.
+        
+        The boto3 event stream is blocking, so each event is pulled in a worker
+        thread to keep the event loop free between chunks. Client and breaker
+        errors, before or during the stream, are logged and re-raised so the
+        caller can tell a failed stream from a finished one.
+        """
+        if not self.bedrock_agent_client:
+            logger.warning("Bedrock Agent client not available, nothing to stream")
+            return
+        
+        if not agent_id:
+            logger.warning("Agent ID not configured, nothing to stream")
+            return
+        
+        if not session_id:
+            session_id = f"session-{uuid.uuid4()}"
+        
+        try:
+            # Only the initial request is retried; nothing has been yielded yet
+            response = await self.resilience.call(
+                lambda: self._run_blocking(
+                    self.bedrock_agent_client.invoke_agent,
+                    agentId=agent_id,
+                    agentAliasId=agent_alias_id,
+                    sessionId=session_id,
+                    inputText=input_text
+                )
+            )
+            
+            chunks = self._iter_completion_text(response)
+            sentinel = object()
+            while True:
+                text = await asyncio.to_thread(next, chunks, sentinel)
+                if text is sentinel:
+                    break
+                yield text
+        
+        except ClientError as e:
+            logger.error(f"AWS ClientError streaming Bedrock Agent: {e}")
+            raise
+        except BotoCoreError as e:
+            logger.error(f"BotoCoreError streaming Bedrock Agent: {e}")
+            raise
+        except CircuitOpenError as e:
+            logger.warning(f"Skipping Bedrock Agent stream: {e}")
+            raise
+    
+    def _summary_prompt(self, title: str, description: str) -> str:
+        return f"Summarize this news article: Title: {title}. Description: {description}. Provide a clear, factual summary in 2-3 sentences."
+    
     async def generate_summary(self, title: str, description: str) -> Optional[str]:
         """
         Generate AI-powered summary using Summarization Agent
@@ -113,7 +239,7 @@ class BedrockService:
         logger.info(f"Using summarize_agent_id: {self.summarize_agent_id}")
         logger.info(f"Using summarize_agent_alias_id: {self.summarize_agent_alias_id}")
         
-        input_text = f"Summarize this news article: Title: {title}. Description: {description}. Provide a clear, factual summary in 2-3 sentences."
+        input_text = self._summary_prompt(title, description)
         
         result = await self._invoke_agent(
             input_text, 
@@ -124,9 +250,20 @@ class BedrockService:
         logger.info(f"generate_summary result: {result}")
         return result
     
+    async def stream_summary(self, title: str, description: str) -> AsyncIterator[str]:
+        """
+        Stream an AI-powered summary from the Summarization Agent as it is generated
+        """
+        async for text in self.stream_agent(
+            self._summary_prompt(title, description),
+            self.summarize_agent_id,
+            self.summarize_agent_alias_id
+        ):
+            yield text
+    
 
     
-    async def generate_predictions(self, article: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    async def generate_predictions(self, article: Dict[str, Any], timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
         """
         Generate conflict predictions using Prediction Agent
         """
@@ -140,7 +277,8 @@ class BedrockService:
         response = await self._invoke_agent(
             input_text,
             self.predict_agent_id,
-            self.predict_agent_alias_id
+            self.predict_agent_alias_id,
+            timeout=timeout
         )
         
         if response:
@@ -153,6 +291,46 @@ class BedrockService:
         
         return None
     
+    async def iter_predictions(self, articles: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+                               concurrency: int = 4,
+                               timeout: Optional[float] = None) -> AsyncIterator[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]:
+        """
+        Generate predictions for many articles with up to `concurrency` agent
+        calls in flight, yielding (article, prediction) in input order.
+        
+        Articles are read from the (sync or async) iterable lazily, a few ahead
+        of the one being yielded, so a slow article does not idle the other slots.
+        The service-wide BEDROCK_MAX_CONCURRENCY limit still applies on top of
+        `concurrency`. `timeout` bounds each agent call once it holds a service
+        slot (time spent waiting for a slot or in retry backoff is not counted);
+        a prediction that fails or times out on every attempt is yielded as None.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def one(article: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    return await self.generate_predictions(article, timeout=timeout)
+                except Exception as e:
+                    logger.error(f"Error generating prediction for article {article.get('title', 'Unknown')}: {e}")
+                return None
+        
+        window = collections.deque()
+        try:
+            async for article in _aiter(articles):
+                window.append((article, asyncio.ensure_future(one(article))))
+                # Hand back finished results early: an async source (a queue fed
+                # by another stage) may keep the next article a while
+                while window and (len(window) > 2 * concurrency or window[0][1].done()):
+                    article, task = window.popleft()
+                    yield article, await task
+            while window:
+                article, task = window.popleft()
+                yield article, await task
+        finally:
+            for _, task in window:
+                task.cancel()
+    
     async def cluster_topics(self, articles: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         """
         Cluster articles by topic using LLaMA
@@ -228,5 +406,38 @@ class BedrockService:
         
         return processed_articles
 
+    async def article_summary_fields(self, article: Dict[str, Any]) -> Dict[str, Any]:
+        """{'summary': ...} patch for one article, with batch_process_articles' fallbacks"""
+        try:
+            summary = await self.generate_summary(article.get('title', ''), article.get('description', ''))
+            return {'summary': summary or "Summary not available"}
+        except Exception as e:
+            logger.error(f"Error processing article {article.get('title', 'Unknown')}: {e}")
+            return {'summary': "Summary generation failed"}
+
+    async def summary_fields(self, articles: List[Dict[str, Any]], concurrency: int = 4) -> List[Dict[str, Any]]:
+        """
+        Generate summaries for articles concurrently and return one
+        {'summary': ...} patch per article, with batch_process_articles' fallbacks
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def one(article: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.article_summary_fields(article)
+        
+        return list(await asyncio.gather(*(one(article) for article in articles)))
+
+
+async def _aiter(items: Union[Iterable[T], AsyncIterable[T]]) -> AsyncIterator[T]:
+    """Iterate a sync or async iterable asynchronously"""
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
 # Global instance
 bedrock_service = BedrockService()
\ No newline at end of file
@@ -7,18 +7,61 @@ local news sources from affected regions for comprehensive global coverage.
 
 import os
 import json
+import asyncio
 import logging
 from typing import List, Dict, Any, Optional
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from datetime import datetime
 
+from .resilience import get_provider
+from .ttl_cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
 class ChatGPTDiscoveryService:
     def __init__(self):
-        self.client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        # Retries are handled by the shared resilience layer, not the SDK
+        self.client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'), max_retries=0)
+        self.async_client = AsyncOpenAI(api_key=os.getenv('OPENAI_API_KEY'), max_retries=0)
         self.model = "gpt-4"
         self.max_sources_per_topic = int(os.getenv('MAX_SOURCES_PER_TOPIC', 5))
+        self.resilience = get_provider('chatgpt')
+        
+        # Discovery answers for a story rarely change within a day; every
+        # caller gets its own copy of the cached lists and dicts
+        self.cache = TTLCache(
+            ttl_seconds=float(os.getenv('DISCOVERY_CACHE_TTL_SECONDS', 12 * 60 * 60)),
+            max_entries=int(os.getenv('DISCOVERY_CACHE_MAX_ENTRIES', 2048)),
+            copy_values=True
+        )
+    
+    def _chat(self, system: str, prompt: str, temperature: float, max_tokens: int, timeout: int) -> str:
+        """Run a chat completion through the retry/circuit-breaker layer and return its text."""
+        response = self.resilience.call_sync(lambda: self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=timeout
+        ))
+        return response.choices[0].message.content
+    
+    async def _chat_async(self, system: str, prompt: str, temperature: float, max_tokens: int, timeout: int) -> str:
+        """Async variant of _chat using the AsyncOpenAI client."""
+        response = await self.resilience.call(lambda: self.async_client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=timeout
+        ))
+        return response.choices[0].message.content
         
     def discover_trending_topics(self) -> List[Dict[str, Any]]:
         """
@@ -30,18 +73,13 @@ class ChatGPTDiscoveryService:
         try:
             prompt = self._get_trending_topics_prompt()
             
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a global news analyst specializing in identifying current international events and reliable local news sources."},
-                    {"role": "user", "content": prompt}
-                ],
+            content = self._chat(
+                "You are a global news analyst specializing in identifying current international events and reliable local news sources.",
+                prompt,
                 temperature=0.3,
                 max_tokens=2000,
                 timeout=15  # 15 second timeout
             )
-            
-            content = response.choices[0].message.content
             topics = self._parse_topics_response(content)
             
             logger.info(f"Discovered {len(topics)} trending topics")
@@ -62,47 +100,48 @@ class ChatGPTDiscoveryService:
         Returns:
             List of local news sources with name, URL, and region
         """
+        cache_key = ('sources', self._normalize_key(topic), self._normalize_key(region))
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            prompt = f"""
-            For the topic "{topic}" in {region}, provide 3-5 reliable LOCAL news sources.
-            
-            Focus on:
-            - Authentic local/regional news outlets
-            - Sources that provide local perspective on the topic
-            - Credible journalism organizations from that region
-            - Avoid international media covering the region
-            
-            Format as JSON:
-            {{
-                "sources": [
-                    {{"name": "Source Name", "url": "domain.com", "region": "{region}", "language": "language"}}
-                ]
-            }}
-            """
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert on global media and local news sources."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.2,
-                max_tokens=800,
-                timeout=10  # 10 second timeout
-            )
-            
-            content = response.choices[0].message.content
-            sources_data = self._parse_json_response(content)
-            
-            if sources_data and 'sources' in sources_data:
-                return sources_data['sources'][:self.max_sources_per_topic]
+            content = self._chat(**self._local_sources_request(topic, region))
+            return self._cache_result(cache_key, self._parse_local_sources(content))
             
+        except Exception as e:
+            logger.error(f"Error finding local sources for {topic} in {region}: {str(e)}")
             return []
+    
+    async def find_local_sources_async(self, topic: str, region: str) -> List[Dict[str, str]]:
+        """Async variant of find_local_sources."""
+        cache_key = ('sources', self._normalize_key(topic), self._normalize_key(region))
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            content = await self._chat_async(**self._local_sources_request(topic, region))
+            return self._cache_result(cache_key, self._parse_local_sources(content))
             
         except Exception as e:
             logger.error(f"Error finding local sources for {topic} in {region}: {str(e)}")
             return []
     
+    async def find_local_sources_for_regions(self, topic: str, regions: List[str]) -> Dict[str, List[Dict[str, str]]]:
+        """
+        Find local news sources for several regions concurrently.
+        
+        Args:
+            topic: The news topic to search for
+            regions: Geographic regions or countries
+            
+        Returns:
+            Dictionary mapping each region to its local news sources
+        """
+        results = await asyncio.gather(*(self.find_local_sources_async(topic, region) for region in regions))
+        return dict(zip(regions, results))
+    
     def generate_search_keywords(self, topic: str) -> List[str]:
         """
         Generate diverse search keywords for a topic.
@@ -113,38 +152,29 @@ class ChatGPTDiscoveryService:
         Returns:
             List of search keywords
         """
+        cache_key = ('keywords', self._normalize_key(topic))
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            prompt = f"""
-            Generate 5-8 diverse search keywords for the topic: "{topic}"
-            
-            Include:
-            - Main topic keywords
-            - Related terms and synonyms
-            - Key people/organizations involved
-            - Geographic locations
-            - Alternative phrasings
-            
-            Return as a simple JSON array: ["keyword1", "keyword2", ...]
-            """
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a search optimization expert."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.4,
-                max_tokens=300,
-                timeout=8  # 8 second timeout
-            )
-            
-            content = response.choices[0].message.content
-            keywords = self._parse_json_response(content)
-            
-            if isinstance(keywords, list):
-                return keywords[:8]  # Limit to 8 keywords
+            content = self._chat(**self._search_keywords_request(topic))
+            return self._cache_result(cache_key, self._parse_search_keywords(content))
             
+        except Exception as e:
+            logger.error(f"Error generating keywords for {topic}: {str(e)}")
             return []
+    
+    async def generate_search_keywords_async(self, topic: str) -> List[str]:
+        """Async variant of generate_search_keywords."""
+        cache_key = ('keywords', self._normalize_key(topic))
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            content = await self._chat_async(**self._search_keywords_request(topic))
+            return self._cache_result(cache_key, self._parse_search_keywords(content))
             
         except Exception as e:
             logger.error(f"Error generating keywords for {topic}: {str(e)}")
@@ -160,8 +190,252 @@ class ChatGPTDiscoveryService:
         Returns:
             List of regional perspectives with sources
         """
+        cache_key = ('perspectives', self._normalize_key(topic))
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            content = self._chat(**self._regional_perspectives_request(topic))
+            return self._cache_result(cache_key, self._parse_regional_perspectives(content))
+            
+        except Exception as e:
+            logger.error(f"Error getting regional perspectives for {topic}: {str(e)}")
+            return []
+    
+    async def get_regional_perspectives_async(self, topic: str) -> List[Dict[str, Any]]:
+        """Async variant of get_regional_perspectives."""
+        cache_key = ('perspectives', self._normalize_key(topic))
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            content = await self._chat_async(**self._regional_perspectives_request(topic))
+            return self._cache_result(cache_key, self._parse_regional_perspectives(content))
+            
+        except Exception as e:
+            logger.error(f"Error getting regional perspectives for {topic}: {str(e)}")
+            return []
+    
+    def discover_search_plan(self, topic: str, max_regions: int = 3) -> Dict[str, Any]:
+        """
+        Get keywords, regional perspectives and local sources in one call.
+        
+        Falls back to the granular calls when the combined response does not
+        match the expected schema.
+        
+        Args:
+            topic: The news topic
+            max_regions: Number of perspectives to resolve local sources for
+            
+        Returns:
+            Dictionary with keywords, perspectives and sources_by_region
+        """
+        cache_key = ('plan', self._normalize_key(topic), max_regions)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        plan = None
+        try:
+            content = self._chat(**self._search_plan_request(topic))
+            plan = self._parse_search_plan(content, max_regions)
+        except Exception as e:
+            logger.error(f"Error getting combined search plan for {topic}: {str(e)}")
+        
+        if plan is None:
+            logger.warning(f"Combined discovery failed for {topic}; using granular calls")
+            keywords = self.generate_search_keywords(topic)
+            perspectives = self.get_regional_perspectives(topic)
+            regions = [p.get('region', 'Unknown') for p in perspectives[:max_regions]]
+            return {
+                'keywords': keywords,
+                'perspectives': perspectives,
+                'sources_by_region': {region: self.find_local_sources(topic, region) for region in regions},
+                'mode': 'granular'
+            }
+        
+        return self._cache_search_plan(cache_key, topic, plan)
+    
+    async def discover_search_plan_async(self, topic: str, max_regions: int = 3) -> Dict[str, Any]:
+        """Async variant of discover_search_plan; the granular fallback runs concurrently."""
+        cache_key = ('plan', self._normalize_key(topic), max_regions)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        plan = None
         try:
-            prompt = f"""
+            content = await self._chat_async(**self._search_plan_request(topic))
+            plan = self._parse_search_plan(content, max_regions)
+        except Exception as e:
+            logger.error(f"Error getting combined search plan for {topic}: {str(e)}")
+        
+        if plan is None:
+            logger.warning(f"Combined discovery failed for {topic}; using granular calls")
+            keywords, perspectives = await asyncio.gather(
+                self.generate_search_keywords_async(topic),
+                self.get_regional_perspectives_async(topic)
+            )
+            regions = [p.get('region', 'Unknown') for p in perspectives[:max_regions]]
+            return {
+                'keywords': keywords,
+                'perspectives': perspectives,
+                'sources_by_region': await self.find_local_sources_for_regions(topic, regions),
+                'mode': 'granular'
+            }
+        
+        return self._cache_search_plan(cache_key, topic, plan)
+    
+    def _search_plan_request(self, topic: str) -> Dict[str, Any]:
+        prompt = f"""
+            Plan a global news search for the topic: "{topic}"
+            
+            Provide:
+            - 5-8 diverse search keywords (main terms, synonyms, key people/organizations, locations)
+            - 4-6 different regional perspectives, each with its local angle and cultural/political context
+            - For each perspective, 3-5 reliable LOCAL news sources from that region
+              (authentic local outlets, not international media covering the region)
+            
+            Return ONLY JSON with this exact shape:
+            {{
+                "keywords": ["keyword1", "keyword2"],
+                "perspectives": [
+                    {{
+                        "region": "Region Name",
+                        "perspective": "Local angle description",
+                        "context": "Cultural/political context",
+                        "local_sources": [
+                            {{"name": "Source Name", "url": "domain.com", "language": "language"}}
+                        ]
+                    }}
+                ]
+            }}
+            """
+        return {
+            'system': "You are a global affairs analyst and expert on local news sources worldwide.",
+            'prompt': prompt,
+            'temperature': 0.3,
+            'max_tokens': 2500,
+            'timeout': 20  # 20 second timeout
+        }
+    
+    def _parse_search_plan(self, content: str, max_regions: int) -> Optional[Dict[str, Any]]:
+        """Validate a combined discovery response; None if it does not match the schema."""
+        data = self._parse_json_response(content)
+        if not isinstance(data, dict):
+            return None
+        
+        keywords = data.get('keywords')
+        perspectives = data.get('perspectives')
+        if not isinstance(keywords, list) or not isinstance(perspectives, list) or not perspectives:
+            return None
+        keywords = [str(k) for k in keywords if isinstance(k, (str, int, float)) and str(k).strip()]
+        if not keywords:
+            return None
+        
+        cleaned = []
+        sources_by_region = {}
+        for perspective in perspectives:
+            if not isinstance(perspective, dict) or not isinstance(perspective.get('region'), str):
+                return None
+            region = perspective['region']
+            local_sources = perspective.pop('local_sources', [])
+            if not isinstance(local_sources, list):
+                return None
+            sources = [
+                {**source, 'region': source.get('region', region)}
+                for source in local_sources
+                if isinstance(source, dict) and source.get('name') and source.get('url')
+            ]
+            # Keep the perspective shape returned by get_regional_perspectives
+            perspective.setdefault('sources', [{'name': src['name'], 'url': src['url']} for src in sources])
+            cleaned.append(perspective)
+            if len(sources_by_region) < max_regions:
+                sources_by_region[region] = sources[:self.max_sources_per_topic]
+        
+        return {
+            'keywords': keywords[:8],  # Limit to 8 keywords
+            'perspectives': cleaned,
+            'sources_by_region': sources_by_region,
+            'mode': 'combined'
+        }
+    
+    def _cache_search_plan(self, cache_key: tuple, topic: str, plan: Dict[str, Any]) -> Dict[str, Any]:
+        """Cache a combined plan and seed the granular caches from it."""
+        self.cache.set(cache_key, plan)
+        normalized = self._normalize_key(topic)
+        self._cache_result(('keywords', normalized), plan['keywords'])
+        self._cache_result(('perspectives', normalized), plan['perspectives'])
+        for region, sources in plan['sources_by_region'].items():
+            self._cache_result(('sources', normalized, self._normalize_key(region)), sources)
+        return plan
+    
+    def _local_sources_request(self, topic: str, region: str) -> Dict[str, Any]:
+        prompt = f"""
+            For the topic "{topic}" in {region}, provide 3-5 reliable LOCAL news sources.
+            
+            Focus on:
+            - Authentic local/regional news outlets
+            - Sources that provide local perspective on the topic
+            - Credible journalism organizations from that region
+            - Avoid international media covering the region
+            
+            Format as JSON:
+            {{
+                "sources": [
+                    {{"name": "Source Name", "url": "domain.com", "region": "{region}", "language": "language"}}
+                ]
+            }}
+            """
+        return {
+            'system': "You are an expert on global media and local news sources.",
+            'prompt': prompt,
+            'temperature': 0.2,
+            'max_tokens': 800,
+            'timeout': 10  # 10 second timeout
+        }
+    
+    def _parse_local_sources(self, content: str) -> List[Dict[str, str]]:
+        sources_data = self._parse_json_response(content)
+        
+        if sources_data and 'sources' in sources_data:
+            return sources_data['sources'][:self.max_sources_per_topic]
+        
+        return []
+    
+    def _search_keywords_request(self, topic: str) -> Dict[str, Any]:
+        prompt = f"""
+            Generate 5-8 diverse search keywords for the topic: "{topic}"
+            
+            Include:
+            - Main topic keywords
+            - Related terms and synonyms
+            - Key people/organizations involved
+            - Geographic locations
+            - Alternative phrasings
+            
+            Return as a simple JSON array: ["keyword1", "keyword2", ...]
+            """
+        return {
+            'system': "You are a search optimization expert.",
+            'prompt': prompt,
+            'temperature': 0.4,
+            'max_tokens': 300,
+            'timeout': 8  # 8 second timeout
+        }
+    
+    def _parse_search_keywords(self, content: str) -> List[str]:
+        keywords = self._parse_json_response(content)
+        
+        if isinstance(keywords, list):
+            return keywords[:8]  # Limit to 8 keywords
+        
+        return []
+    
+    def _regional_perspectives_request(self, topic: str) -> Dict[str, Any]:
+        prompt = f"""
             For the global topic "{topic}", identify 4-6 different regional perspectives.
             
             For each region, provide:
@@ -184,29 +458,30 @@ class ChatGPTDiscoveryService:
                 ]
             }}
             """
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a global affairs analyst with expertise in regional perspectives."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=1500,
-                timeout=12  # 12 second timeout
-            )
-            
-            content = response.choices[0].message.content
-            perspectives_data = self._parse_json_response(content)
-            
-            if perspectives_data and 'perspectives' in perspectives_data:
-                return perspectives_data['perspectives']
-            
-            return []
-            
-        except Exception as e:
-            logger.error(f"Error getting regional perspectives for {topic}: {str(e)}")
-            return []
+        return {
+            'system': "You are a global affairs analyst with expertise in regional perspectives.",
+            'prompt': prompt,
+            'temperature': 0.3,
+            'max_tokens': 1500,
+            'timeout': 12  # 12 second timeout
+        }
+    
+    def _parse_regional_perspectives(self, content: str) -> List[Dict[str, Any]]:
+        perspectives_data = self._parse_json_response(content)
+        
+        if perspectives_data and 'perspectives' in perspectives_data:
+            return perspectives_data['perspectives']
+        
+        return []
+    
+    def _normalize_key(self, value: str) -> str:
+        return " ".join((value or "").lower().split())
+    
+    def _cache_result(self, cache_key: tuple, result: list) -> list:
+        """Cache non-empty results; empty ones usually mean a failed call."""
+        if result:
+            self.cache.set(cache_key, result)
+        return result
     
     def _get_trending_topics_prompt(self) -> str:
         """Get the main prompt for discovering trending topics."""
@@ -0,0 +1,113 @@
+"""
+Rolling Country Window Store
+
+The batch pipeline folds each run's classified articles into a RollingWindow
+of the last 24 hours by origin country and writes its snapshot to disk; the
+API loads the snapshot (again only when the file changes), expires buckets
+as time passes and answers per-country requests from the window's totals.
+"""
+
+import os
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from backend.tools.aggregates import RollingWindow
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = Path(__file__).parent.parent.parent / "global-perspectives-batch" / "data" / "rolling_24h.json"
+
+
+def window_path() -> Path:
+    return Path(os.getenv("ROLLING_WINDOW_PATH", str(DEFAULT_PATH)))
+
+
+def update_window_file(articles: Iterable[Dict[str, Any]], path: Optional[Path] = None,
+                       now: Optional[float] = None) -> Dict[str, Any]:
+    """Add articles to the persisted window, expire old buckets and rewrite it"""
+    path = Path(path or window_path())
+    if path.exists():
+        with open(path, "r", encoding="utf-8") as f:
+            window = RollingWindow.from_snapshot(json.load(f))
+    else:
+        window = RollingWindow(
+            window_seconds=int(os.getenv("ROLLING_WINDOW_SECONDS", 24 * 3600)),
+            bucket_seconds=int(os.getenv("ROLLING_WINDOW_BUCKET_SECONDS", 3600)),
+        )
+    window.advance(now)
+    added = window.extend(articles)
+    snapshot = window.snapshot()
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    logger.info(f"Rolling window: added {added} articles, {len(snapshot['countries'])} countries")
+    return snapshot
+
+
+class CountryWindowStore:
+    """
+    Read side of the rolling window snapshot. The window is advanced to the
+    current time on read, so buckets expire even when the batch stops
+    writing and the API never reports older articles as the last 24 hours.
+    """
+
+    def __init__(self, path: Optional[Path] = None, clock: Callable[[], float] = time.time):
+        self._path = path
+        self._clock = clock
+        self._mtime = None
+        self._window: Optional[RollingWindow] = None
+        self._advanced_to = None
+        self._countries: Optional[List[Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        return Path(self._path or window_path())
+
+    def window(self) -> Optional[RollingWindow]:
+        """The current window: reloaded when the file changes, advanced once per bucket"""
+        with self._lock:
+            try:
+                mtime = self.path.stat().st_mtime
+            except FileNotFoundError:
+                mtime = None
+            if mtime is not None and mtime != self._mtime:
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        self._window = RollingWindow.from_snapshot(json.load(f))
+                    self._mtime = mtime
+                    self._advanced_to = None
+                except (OSError, ValueError, KeyError) as e:
+                    # Keep serving the previous window
+                    logger.error(f"Could not load rolling window {self.path}: {e}")
+            if self._window is None:
+                return None
+            now = self._clock()
+            bucket = int(now // self._window.bucket_seconds)
+            if bucket != self._advanced_to:
+                self._window.advance(now)
+                self._advanced_to = bucket
+                self._countries = None
+            return self._window
+
+    def countries(self) -> List[Dict[str, Any]]:
+        window = self.window()
+        if window is None:
+            return []
+        if self._countries is None:
+            self._countries = window.countries()
+        return self._countries
+
+    def get(self, country: str) -> Optional[Dict[str, Any]]:
+        window = self.window()
+        return window.get(country.upper()) if window is not None else None
+
+
+country_window = CountryWindowStore()
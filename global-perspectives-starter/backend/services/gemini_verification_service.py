@@ -8,12 +8,17 @@ analyze bias, and provide credibility scores for news articles.
 import os
 import json
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Callable, List, Optional, Sequence
 import google.generativeai as genai
 from datetime import datetime
 import asyncio
+import weakref
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 
+from backend.tools.publisher_mapping import publisher_service
+from .resilience import get_provider, CircuitOpenError
+from .source_credibility_cache import SourceCredibilityCache, credibility_key, DAY_SECONDS
+
 logger = logging.getLogger(__name__)
 
 class GeminiVerificationService:
@@ -25,7 +30,33 @@ class GeminiVerificationService:
         else:
             self.model = None
             logger.warning("Google Gemini API key not found")
-        self.executor = ThreadPoolExecutor(max_workers=2)
+        # Pool for the blocking client; the semaphore caps in-flight async calls
+        self.max_workers = int(os.getenv('GEMINI_MAX_WORKERS', 8))
+        self.max_concurrency = int(os.getenv('GEMINI_MAX_CONCURRENCY', self.max_workers))
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='gemini')
+        self._semaphores = weakref.WeakKeyDictionary()
+        self.resilience = get_provider('gemini', max_attempts=2)
+        
+        # Prompt packing limits for multi-article prompts (~4 chars per token)
+        self.batch_token_budget = int(os.getenv('GEMINI_BATCH_TOKEN_BUDGET', 6000))
+        self.max_batch_articles = int(os.getenv('GEMINI_MAX_BATCH_ARTICLES', 15))
+        
+        # Publisher credibility changes over weeks: answer known publishers from
+        # publishers.json and keep Gemini results for unknown domains on disk
+        self.credibility_cache = SourceCredibilityCache(
+            ttl_seconds=float(os.getenv('SOURCE_CREDIBILITY_TTL_DAYS', 30)) * DAY_SECONDS,
+            refresh_after_seconds=float(os.getenv('SOURCE_CREDIBILITY_REFRESH_DAYS', 7)) * DAY_SECONDS
+        )
+        self.credibility_cache.seed_from_publishers(publisher_service)
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Concurrency semaphore bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
     
     def _generate_content_with_timeout(self, prompt: str, timeout: int = 15) -> str:
         """
@@ -45,13 +76,89 @@ class GeminiVerificationService:
             raise Exception("Gemini model not available")
         
         try:
-            future = self.executor.submit(self.model.generate_content, prompt)
+            # Retry transient failures; fail fast while the breaker is open
+            return self.resilience.call_sync(lambda: self._generate_content_once(prompt, timeout))
+        except Exception as e:
+            raise self._api_error(e)
+    
+    def _generate_content_once(self, prompt: str, timeout: int) -> str:
+        """Single generate_content round-trip; raises on failure or timeout."""
+        future = self.executor.submit(self.model.generate_content, prompt)
+        try:
             response = future.result(timeout=timeout)
-            return response.text
         except FuturesTimeoutError:
+            future.cancel()
             raise TimeoutError(f"Gemini API call timed out after {timeout} seconds")
+        return response.text
+    
+    async def _generate_content_async(self, prompt: str, timeout: int = 15) -> str:
+        """
+        Async counterpart of _generate_content_with_timeout.
+        
+        Uses the SDK's native async call, so a timeout cancels the request
+        instead of leaving a worker thread blocked on it.
+        
+        Args:
+            prompt: The prompt to send to Gemini
+            timeout: Timeout in seconds (excludes time spent waiting for a slot)
+            
+        Returns:
+            Generated content text
+            
+        Raises:
+            TimeoutError: If the request times out
+        """
+        if not self.model:
+            raise Exception("Gemini model not available")
+        
+        try:
+            return await self.resilience.call(lambda: self._generate_content_once_async(prompt, timeout))
+        except Exception as e:
+            raise self._api_error(e)
+    
+    async def _generate_content_once_async(self, prompt: str, timeout: int) -> str:
+        """Single async generate_content round-trip; raises on failure or timeout."""
+        async with self._get_semaphore():
+            try:
+                response = await asyncio.wait_for(self.model.generate_content_async(prompt), timeout=timeout)
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"Gemini API call timed out after {timeout} seconds")
+        return response.text
+    
+    def _api_error(self, error: Exception) -> Exception:
+        """Timeouts and open-breaker errors pass through; anything else becomes a Gemini API error."""
+        if isinstance(error, (TimeoutError, CircuitOpenError)):
+            return error
+        return Exception(f"Gemini API error: {str(error)}")
+    
+    def _analyze(self, prompt: str, timeout: int, result: Callable[[str], Any],
+                 fallback: Callable[[], Any], action: str) -> Any:
+        """
+        Run one analysis request (see the _*_request builders): the parsed
+        result, or fallback() when the model is unavailable or the call fails.
+        """
+        if not self.model:
+            return fallback()
+        
+        try:
+            return result(self._generate_content_with_timeout(prompt, timeout=timeout))
+            
+        except Exception as e:
+            logger.error(f"Error {action}: {str(e)}")
+            return fallback()
+    
+    async def _analyze_async(self, prompt: str, timeout: int, result: Callable[[str], Any],
+                             fallback: Callable[[], Any], action: str) -> Any:
+        """Async variant of _analyze."""
+        if not self.model:
+            return fallback()
+        
+        try:
+            return result(await self._generate_content_async(prompt, timeout=timeout))
+            
         except Exception as e:
-            raise Exception(f"Gemini API error: {str(e)}")
+            logger.error(f"Error {action}: {str(e)}")
+            return fallback()
     
     def verify_article_authenticity(self, article_content: str, source_url: str) -> Dict[str, Any]:
         """
@@ -64,11 +171,23 @@ class GeminiVerificationService:
         Returns:
             Dictionary with authenticity score, analysis, and recommendations
         """
-        if not self.model:
-            return self._get_fallback_verification()
-        
-        try:
-            prompt = f"""
+        return self._analyze(**self._authenticity_request(article_content, source_url))
+    
+    async def verify_article_authenticity_async(self, article_content: str, source_url: str) -> Dict[str, Any]:
+        """Async variant of verify_article_authenticity."""
+        return await self._analyze_async(**self._authenticity_request(article_content, source_url))
+    
+    def _authenticity_request(self, article_content: str, source_url: str) -> Dict[str, Any]:
+        return {
+            'prompt': self._authenticity_prompt(article_content, source_url),
+            'timeout': 15,
+            'result': lambda response_text: self._authenticity_result(response_text, source_url),
+            'fallback': self._get_fallback_verification,
+            'action': "verifying article authenticity"
+        }
+    
+    def _authenticity_prompt(self, article_content: str, source_url: str) -> str:
+        return f"""
             Analyze this news article for authenticity and credibility:
             
             Source URL: {source_url}
@@ -103,20 +222,16 @@ class GeminiVerificationService:
                 "summary": "Brief analysis summary"
             }}
             """
-            
-            response_text = self._generate_content_with_timeout(prompt, timeout=15)
-            analysis = self._parse_json_response(response_text)
-            
-            if analysis:
-                analysis['verified_at'] = datetime.now().isoformat()
-                analysis['source_url'] = source_url
-                return analysis
-            
-            return self._get_fallback_verification()
-            
-        except Exception as e:
-            logger.error(f"Error verifying article authenticity: {str(e)}")
-            return self._get_fallback_verification()
+    
+    def _authenticity_result(self, response_text: str, source_url: str) -> Dict[str, Any]:
+        analysis = self._parse_json_response(response_text)
+        
+        if analysis:
+            analysis['verified_at'] = datetime.now().isoformat()
+            analysis['source_url'] = source_url
+            return analysis
+        
+        return self._get_fallback_verification()
     
     def analyze_source_credibility(self, source_name: str, source_url: str) -> Dict[str, Any]:
         """
@@ -129,11 +244,63 @@ class GeminiVerificationService:
         Returns:
             Dictionary with credibility analysis
         """
-        if not self.model:
-            return self._get_fallback_source_analysis()
+        # Sources without a usable URL are cached by name
+        key = credibility_key(source_url, source_name)
+        cached = self._cached_source_credibility(key, source_name, source_url)
+        if cached:
+            return cached
         
-        try:
-            prompt = f"""
+        # Fallback analyses are not cached
+        analysis = self._analyze(**self._source_credibility_request(source_name, source_url))
+        self.credibility_cache.put(key, analysis)
+        return analysis
+    
+    async def analyze_source_credibility_async(self, source_name: str, source_url: str) -> Dict[str, Any]:
+        """Async variant of analyze_source_credibility."""
+        key = credibility_key(source_url, source_name)
+        cached = self._cached_source_credibility(key, source_name, source_url)
+        if cached:
+            return cached
+        
+        analysis = await self._analyze_async(**self._source_credibility_request(source_name, source_url))
+        self.credibility_cache.put(key, analysis)
+        return analysis
+    
+    def _source_credibility_request(self, source_name: str, source_url: str) -> Dict[str, Any]:
+        return {
+            'prompt': self._source_credibility_prompt(source_name, source_url),
+            'timeout': 12,
+            'result': lambda response_text: self._source_credibility_result(response_text, source_name, source_url),
+            'fallback': self._get_fallback_source_analysis,
+            'action': "analyzing source credibility"
+        }
+    
+    def _fetch_source_credibility(self, source_name: str, source_url: str) -> Dict[str, Any]:
+        """Ask Gemini about a source; raises on API errors."""
+        request = self._source_credibility_request(source_name, source_url)
+        response_text = self._generate_content_with_timeout(request['prompt'], timeout=request['timeout'])
+        return request['result'](response_text)
+    
+    def _cached_source_credibility(self, key: Optional[str], source_name: str, source_url: str) -> Optional[Dict[str, Any]]:
+        """Serve a cached analysis, refreshing stale entries in the background."""
+        hit = self.credibility_cache.get(key)
+        if not hit:
+            return None
+        
+        analysis, stale = hit
+        if stale and self.model:
+            self.credibility_cache.refresh_in_background(
+                key, lambda: self._fetch_source_credibility(source_name, source_url)
+            )
+        
+        analysis.setdefault('analyzed_at', datetime.now().isoformat())
+        analysis['source_name'] = source_name
+        analysis['source_url'] = source_url
+        analysis['cached'] = True
+        return analysis
+    
+    def _source_credibility_prompt(self, source_name: str, source_url: str) -> str:
+        return f"""
             Analyze the credibility of this news source:
             
             Source Name: {source_name}
@@ -166,26 +333,26 @@ class GeminiVerificationService:
                 "notes": "Additional context or notes"
             }}
             """
-            
-            response_text = self._generate_content_with_timeout(prompt, timeout=12)
-            analysis = self._parse_json_response(response_text)
-            
-            if analysis:
-                analysis['analyzed_at'] = datetime.now().isoformat()
-                analysis['source_name'] = source_name
-                analysis['source_url'] = source_url
-                return analysis
-            
-            return self._get_fallback_source_analysis()
-            
-        except Exception as e:
-            logger.error(f"Error analyzing source credibility: {str(e)}")
-            return self._get_fallback_source_analysis()
+    
+    def _source_credibility_result(self, response_text: str, source_name: str, source_url: str) -> Dict[str, Any]:
+        analysis = self._parse_json_response(response_text)
+        
+        if analysis:
+            analysis['analyzed_at'] = datetime.now().isoformat()
+            analysis['source_name'] = source_name
+            analysis['source_url'] = source_url
+            return analysis
+        
+        return self._get_fallback_source_analysis()
     
     def detect_misinformation_patterns(self, articles: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Detect misinformation patterns across multiple articles.
         
+        Articles that do not fit one prompt's token budget are analyzed in
+        further batched calls (packed like verify_articles_batch, run
+        concurrently) and the per-batch analyses are merged.
+        
         Args:
             articles: List of articles with content and metadata
             
@@ -195,19 +362,48 @@ class GeminiVerificationService:
         if not self.model or not articles:
             return self._get_fallback_pattern_analysis()
         
-        try:
-            # Prepare article summaries for analysis
-            article_summaries = []
-            for i, article in enumerate(articles[:5]):  # Limit to 5 articles
-                summary = f"Article {i+1}: {article.get('title', 'No title')}\n"
-                summary += f"Source: {article.get('source', 'Unknown')}\n"
-                summary += f"Content: {article.get('content', '')[:300]}...\n"
-                article_summaries.append(summary)
-            
-            prompt = f"""
+        # Articles keep their 1-based position as ID across batches, so the
+        # article numbers in merged results refer to the input list
+        batches = self._pack_batches([(str(i + 1), article) for i, article in enumerate(articles)],
+                                     excerpt_chars=300, max_articles=len(articles))
+        analyses = self._analyze_batches(batches, lambda batch: self._analyze(
+            prompt=self._pattern_prompt(batch),
+            timeout=18,
+            result=self._parse_json_response,
+            fallback=lambda: None,
+            action="detecting misinformation patterns"
+        ))
+        if not analyses:
+            return self._get_fallback_pattern_analysis()
+        
+        analysis = self._merge_batch_analyses(
+            analyses,
+            ranked={
+                'overall_reliability': ['high', 'medium', 'low'],
+                'misinformation_risk': ['low', 'medium', 'high', 'critical']
+            },
+            averaged=['consistency_score'],
+            listed=['patterns_detected', 'fact_check_needed', 'reliable_sources',
+                    'questionable_sources', 'recommendations'],
+            joined=['summary']
+        )
+        analysis['analyzed_at'] = datetime.now().isoformat()
+        analysis['articles_count'] = len(articles)
+        analysis['articles_analyzed'] = sum(len(batch) for batch, _ in analyses)
+        analysis['batches'] = len(batches)
+        return analysis
+    
+    def _pattern_prompt(self, batch: List[tuple]) -> str:
+        excerpts = "\n".join(
+            f"Article {article_id}: {article.get('title', 'No title')}\n"
+            f"Source: {article.get('source', 'Unknown')}\n"
+            f"Content: {(article.get('content') or '')[:300]}...\n"
+            for article_id, article in batch
+        )
+        return f"""
             Analyze these articles for misinformation patterns:
             
-            {chr(10).join(article_summaries)}
+            {excerpts}
             
             Look for:
             1. Contradictory information
@@ -237,25 +433,14 @@ class GeminiVerificationService:
                 "summary": "Overall assessment"
             }}
             """
-            
-            response_text = self._generate_content_with_timeout(prompt, timeout=18)
-            analysis = self._parse_json_response(response_text)
-            
-            if analysis:
-                analysis['analyzed_at'] = datetime.now().isoformat()
-                analysis['articles_count'] = len(articles)
-                return analysis
-            
-            return self._get_fallback_pattern_analysis()
-            
-        except Exception as e:
-            logger.error(f"Error detecting misinformation patterns: {str(e)}")
-            return self._get_fallback_pattern_analysis()
     
     def generate_fact_check_summary(self, topic: str, articles: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Generate a fact-check summary for a topic based on multiple articles.
         
+        Like detect_misinformation_patterns, articles beyond one prompt's
+        token budget go to further batched calls whose summaries are merged.
+        
         Args:
             topic: The topic being fact-checked
             articles: List of articles about the topic
@@ -266,20 +451,43 @@ class GeminiVerificationService:
         if not self.model or not articles:
             return self._get_fallback_fact_check()
         
-        try:
-            # Prepare article data
-            article_data = []
-            for article in articles[:3]:  # Limit to 3 articles
-                data = f"Title: {article.get('title', 'No title')}\n"
-                data += f"Source: {article.get('source', 'Unknown')}\n"
-                data += f"Content: {article.get('content', '')[:500]}...\n"
-                article_data.append(data)
-            
-            prompt = f"""
+        batches = self._pack_batches([(str(i + 1), article) for i, article in enumerate(articles)],
+                                     excerpt_chars=500, max_articles=len(articles))
+        summaries = self._analyze_batches(batches, lambda batch: self._analyze(
+            prompt=self._fact_check_prompt(topic, batch),
+            timeout=15,
+            result=self._parse_json_response,
+            fallback=lambda: None,
+            action="generating fact-check summary"
+        ))
+        if not summaries:
+            return self._get_fallback_fact_check()
+        
+        summary = self._merge_batch_analyses(
+            summaries,
+            agreed={'overall_accuracy': 'disputed', 'fact_check_verdict': 'mixed'},
+            averaged=['confidence_level'],
+            listed=['verified_facts', 'disputed_claims', 'unverified_information',
+                    'source_reliability', 'areas_of_disagreement'],
+            joined=['consensus_view', 'explanation']
+        )
+        summary['articles_count'] = len(articles)
+        summary['articles_analyzed'] = sum(len(batch) for batch, _ in summaries)
+        summary['batches'] = len(batches)
+        return summary
+    
+    def _fact_check_prompt(self, topic: str, batch: List[tuple]) -> str:
+        excerpts = "\n".join(
+            f"Title: {article.get('title', 'No title')}\n"
+            f"Source: {article.get('source', 'Unknown')}\n"
+            f"Content: {(article.get('content') or '')[:500]}...\n"
+            for _, article in batch
+        )
+        return f"""
             Create a fact-check summary for the topic: "{topic}"
             
             Based on these articles:
-            {chr(10).join(article_data)}
+            {excerpts}
             
             Provide:
             1. Key facts that are consistently reported
@@ -308,19 +516,221 @@ class GeminiVerificationService:
                 "last_updated": "{datetime.now().isoformat()}"
             }}
             """
+    
+    def _analyze_batches(self, batches: List[List[tuple]],
+                         analyze: Callable[[List[tuple]], Optional[Dict[str, Any]]]) -> List[tuple]:
+        """
+        (batch, result) for every batch analyze() succeeded on; several
+        batches run concurrently on a short-lived pool (the service executor
+        is reserved for the model calls themselves).
+        """
+        if len(batches) == 1:
+            results = [analyze(batches[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(len(batches), self.max_concurrency)) as pool:
+                results = list(pool.map(analyze, batches))
+        return [(batch, result) for batch, result in zip(batches, results) if isinstance(result, dict)]
+    
+    def _merge_batch_analyses(self, analyses: List[tuple], ranked: Optional[Dict[str, List[str]]] = None,
+                              agreed: Optional[Dict[str, str]] = None, averaged: Sequence[str] = (),
+                              listed: Sequence[str] = (), joined: Sequence[str] = ()) -> Dict[str, Any]:
+        """
+        Combine per-batch analyses into one. A single analysis is returned
+        as is. Otherwise `ranked` fields take the last (worst) value in their
+        order, `agreed` fields keep a value all batches agree on or else the
+        given one, `averaged` fields are weighted by batch size, `listed`
+        fields (lists, or dicts of lists) are concatenated without repeats
+        and `joined` texts are joined.
+        """
+        if len(analyses) == 1:
+            return analyses[0][1]
+        results = [result for _, result in analyses]
+        merged = dict(results[0])
+        for field, order in (ranked or {}).items():
+            values = [r.get(field) for r in results if r.get(field) in order]
+            if values:
+                merged[field] = max(values, key=order.index)
+        for field, disagreement in (agreed or {}).items():
+            values = {r.get(field) for r in results if r.get(field) is not None}
+            merged[field] = values.pop() if len(values) == 1 else disagreement
+        for field in averaged:
+            weighted = [(r[field], len(batch)) for batch, r in analyses if isinstance(r.get(field), (int, float))]
+            if weighted:
+                merged[field] = round(sum(v * n for v, n in weighted) / sum(n for _, n in weighted))
+        for field in listed:
+            values = [r.get(field) for r in results if r.get(field)]
+            if all(isinstance(v, dict) for v in values):
+                merged[field] = {key: self._concat_unique([v.get(key) for v in values])
+                                 for key in dict.fromkeys(k for v in values for k in v)}
+            else:
+                merged[field] = self._concat_unique(values)
+        for field in joined:
+            merged[field] = " ".join(r[field] for r in results if isinstance(r.get(field), str) and r[field])
+        return merged
+    
+    def _concat_unique(self, lists: List[Any]) -> List[Any]:
+        merged = []
+        for items in lists:
+            for item in items if isinstance(items, list) else []:
+                if item not in merged:
+                    merged.append(item)
+        return merged
+    
+    def verify_articles_batch(self, articles: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Verify many articles with as few Gemini calls as possible.
+        
+        Articles are packed into structured prompts that fit the token budget;
+        a batch whose response cannot be parsed (or misses an article) is split
+        in half and retried. A batch whose call fails (timeout, API error, open
+        breaker) gets fallback verdicts without further calls.
+        
+        Args:
+            articles: List of articles; `id` is used as the key when present,
+                otherwise the URL, otherwise the position in the list. Repeated
+                keys are kept apart as `<key>#2`, `<key>#3`, ...
             
-            response_text = self._generate_content_with_timeout(prompt, timeout=15)
-            summary = self._parse_json_response(response_text)
+        Returns:
+            Dictionary mapping article ID to its verdict
+        """
+        keyed = self._key_articles(articles)
+        verdicts = {}
+        for batch in self._pack_batches(keyed):
+            verdicts.update(self._verify_batch(batch))
+        return verdicts
+    
+    async def verify_articles_batch_async(self, articles: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Async variant of verify_articles_batch; batches run concurrently."""
+        keyed = self._key_articles(articles)
+        results = await asyncio.gather(*(self._verify_batch_async(batch) for batch in self._pack_batches(keyed)))
+        verdicts = {}
+        for result in results:
+            verdicts.update(result)
+        return verdicts
+    
+    def _verify_batch(self, batch: List[tuple]) -> Dict[str, Dict[str, Any]]:
+        verdicts = self._analyze(**self._batch_request(batch))
+        if verdicts is None and len(batch) > 1:
+            middle = len(batch) // 2
+            return {**self._verify_batch(batch[:middle]), **self._verify_batch(batch[middle:])}
+        return verdicts or self._fallback_batch_verdicts(batch)
+    
+    async def _verify_batch_async(self, batch: List[tuple]) -> Dict[str, Dict[str, Any]]:
+        verdicts = await self._analyze_async(**self._batch_request(batch))
+        if verdicts is None and len(batch) > 1:
+            middle = len(batch) // 2
+            halves = await asyncio.gather(self._verify_batch_async(batch[:middle]), self._verify_batch_async(batch[middle:]))
+            return {**halves[0], **halves[1]}
+        return verdicts or self._fallback_batch_verdicts(batch)
+    
+    def _batch_request(self, batch: List[tuple]) -> Dict[str, Any]:
+        """
+        An unusable response parses to None (the caller splits the batch);
+        timeouts, API and breaker errors fall back at once, since smaller
+        prompts would fail the same way.
+        """
+        return {
+            'prompt': self._batch_prompt(batch),
+            'timeout': 20,
+            'result': lambda response_text: self._batch_result(response_text, batch),
+            'fallback': lambda: self._fallback_batch_verdicts(batch),
+            'action': f"verifying article batch of {len(batch)}"
+        }
+    
+    def _fallback_batch_verdicts(self, batch: List[tuple]) -> Dict[str, Dict[str, Any]]:
+        return {article_id: self._get_fallback_batch_verdict() for article_id, _ in batch}
+    
+    def _key_articles(self, articles: List[Dict[str, Any]]) -> List[tuple]:
+        """(key, article) pairs; a repeated ID or URL gets a #2, #3, ... suffix"""
+        keyed = []
+        seen = set()
+        for i, article in enumerate(articles):
+            base = str(article.get('id') or article.get('url') or f"article-{i + 1}")
+            article_id = base
+            n = 1
+            while article_id in seen:
+                n += 1
+                article_id = f"{base}#{n}"
+            seen.add(article_id)
+            keyed.append((article_id, article))
+        return keyed
+    
+    def _article_excerpt(self, article_id: str, article: Dict[str, Any], excerpt_chars: int = 1200) -> str:
+        content = article.get('content') or article.get('description') or ''
+        return (
+            f"[ID: {article_id}]\n"
+            f"Title: {article.get('title', 'No title')}\n"
+            f"Source: {article.get('source') or article.get('source_name') or 'Unknown'}\n"
+            f"Content: {content[:excerpt_chars]}\n"
+        )
+    
+    def _estimate_tokens(self, text: str) -> int:
+        return len(text) // 4 + 1
+    
+    def _pack_batches(self, keyed: List[tuple], excerpt_chars: int = 1200,
+                      max_articles: Optional[int] = None) -> List[List[tuple]]:
+        """
+        Greedily pack (id, article) pairs into batches that fit the token
+        budget and hold at most max_articles (default max_batch_articles).
+        """
+        max_articles = max_articles or self.max_batch_articles
+        batches = []
+        current = []
+        used = 0
+        for article_id, article in keyed:
+            cost = self._estimate_tokens(self._article_excerpt(article_id, article, excerpt_chars))
+            if current and (used + cost > self.batch_token_budget or len(current) >= max_articles):
+                batches.append(current)
+                current = []
+                used = 0
+            current.append((article_id, article))
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
+    
+    def _batch_prompt(self, batch: List[tuple]) -> str:
+        excerpts = "\n".join(self._article_excerpt(article_id, article) for article_id, article in batch)
+        return f"""
+            Analyze each of these {len(batch)} news articles independently for authenticity and credibility:
             
-            if summary:
-                return summary
+            {excerpts}
             
-            return self._get_fallback_fact_check()
-
-        except Exception as e:
-            logger.error(f"Error generating fact-check summary: {str(e)}")
-            return self._get_fallback_fact_check()
-
+            For every article, evaluate factual accuracy indicators, bias, sensationalism and evidence quality.
+            
+            Return ONLY JSON with one entry per article ID, using the IDs exactly as given:
+            {{
+                "verdicts": {{
+                    "<article ID>": {{
+                        "authenticity_score": 0-100,
+                        "credibility_level": "high|medium|low",
+                        "political_bias": "left|center|right|unknown",
+                        "sensationalism": "high|medium|low|none",
+                        "red_flags": ["flag1"],
+                        "recommendation": "trust|verify|caution|avoid",
+                        "summary": "One-sentence assessment"
+                    }}
+                }}
+            }}
+            """
+    
+    def _batch_result(self, response_text: str, batch: List[tuple]) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Map a batch response back to article IDs; None if any article is missing."""
+        data = self._parse_json_response(response_text)
+        verdicts = (data or {}).get('verdicts') if isinstance(data, dict) else None
+        if not isinstance(verdicts, dict):
+            return None
+        
+        verified_at = datetime.now().isoformat()
+        result = {}
+        for article_id, _ in batch:
+            verdict = verdicts.get(article_id)
+            if not isinstance(verdict, dict):
+                return None
+            verdict['verified_at'] = verified_at
+            result[article_id] = verdict
+        return result
+    
     def discover_trending_topics(self) -> List[Dict[str, Any]]:
         """
         Discover today's trending international topics using Google Gemini.
@@ -441,6 +851,20 @@ class GeminiVerificationService:
             "fallback": True
         }
     
+    def _get_fallback_batch_verdict(self) -> Dict[str, Any]:
+        """Fallback per-article verdict for batched verification."""
+        return {
+            "authenticity_score": 50,
+            "credibility_level": "unknown",
+            "political_bias": "unknown",
+            "sensationalism": "unknown",
+            "red_flags": [],
+            "recommendation": "verify",
+            "summary": "Verification unavailable - manual review recommended",
+            "verified_at": datetime.now().isoformat(),
+            "fallback": True
+        }
+    
     def _get_fallback_pattern_analysis(self) -> Dict[str, Any]:
         """Fallback pattern analysis when Gemini is unavailable."""
         return {
@@ -10,6 +10,8 @@ import aiohttp
 from typing import List, Dict, Any, Optional
 import logging
 
+from .resilience import get_provider, RetryableError, CircuitOpenError
+
 logger = logging.getLogger(__name__)
 
 class LambdaService:
@@ -35,6 +37,9 @@ class LambdaService:
         }
         """
         
+        self.request_timeout = float(os.getenv('GRAPHQL_TIMEOUT_SECONDS', 60))
+        self.resilience = get_provider('lambda')
+        
         logger.info(f"Lambda service initialized with GraphQL endpoint: {self.graphql_endpoint}")
     
     async def _invoke_lambda_via_graphql(self, prompt: str, max_tokens: int = 1000, temperature: float = 0.7) -> Optional[Dict[str, Any]]:
@@ -56,32 +61,11 @@ class LambdaService:
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.graphql_endpoint,
-                    headers=headers,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=60)
-                ) as response:
-                    
-                    if response.status != 200:
-                        logger.error(f"GraphQL request failed with status {response.status}")
-                        return None
-                    
-                    result = await response.json()
-                    
-                    if 'errors' in result:
-                        logger.error(f"GraphQL errors: {result['errors']}")
-                        return None
-                    
-                    if 'data' in result and 'invokeLLM' in result['data']:
-                        # Parse the JSON response from Lambda
-                        lambda_response = json.loads(result['data']['invokeLLM'])
-                        return lambda_response
-                    
-                    logger.error(f"Unexpected GraphQL response format: {result}")
-                    return None
-                    
+            # Retry transient failures; fail fast while the breaker is open
+            return await self.resilience.call(lambda: self._post_graphql(headers, payload))
+        except CircuitOpenError as e:
+            logger.warning(f"Skipping GraphQL request: {e}")
+            return None
         except asyncio.TimeoutError:
             logger.error("GraphQL request timed out")
             return None
@@ -89,6 +73,39 @@ class LambdaService:
             logger.error(f"GraphQL request failed: {e}")
             return None
     
+    async def _post_graphql(self, headers: Dict[str, str], payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Single GraphQL round-trip; raises RetryableError for throttling and 5xx
+        """
+        async with aiohttp.ClientSession() as session:
+            async with session.post(
+                self.graphql_endpoint,
+                headers=headers,
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout)
+            ) as response:
+                
+                if response.status == 429 or response.status >= 500:
+                    raise RetryableError(f"GraphQL request failed with status {response.status}")
+                
+                if response.status != 200:
+                    logger.error(f"GraphQL request failed with status {response.status}")
+                    return None
+                
+                result = await response.json()
+                
+                if 'errors' in result:
+                    logger.error(f"GraphQL errors: {result['errors']}")
+                    return None
+                
+                if 'data' in result and 'invokeLLM' in result['data']:
+                    # Parse the JSON response from Lambda
+                    lambda_response = json.loads(result['data']['invokeLLM'])
+                    return lambda_response
+                
+                logger.error(f"Unexpected GraphQL response format: {result}")
+                return None
+    
     async def generate_summary(self, title: str, description: str) -> Optional[str]:
         """
         Generate article summary using Lambda function
@@ -259,6 +276,23 @@ Analysis:"""
             logger.error(f"Topic clustering failed: {e}")
             return None
     
+    async def summary_fields(self, articles: List[Dict[str, Any]], concurrency: int = 5) -> List[Dict[str, Any]]:
+        """
+        Generate summaries for articles concurrently and return one
+        {'ai_summary': ...} patch per article (None when generation fails)
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def one(article: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return {'ai_summary': await self.generate_summary(article.get('title', ''), article.get('description', ''))}
+                except Exception as e:
+                    logger.error(f"Error summarizing article {article.get('title', 'Unknown')}: {e}")
+                    return {'ai_summary': None}
+        
+        return list(await asyncio.gather(*(one(article) for article in articles)))
+    
     async def batch_process_articles(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Process multiple articles using Lambda function
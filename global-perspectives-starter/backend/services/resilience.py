@@ -0,0 +1,346 @@
+"""
+Provider Resilience Layer
+
+Shared retry, circuit breaker and hedging primitives for the LLM providers
+(Bedrock, Lambda/GraphQL, Gemini, ChatGPT). Each provider gets one
+ProviderResilience instance from the registry so breaker state and metrics
+are shared by every call site that talks to it.
+"""
+
+import os
+import time
+import random
+import asyncio
+import threading
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+RETRYABLE_ERROR_CODES = {
+    'ThrottlingException',
+    'TooManyRequestsException',
+    'ServiceUnavailableException',
+    'InternalServerException',
+    'ModelTimeoutException',
+    'DependencyFailedException',
+}
+
+
+class RetryableError(Exception):
+    """Raised by providers for failures worth retrying (throttling, 5xx, ...)."""
+
+
+class CircuitOpenError(Exception):
+    """Raised when a provider's circuit breaker is open and the call is skipped."""
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """
+    Decide whether an exception is transient.
+
+    Provider SDKs are optional imports, so errors are classified by shape
+    (status codes, AWS error codes, class names) instead of by type.
+    """
+    if isinstance(exc, CircuitOpenError):
+        return False
+    if isinstance(exc, (RetryableError, TimeoutError, asyncio.TimeoutError, ConnectionError)):
+        return True
+
+    status = getattr(exc, 'status_code', None) or getattr(exc, 'status', None)
+    if isinstance(status, int):
+        return status in RETRYABLE_STATUS_CODES
+
+    response = getattr(exc, 'response', None)
+    if isinstance(response, dict):
+        code = (response.get('Error') or {}).get('Code')
+        if code:
+            return code in RETRYABLE_ERROR_CODES
+
+    name = type(exc).__name__.lower()
+    return any(marker in name for marker in ('timeout', 'connect', 'throttl', 'unavailable'))
+
+
+@dataclass
+class RetryPolicy:
+    """Jittered exponential backoff settings"""
+    max_attempts: int = 3
+    base_delay: float = 0.25
+    max_delay: float = 4.0
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before retry number `attempt` (1-based)"""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a half-open probe"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.times_opened = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Return True if a call may proceed"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() - (self.opened_at or 0) < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            # Half-open: let a single probe through
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.times_opened += 1
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def record_neutral(self):
+        """End an attempt that says nothing about provider health (e.g. a bad request)"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'times_opened': self.times_opened,
+            }
+
+
+class ProviderResilience:
+    """Retry + circuit breaker (+ optional hedging) wrapper for one provider"""
+
+    def __init__(self, name: str, retry_policy: Optional[RetryPolicy] = None,
+                 breaker: Optional[CircuitBreaker] = None, hedge_delay: Optional[float] = None):
+        self.name = name
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.hedge_delay = hedge_delay
+        self._counters = {
+            'calls': 0,
+            'successes': 0,
+            'failures': 0,
+            'retries': 0,
+            'short_circuits': 0,
+            'cancellations': 0,
+            'hedges': 0,
+            'hedge_wins': 0,
+        }
+        self._lock = threading.Lock()
+
+    def _incr(self, counter: str, amount: int = 1):
+        with self._lock:
+            self._counters[counter] += amount
+
+    def _check_breaker(self):
+        if not self.breaker.allow():
+            self._incr('short_circuits')
+            raise CircuitOpenError(f"{self.name} circuit breaker is open")
+
+    def _on_failure(self, exc: BaseException, attempt: int) -> bool:
+        """Record a failed attempt; return True if another attempt should follow"""
+        retryable = is_retryable(exc)
+        if retryable:
+            self.breaker.record_failure()
+        else:
+            # Frees a half-open probe slot without closing or reopening the breaker
+            self.breaker.record_neutral()
+        if not retryable or attempt >= self.retry_policy.max_attempts:
+            self._incr('failures')
+            return False
+        logger.warning(f"{self.name} attempt {attempt} failed ({exc}); retrying")
+        self._incr('retries')
+        return True
+
+    def _on_abort(self):
+        """
+        Record an attempt cut short by cancellation (a client disconnect, a
+        sibling task failing) or an interrupt. That says nothing about the
+        provider, so it only frees a half-open probe slot; timeouts are
+        failures, but they arrive as TimeoutError through _on_failure.
+        """
+        self.breaker.record_neutral()
+        self._incr('cancellations')
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run an async provider call with retries, breaker and hedging"""
+        self._incr('calls')
+        attempt = 0
+        while True:
+            attempt += 1
+            self._check_breaker()
+            try:
+                if self.hedge_delay is not None:
+                    result = await self._hedged(fn)
+                else:
+                    result = await fn()
+            except Exception as e:
+                if not self._on_failure(e, attempt):
+                    raise
+                await asyncio.sleep(self.retry_policy.backoff(attempt))
+                continue
+            except BaseException:
+                self._on_abort()
+                raise
+            self.breaker.record_success()
+            self._incr('successes')
+            return result
+
+    def call_sync(self, fn: Callable[[], T]) -> T:
+        """Run a blocking provider call with retries and breaker"""
+        self._incr('calls')
+        attempt = 0
+        while True:
+            attempt += 1
+            self._check_breaker()
+            try:
+                result = fn()
+            except Exception as e:
+                if not self._on_failure(e, attempt):
+                    raise
+                time.sleep(self.retry_policy.backoff(attempt))
+                continue
+            except BaseException:
+                self._on_abort()
+                raise
+            self.breaker.record_success()
+            self._incr('successes')
+            return result
+
+    async def _hedged(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Start a backup request if the first one has not finished within
+        hedge_delay, and return whichever succeeds first.
+        """
+        primary = asyncio.ensure_future(fn())
+        pending = {primary}
+        error: Optional[BaseException] = None
+        try:
+            # Inside the try, so a caller cancelled while waiting here does
+            # not leave the primary request running
+            done, _ = await asyncio.wait(pending, timeout=self.hedge_delay)
+            if done:
+                return primary.result()
+
+            self._incr('hedges')
+            backup = asyncio.ensure_future(fn())
+            pending = {primary, backup}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup:
+                            self._incr('hedge_wins')
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            'provider': self.name,
+            'breaker': self.breaker.snapshot(),
+            'hedge_delay': self.hedge_delay,
+            **counters,
+        }
+
+
+_providers: Dict[str, ProviderResilience] = {}
+_registry_lock = threading.Lock()
+
+
+def _env_number(name: str, default, cast=float):
+    value = os.getenv(name)
+    if value in (None, ''):
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        logger.warning(f"Ignoring invalid {name}={value!r}")
+        return default
+
+
+def get_provider(name: str, max_attempts: int = 3, hedge_delay: Optional[float] = None) -> ProviderResilience:
+    """
+    Get (or create) the shared resilience wrapper for a provider.
+
+    Defaults can be overridden per provider with environment variables, e.g.
+    GEMINI_MAX_ATTEMPTS, GEMINI_BREAKER_THRESHOLD, GEMINI_BREAKER_RESET_SECONDS
+    and GEMINI_HEDGE_DELAY_SECONDS.
+    """
+    with _registry_lock:
+        if name not in _providers:
+            prefix = name.upper()
+            _providers[name] = ProviderResilience(
+                name,
+                retry_policy=RetryPolicy(
+                    max_attempts=_env_number(f'{prefix}_MAX_ATTEMPTS', max_attempts, int),
+                    base_delay=_env_number('LLM_RETRY_BASE_DELAY_SECONDS', 0.25),
+                    max_delay=_env_number('LLM_RETRY_MAX_DELAY_SECONDS', 4.0),
+                ),
+                breaker=CircuitBreaker(
+                    failure_threshold=_env_number(f'{prefix}_BREAKER_THRESHOLD', 5, int),
+                    reset_timeout=_env_number(f'{prefix}_BREAKER_RESET_SECONDS', 30.0),
+                ),
+                hedge_delay=_env_number(f'{prefix}_HEDGE_DELAY_SECONDS', hedge_delay),
+            )
+        return _providers[name]
+
+
+def provider_metrics() -> Dict[str, Dict[str, Any]]:
+    """Metrics for every registered provider, keyed by provider name"""
+    with _registry_lock:
+        providers = list(_providers.values())
+    return {p.name: p.metrics() for p in providers}
+
+
+def render_prometheus(metrics: Dict[str, Dict[str, Any]]) -> str:
+    """Render provider metrics in the Prometheus text exposition format"""
+    state_values = {CircuitBreaker.CLOSED: 0, CircuitBreaker.HALF_OPEN: 1, CircuitBreaker.OPEN: 2}
+    lines = []
+    for name, m in sorted(metrics.items()):
+        label = f'provider="{name}"'
+        for counter in ('calls', 'successes', 'failures', 'retries', 'short_circuits', 'hedges', 'hedge_wins'):
+            lines.append(f'llm_provider_{counter}_total{{{label}}} {m[counter]}')
+        lines.append(f'llm_provider_breaker_state{{{label}}} {state_values[m["breaker"]["state"]]}')
+        lines.append(f'llm_provider_breaker_opened_total{{{label}}} {m["breaker"]["times_opened"]}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,125 @@
+"""
+Streaming Enhanced Search
+
+Staged variant of /api/search/enhanced. The classified, stacked articles are
+emitted as soon as the cheap stages finish; location NER and Bedrock/Lambda
+summaries then run concurrently and each result is emitted as a patch for
+one article as soon as it completes.
+"""
+
+import os
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from backend.tools import newsapi, ner_geo, present, pipeline
+from backend.responses import search_payload, compact_payload
+from .bedrock_service import bedrock_service
+from .lambda_service import lambda_service
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+async def _locate(articles: List[Dict[str, Any]], ids: List[str], queue: asyncio.Queue):
+    """Run location NER article by article off the event loop"""
+    try:
+        for article_id, article in zip(ids, articles):
+            try:
+                located = await asyncio.to_thread(ner_geo.locate_article, article)
+            except Exception as e:
+                logger.error(f"Location extraction failed for {article.get('title', 'Unknown')}: {e}")
+                continue
+            fields = {k: located[k] for k in ner_geo.LOCATION_FIELDS if k in located}
+            if fields:
+                await queue.put({"id": article_id, "stage": "locations", "fields": fields})
+    finally:
+        await queue.put(_DONE)
+
+
+async def _summarize(articles: List[Dict[str, Any]], ids: List[str], queue: asyncio.Queue,
+                     use_lambda: bool, concurrency: int):
+    """Generate AI summaries with bounded concurrency, in completion order"""
+    # Same fields and fallbacks as the batch_process_articles of each service
+    service, field, fallback = (
+        (lambda_service, "ai_summary", None) if use_lambda
+        else (bedrock_service, "summary", "Summary generation failed")
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(article_id: str, article: Dict[str, Any]):
+        async with semaphore:
+            try:
+                summary = await service.generate_summary(article.get("title", ""), article.get("description", ""))
+                if not summary and not use_lambda:
+                    summary = "Summary not available"
+            except Exception as e:
+                logger.error(f"Error summarizing article {article.get('title', 'Unknown')}: {e}")
+                summary = fallback
+        await queue.put({"id": article_id, "stage": "summary", "fields": {field: summary}})
+
+    try:
+        await asyncio.gather(*(one(article_id, article) for article_id, article in zip(ids, articles)))
+    finally:
+        await queue.put(_DONE)
+
+
+def _initial_payload(raw: List[Dict[str, Any]], q: str, language: str,
+                     use_lambda: bool) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Classified articles and the compact payload of the first event"""
+    articles = pipeline.process_articles(raw, locations=False)
+    payload = compact_payload(search_payload(
+        present.stack_by_country(articles),
+        articles=articles,
+        perspective_summary=present.generate_perspective_summary(articles),
+        query_metadata={
+            "query": q,
+            "language": language,
+            "total_articles": len(articles),
+            "service_used": "lambda_graphql" if use_lambda else "bedrock_direct",
+        },
+    ))
+    return articles, payload
+
+
+async def stream_enhanced_search(q: str, language: str = "en", use_lambda: bool = False,
+                                 with_locations: bool = True,
+                                 concurrency: Optional[int] = None) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Yield (event, data) pairs:
+      articles - compact search payload (articles_by_id + stacks of IDs)
+      patch    - {id, stage, fields} to merge into one article
+      done     - completion summary
+    """
+    concurrency = concurrency or int(os.getenv("SEARCH_STREAM_AI_CONCURRENCY", 4))
+
+    raw = await newsapi.search_today(q=q, language=language)
+    # Classification, stacking and compaction are CPU-bound; run them in the
+    # default executor (as run_article_pipeline does) so large result sets
+    # do not block other requests
+    articles, payload = await asyncio.to_thread(_initial_payload, raw, q, language, use_lambda)
+    yield "articles", payload
+
+    ids = payload["articles"]
+    queue: asyncio.Queue = asyncio.Queue()
+    workers = [asyncio.create_task(_summarize(articles, ids, queue, use_lambda, concurrency))]
+    if with_locations:
+        workers.append(asyncio.create_task(_locate(articles, ids, queue)))
+
+    patches = 0
+    remaining = len(workers)
+    try:
+        while remaining:
+            item = await queue.get()
+            if item is _DONE:
+                remaining -= 1
+                continue
+            patches += 1
+            yield "patch", item
+    finally:
+        # Stop enrichment if the client went away
+        for worker in workers:
+            worker.cancel()
+
+    yield "done", {"total_articles": len(ids), "patches": patches}
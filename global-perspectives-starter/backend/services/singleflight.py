@@ -0,0 +1,94 @@
+"""
+Single-Flight Response Cache
+
+Coalesces identical concurrent requests onto one in-flight computation and
+keeps the result in a short-TTL cache, so a burst of users searching the same
+breaking story runs the pipeline and LLM fan-out once.
+
+Results are shared by reference between all waiters and cache hits, so they
+are read-only: the response renderers build new containers around them, and
+a caller that needs to change a result must make its own (shallow) copy.
+"""
+
+import os
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from .ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def normalize_query(q: Optional[str]) -> str:
+    """Case- and whitespace-insensitive form of a search query"""
+    return " ".join((q or "").lower().split())
+
+
+def search_key(endpoint: str, q: Optional[str], language: Optional[str]) -> tuple:
+    """Cache key for a search request: (endpoint, normalized q, language)"""
+    return (endpoint, normalize_query(q), (language or "en").lower())
+
+
+class SingleFlight:
+    """Async single-flight group backed by a TTL cache of successful results"""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 512):
+        self.cache = TTLCache(ttl_seconds, max_entries=max_entries)
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self.computations = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached result for key, join an in-flight computation for
+        it, or start one. The result is shared and must not be modified.
+        Failures are shared with current waiters but never cached.
+        """
+        value = self.cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+            else:
+                future = asyncio.ensure_future(self._run(key, fn))
+                # Retrieve the exception even if every waiter has gone away
+                future.add_done_callback(lambda f: f.cancelled() or f.exception())
+                self._inflight[key] = future
+                self.computations += 1
+        # Shield so one client disconnecting does not cancel everyone's work
+        return await asyncio.shield(future)
+
+    async def _run(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await fn()
+            self.cache.set(key, value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "cached_entries": len(self.cache),
+            "cache_hits": self.cache.hits,
+            "computations": self.computations,
+            "coalesced": self.coalesced,
+        }
+
+    def clear(self):
+        self.cache.clear()
+
+
+# Shared by the search endpoints
+search_flights = SingleFlight(
+    ttl_seconds=float(os.getenv("SEARCH_CACHE_TTL_SECONDS", 60)),
+    max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", 512)),
+)
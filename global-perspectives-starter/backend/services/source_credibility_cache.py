@@ -0,0 +1,191 @@
+"""
+Source Credibility Cache
+
+Per-domain cache of source credibility analyses (per source name for
+sources without a usable URL). Publisher credibility
+changes over weeks, so known publishers are answered from publishers.json and
+Gemini results are kept on disk with long TTLs; stale entries are served
+while a background refresh runs.
+"""
+
+import os
+import json
+import time
+import threading
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+DAY_SECONDS = 24 * 60 * 60
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent / "data" / "cache" / "source_credibility.json"
+NAME_KEY_PREFIX = "name:"
+
+POLITICAL_LEAN = {
+    "left": "left",
+    "center_left": "left",
+    "center": "center",
+    "center_right": "right",
+    "right": "right",
+}
+
+
+def domain_for(source_url: Optional[str]) -> Optional[str]:
+    """Normalize a URL (or bare domain) to its host without a www. prefix"""
+    if not source_url:
+        return None
+    url = source_url if "://" in source_url else f"https://{source_url}"
+    try:
+        host = (urlparse(url).hostname or "").lower()
+    except ValueError:
+        return None
+    if host.startswith("www."):
+        host = host[4:]
+    return host or None
+
+
+def credibility_key(source_url: Optional[str], source_name: Optional[str]) -> Optional[str]:
+    """Cache key for a source: its domain, else name:<lowercased source name>"""
+    domain = domain_for(source_url)
+    if domain:
+        return domain
+    name = " ".join((source_name or "").lower().split())
+    return f"{NAME_KEY_PREFIX}{name}" if name else None
+
+
+def _reputation_level(score: int) -> str:
+    if score >= 85:
+        return "excellent"
+    if score >= 70:
+        return "good"
+    if score >= 50:
+        return "fair"
+    return "poor"
+
+
+def analysis_from_publisher(name: str, info) -> Dict[str, Any]:
+    """Build an analyze_source_credibility-shaped result from a PublisherInfo"""
+    score = info.credibility_score
+    return {
+        "credibility_score": score,
+        "reputation_level": _reputation_level(score),
+        "editorial_quality": "high" if score >= 85 else "medium" if score >= 60 else "low",
+        "bias_profile": {
+            "political_lean": POLITICAL_LEAN.get(info.bias_rating, "unknown"),
+            "factual_reporting": info.factual_reporting,
+            "bias_rating": info.bias_rating,
+        },
+        "strengths": [],
+        "concerns": [],
+        "regional_focus": "international" if info.type == "wire_service" else "national",
+        "language": "unknown",
+        "trust_indicators": [info.type],
+        "recommendation": "highly_trusted" if score >= 85 else "trusted" if score >= 60 else "use_caution",
+        "notes": f"{name}: {info.description} (from publisher database)",
+    }
+
+
+class SourceCredibilityCache:
+    """Thread-safe, file-backed credibility cache keyed by domain"""
+
+    def __init__(self, path: Optional[Path] = None, ttl_seconds: float = 30 * DAY_SECONDS,
+                 refresh_after_seconds: float = 7 * DAY_SECONDS):
+        self.path = Path(path or os.getenv("SOURCE_CREDIBILITY_CACHE_PATH") or DEFAULT_CACHE_PATH)
+        self.ttl_seconds = ttl_seconds
+        self.refresh_after_seconds = refresh_after_seconds
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._seeded: Dict[str, Dict[str, Any]] = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f).get("entries", {})
+        except FileNotFoundError:
+            self._entries = {}
+        except Exception as e:
+            logger.warning(f"Could not load source credibility cache from {self.path}: {e}")
+            self._entries = {}
+
+    def _save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"entries": self._entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Could not persist source credibility cache to {self.path}: {e}")
+
+    def seed_from_publishers(self, publisher_service) -> int:
+        """Seed the domains and names of known publishers; seeded entries never go stale"""
+        seeded = {}
+        for domain, name in publisher_service.domain_mapping.items():
+            info = publisher_service.get_publisher_info(name)
+            if info:
+                seeded[domain] = seeded[credibility_key(None, name)] = analysis_from_publisher(name, info)
+        with self._lock:
+            self._seeded = seeded
+        return len(seeded)
+
+    def _find(self, domain: str) -> Tuple[Optional[str], Optional[Dict[str, Any]], bool]:
+        """Look up a domain and its parent domains (a name key as is); returns (key, entry, seeded)"""
+        if domain.startswith(NAME_KEY_PREFIX):
+            candidates = [domain]
+        else:
+            parts = domain.split(".")
+            candidates = [".".join(parts[i:]) for i in range(len(parts) - 1)]
+        for candidate in candidates:
+            if candidate in self._entries:
+                return candidate, self._entries[candidate], False
+            if candidate in self._seeded:
+                return candidate, {"analysis": self._seeded[candidate]}, True
+        return None, None, False
+
+    def get(self, domain: Optional[str]) -> Optional[Tuple[Dict[str, Any], bool]]:
+        """
+        Return (analysis, is_stale) for a domain, or None if unknown/expired.
+        """
+        if not domain:
+            return None
+        with self._lock:
+            key, entry, seeded = self._find(domain)
+            if entry is None:
+                return None
+            if seeded:
+                return dict(entry["analysis"]), False
+            age = time.time() - entry.get("cached_at", 0)
+            if age >= self.ttl_seconds:
+                del self._entries[key]
+                return None
+            return dict(entry["analysis"]), age >= self.refresh_after_seconds
+
+    def put(self, domain: Optional[str], analysis: Dict[str, Any]):
+        """Store a fresh (non-fallback) analysis for a domain"""
+        if not domain or analysis.get("fallback"):
+            return
+        with self._lock:
+            self._entries[domain] = {"analysis": analysis, "cached_at": time.time()}
+            self._save()
+
+    def refresh_in_background(self, domain: str, fetch: Callable[[], Dict[str, Any]]):
+        """Re-fetch a stale entry on a daemon thread, at most once per domain at a time"""
+        with self._lock:
+            if domain in self._refreshing:
+                return
+            self._refreshing.add(domain)
+
+        def run():
+            try:
+                self.put(domain, fetch())
+            except Exception as e:
+                logger.warning(f"Background credibility refresh failed for {domain}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(domain)
+
+        threading.Thread(target=run, name=f"credibility-refresh-{domain}", daemon=True).start()
@@ -0,0 +1,173 @@
+"""
+Trending Topics Refresher
+
+Precomputes Gemini trending topics and the headline topics (with their
+NewsAPI-fallback articles) on an interval inside the API process. Requests
+read the latest snapshot; a snapshot older than the refresh interval is still
+served while a background refresh replaces it (stale-while-revalidate).
+
+The Gemini topics and headline selection do not depend on the language, so
+they are computed once per interval and shared; only the fallback articles
+are fetched per language. Snapshots are kept for a fixed set of languages
+(TRENDING_LANGUAGES); any other requested language gets the default one.
+"""
+
+import os
+import copy
+import time
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+from backend.tools import newsapi
+from .gemini_verification_service import gemini_verification
+from .ai_orchestrator import ai_orchestrator
+
+logger = logging.getLogger(__name__)
+
+# Languages NewsAPI can filter by
+NEWSAPI_LANGUAGES = "ar,de,en,es,fr,he,it,nl,no,pt,ru,sv,ud,zh"
+
+
+async def attach_fallback_articles(ai_result: Dict[str, Any], language: str = "en") -> Dict[str, Any]:
+    """Fetch a small set of fresh articles via NewsAPI for topics that have none"""
+    for topic in ai_result.get('topics', []):
+        if topic.get('articles'):
+            continue
+        topic_articles = []
+        keywords = topic.get('search_keywords', []) or [topic.get('title', '')]
+        regions = topic.get('regions', [])
+        region = regions[0] if regions else 'Global'
+        try:
+            # Use first keyword to fetch a small set of fresh articles
+            kw = (keywords[0] if keywords else topic.get('title', 'world')) or 'world'
+            raw = await newsapi.search_today(q=kw, language=language)
+            for art in (raw[:6] if raw else []):
+                source_name = art.get('source', {}).get('name') or art.get('source_name', '')
+                topic_articles.append({
+                    'title': art.get('title', ''),
+                    'description': art.get('description', ''),
+                    'content': art.get('content', ''),
+                    'url': art.get('url', ''),
+                    'source_name': source_name,
+                    'publish_date': art.get('publishedAt', ''),
+                    'image_url': art.get('urlToImage', ''),
+                    'author': art.get('author', ''),
+                    'language': language,
+                    'word_count': 0,
+                    'region': region,
+                    'verification_analysis': {}
+                })
+        except Exception:
+            # Keep topic articles empty if fetching fails
+            topic_articles = []
+        topic['articles'] = topic_articles
+    return ai_result
+
+
+class TrendingRefresher:
+    """Interval refresher holding one trending snapshot per language"""
+
+    def __init__(self):
+        self.interval_seconds = float(os.getenv('TRENDING_REFRESH_SECONDS', 30 * 60))
+        self.default_language = os.getenv('TRENDING_DEFAULT_LANGUAGE', 'en')
+        self.languages = frozenset(
+            code.strip().lower() for code in os.getenv('TRENDING_LANGUAGES', NEWSAPI_LANGUAGES).split(',') if code.strip()
+        ) | {self.default_language}
+        self._snapshots: Dict[str, Dict[str, Any]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._topics: Optional[Dict[str, Any]] = None
+        self._topics_task: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+
+    def _language(self, language: Optional[str]) -> str:
+        """A supported language code; anything else maps to the default language"""
+        language = (language or '').strip().lower()
+        return language if language in self.languages else self.default_language
+
+    async def _shared_topics(self) -> Dict[str, Any]:
+        """Gemini topics and headlines for every language, recomputed once per interval"""
+        shared = self._topics
+        if shared is not None and time.time() - shared['refreshed_at'] < self.interval_seconds:
+            return shared
+        if self._topics_task is None or self._topics_task.done():
+            self._topics_task = asyncio.create_task(self._compute_topics())
+        return await asyncio.shield(self._topics_task)
+
+    async def _compute_topics(self) -> Dict[str, Any]:
+        topics = await asyncio.to_thread(gemini_verification.discover_trending_topics)
+        headlines = await asyncio.to_thread(ai_orchestrator.get_todays_headlines, topics)
+        self._topics = {'topics': topics, 'headlines': headlines, 'refreshed_at': time.time()}
+        return self._topics
+
+    async def _compute(self, language: str) -> Dict[str, Any]:
+        shared = await self._shared_topics()
+        # Fallback articles are attached to the topics in place
+        headlines = copy.deepcopy(shared['headlines'])
+        if headlines.get('success'):
+            await attach_fallback_articles(headlines, language=language)
+        return {
+            'topics': shared['topics'],
+            'headlines': headlines,
+            'refreshed_at': time.time(),
+            'language': language
+        }
+
+    def refresh(self, language: Optional[str] = None) -> "asyncio.Task":
+        """Start (or join) a refresh for a language and return its task"""
+        language = self._language(language)
+        task = self._inflight.get(language)
+        if task is None or task.done():
+            task = asyncio.create_task(self._refresh(language))
+            self._inflight[language] = task
+        return task
+
+    async def _refresh(self, language: str) -> Dict[str, Any]:
+        try:
+            snapshot = await self._compute(language)
+            self._snapshots[language] = snapshot
+            logger.info(f"Refreshed trending snapshot ({language}): {len(snapshot['topics'])} topics")
+            return snapshot
+        finally:
+            self._inflight.pop(language, None)
+
+    async def get(self, language: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Return the snapshot for a language. A stale snapshot is returned
+        immediately while a refresh runs in the background; only the very
+        first request for a language waits for the computation.
+        """
+        language = self._language(language)
+        snapshot = self._snapshots.get(language)
+        if snapshot is None:
+            return await asyncio.shield(self.refresh(language))
+        if time.time() - snapshot['refreshed_at'] >= self.interval_seconds:
+            self.refresh(language)
+        return snapshot
+
+    async def _run(self):
+        while True:
+            languages = set(self._snapshots) | {self.default_language}
+            for language in languages:
+                try:
+                    await self.refresh(language)
+                except Exception as e:
+                    logger.error(f"Trending refresh failed ({language}): {str(e)}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self):
+        """Start the background refresh loop on the running event loop"""
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._loop_task:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+            self._loop_task = None
+
+# Singleton instance
+trending_refresher = TrendingRefresher()
@@ -0,0 +1,287 @@
+"""
+Mergeable Perspective Aggregates
+
+PerspectiveCounts holds the counters behind the perspective summary and the
+per-country stack statistics (counts, sums and per-country tallies). They
+can be updated one article at a time, merged across shards or time buckets,
+and subtracted again when a bucket expires, without keeping the articles.
+Distinct countries are the keys of the tallies; there are only a couple of
+hundred of them, so they are kept exactly rather than sketched.
+
+RollingWindow keeps one PerspectiveCounts per (time bucket, origin country)
+plus running per-country totals, so the "last 24h by country" view is
+maintained incrementally and read with a dict lookup.
+"""
+
+import datetime
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+from .publisher_mapping import publisher_service
+
+_COUNTERS = ("classifications", "publisher_countries", "origin_countries",
+             "foreign_countries", "credibility_categories")
+_SUMS = ("total", "credibility_sum", "wire_services", "state_controlled")
+
+
+class PerspectiveCounts:
+    """Mergeable counters over a set of classified articles"""
+    __slots__ = _SUMS + _COUNTERS
+
+    def __init__(self):
+        self.total = 0
+        self.credibility_sum = 0
+        self.wire_services = 0
+        self.state_controlled = 0
+        self.classifications = Counter()
+        self.publisher_countries = Counter()
+        self.origin_countries = Counter()
+        self.foreign_countries = Counter()
+        self.credibility_categories = Counter()
+
+    @classmethod
+    def from_articles(cls, articles: Iterable[Dict[str, Any]]) -> "PerspectiveCounts":
+        counts = cls()
+        for article in articles:
+            counts.add(article)
+        return counts
+
+    def add(self, article: Dict[str, Any]) -> "PerspectiveCounts":
+        self.total += 1
+        self.credibility_sum += article.get("credibility_score", 50)
+        if article.get("is_wire_service", False):
+            self.wire_services += 1
+        if article.get("is_state_controlled", False):
+            self.state_controlled += 1
+
+        classification = article.get("classification", "unknown")
+        self.classifications[classification] += 1
+        publisher_country = article.get("publisher_country")
+        if publisher_country:
+            self.publisher_countries[publisher_country] += 1
+        origin_country = article.get("origin_country_guess")
+        if origin_country:
+            self.origin_countries[origin_country] += 1
+        if classification == "foreign":
+            self.foreign_countries[publisher_country or "UNK"] += 1
+        self.credibility_categories[article.get("credibility_category", "unknown")] += 1
+        return self
+
+    def merge(self, other: "PerspectiveCounts") -> "PerspectiveCounts":
+        """Add other's counts into this one (shards, time buckets)"""
+        for name in _SUMS:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        for name in _COUNTERS:
+            getattr(self, name).update(getattr(other, name))
+        return self
+
+    def subtract(self, other: "PerspectiveCounts") -> "PerspectiveCounts":
+        """Remove counts previously merged in (an expired time bucket)"""
+        for name in _SUMS:
+            setattr(self, name, getattr(self, name) - getattr(other, name))
+        for name in _COUNTERS:
+            counter = getattr(self, name)
+            counter.subtract(getattr(other, name))
+            for key in [key for key, value in counter.items() if value <= 0]:
+                del counter[key]
+        return self
+
+    def copy(self) -> "PerspectiveCounts":
+        return PerspectiveCounts().merge(self)
+
+    def __add__(self, other: "PerspectiveCounts") -> "PerspectiveCounts":
+        return self.copy().merge(other)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PerspectiveCounts):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in _SUMS + _COUNTERS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {name: getattr(self, name) for name in _SUMS}
+        data.update({name: dict(getattr(self, name)) for name in _COUNTERS})
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PerspectiveCounts":
+        counts = cls()
+        for name in _SUMS:
+            setattr(counts, name, data.get(name, 0))
+        for name in _COUNTERS:
+            getattr(counts, name).update(data.get(name, {}))
+        return counts
+
+    def summary(self) -> Dict[str, Any]:
+        """Counter-based sections of generate_perspective_summary plus stack statistics"""
+        total = self.total
+        classifications = self.classifications
+        categories = self.credibility_categories
+        local = classifications["local"]
+        foreign = classifications["foreign"]
+        return {
+            "total_articles": total,
+            "perspective_breakdown": {
+                "local": local,
+                "foreign": foreign,
+                "regional": classifications["regional"],
+                "neutral": classifications["neutral"]
+            },
+            "country_coverage": {
+                "unique_publisher_countries": len(self.publisher_countries),
+                "unique_origin_countries": len(self.origin_countries),
+                "publisher_distribution": dict(self.publisher_countries.most_common()),
+                "origin_distribution": dict(self.origin_countries.most_common())
+            },
+            "credibility_analysis": {
+                "average_score": round(self.credibility_sum / total, 1) if total else 0,
+                "score_distribution": {
+                    "high": categories["high"],
+                    "medium": categories["medium"],
+                    "low": categories["low"],
+                    "unknown": categories["unknown"]
+                },
+                "wire_services": self.wire_services,
+                "state_controlled": self.state_controlled
+            },
+            "statistics": {
+                "total_articles": total,
+                "local_count": local,
+                "foreign_count": foreign,
+                "regional_count": classifications["regional"],
+                "neutral_count": classifications["neutral"],
+                "unique_foreign_countries": len(self.foreign_countries),
+                "coverage_diversity": len(self.publisher_countries),
+                "foreign_by_country": dict(self.foreign_countries.most_common())
+            }
+        }
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.timestamp()
+
+
+class RollingWindow:
+    """
+    Perspective counts by origin country over the last window_seconds,
+    bucketed by published_at. Totals are updated as articles are added and
+    buckets expire, so get() never re-aggregates.
+    """
+
+    def __init__(self, window_seconds: int = 24 * 3600, bucket_seconds: int = 3600):
+        if window_seconds % bucket_seconds:
+            raise ValueError("window_seconds must be a multiple of bucket_seconds")
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self.buckets: Dict[int, Dict[str, PerspectiveCounts]] = {}
+        self.totals: Dict[str, PerspectiveCounts] = {}
+        self.oldest = None
+        self._summaries: Dict[str, Dict[str, Any]] = {}
+
+    def _bucket(self, timestamp: float) -> int:
+        return int(timestamp // self.bucket_seconds) * self.bucket_seconds
+
+    def add(self, article: Dict[str, Any], timestamp: Optional[float] = None) -> bool:
+        """Count an article in its bucket; False if it is undated or too old"""
+        if timestamp is None:
+            timestamp = _parse_timestamp(article.get("published_at"))
+        if timestamp is None:
+            return False
+        bucket = self._bucket(timestamp)
+        if self.oldest is not None and bucket < self.oldest:
+            return False
+        origin = article.get("origin_country_guess") or "UNK"
+        by_country = self.buckets.setdefault(bucket, {})
+        for counts in (by_country, self.totals):
+            if origin not in counts:
+                counts[origin] = PerspectiveCounts()
+            counts[origin].add(article)
+        self._summaries.pop(origin, None)
+        return True
+
+    def extend(self, articles: Iterable[Dict[str, Any]]) -> int:
+        return sum(self.add(article) for article in articles)
+
+    def advance(self, now: Optional[float] = None) -> int:
+        """Expire buckets that fell out of the window; returns how many"""
+        now = datetime.datetime.now(datetime.timezone.utc).timestamp() if now is None else now
+        self.oldest = self._bucket(now) - self.window_seconds + self.bucket_seconds
+        expired = [bucket for bucket in self.buckets if bucket < self.oldest]
+        for bucket in expired:
+            for origin, counts in self.buckets.pop(bucket).items():
+                total = self.totals[origin].subtract(counts)
+                if not total.total:
+                    del self.totals[origin]
+                self._summaries.pop(origin, None)
+        return len(expired)
+
+    def merge(self, other: "RollingWindow") -> "RollingWindow":
+        """Fold another shard's window (same bucket size) into this one"""
+        if other.bucket_seconds != self.bucket_seconds:
+            raise ValueError("Cannot merge windows with different bucket sizes")
+        for bucket, by_country in other.buckets.items():
+            if self.oldest is not None and bucket < self.oldest:
+                continue
+            mine = self.buckets.setdefault(bucket, {})
+            for origin, counts in by_country.items():
+                for target in (mine, self.totals):
+                    if origin not in target:
+                        target[origin] = PerspectiveCounts()
+                    target[origin].merge(counts)
+                self._summaries.pop(origin, None)
+        return self
+
+    def get(self, country: str) -> Optional[Dict[str, Any]]:
+        """Summary for one origin country, or None if it has no articles"""
+        summary = self._summaries.get(country)
+        if summary is None and country in self.totals:
+            summary = self._summaries[country] = self.totals[country].summary()
+        return summary
+
+    def countries(self) -> List[Dict[str, Any]]:
+        """Origin countries in the window, most covered first"""
+        rows = []
+        for origin, counts in sorted(self.totals.items(), key=lambda item: -item[1].total):
+            info = publisher_service.get_country_info(origin) if origin != "UNK" else None
+            rows.append({
+                "origin_country": origin,
+                "origin_country_name": info.name if info else origin,
+                "origin_country_flag": info.flag if info else "🌍",
+                "total_articles": counts.total,
+            })
+        return rows
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Serializable state, with every country's summary precomputed for readers"""
+        return {
+            "window_seconds": self.window_seconds,
+            "bucket_seconds": self.bucket_seconds,
+            "oldest": self.oldest,
+            "buckets": {
+                str(bucket): {origin: counts.to_dict() for origin, counts in by_country.items()}
+                for bucket, by_country in sorted(self.buckets.items())
+            },
+            "countries": self.countries(),
+            "by_country": {origin: self.get(origin) for origin in self.totals},
+        }
+
+    @classmethod
+    def from_snapshot(cls, data: Dict[str, Any]) -> "RollingWindow":
+        window = cls(data["window_seconds"], data["bucket_seconds"])
+        window.oldest = data.get("oldest")
+        for bucket, by_country in data.get("buckets", {}).items():
+            window.buckets[int(bucket)] = {
+                origin: PerspectiveCounts.from_dict(counts) for origin, counts in by_country.items()
+            }
+            for origin, counts in window.buckets[int(bucket)].items():
+                if origin not in window.totals:
+                    window.totals[origin] = PerspectiveCounts()
+                window.totals[origin].merge(counts)
+        return window
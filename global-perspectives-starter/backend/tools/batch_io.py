@@ -0,0 +1,158 @@
+"""
+Streaming Batch Output with Checkpoints
+
+Batch stages append one JSON line per finished article and keep a small
+manifest next to the file, so a run that dies part-way keeps everything it
+already paid for: a re-run reads back the IDs in the file, skips those
+articles and appends the rest.
+
+    <name>.jsonl                  one record per line, each with `article_id`
+    <name>.jsonl.checkpoint.json  {completed, last_id, complete, updated_at}
+
+The JSONL file is the source of truth; a line cut short by a crash is
+dropped when the file is reopened.
+"""
+
+import os
+import json
+import hashlib
+import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Set, Union
+
+PathLike = Union[str, Path]
+
+
+def article_id(article: Dict[str, Any]) -> str:
+    """Stable ID for an article: its existing article_id, else a hash of URL or title"""
+    existing = article.get("article_id")
+    if existing:
+        return existing
+    key = article.get("url") or article.get("title") or ""
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def _json_default(obj: Any) -> Any:
+    if hasattr(obj, "to_dict"):
+        # records.ArticleRecord and similar mappings
+        return obj.to_dict()
+    return str(obj)
+
+
+def json_line(record: Dict[str, Any]) -> str:
+    """One JSONL line for an article dict or ArticleRecord"""
+    return json.dumps(record, ensure_ascii=False, default=_json_default) + "\n"
+
+
+def iter_jsonl(path: PathLike) -> Iterator[Dict[str, Any]]:
+    """Stream records from a JSONL file, ignoring a truncated last line"""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            if line.strip():
+                yield json.loads(line)
+
+
+def _repair_tail(path: Path):
+    """Cut a partially written last line left behind by a crash"""
+    with open(path, "rb+") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if not size:
+            return
+        f.seek(max(size - 1, 0))
+        if f.read(1) == b"\n":
+            return
+        # Walk back to the last complete line
+        position = size
+        while position > 0:
+            step = min(65536, position)
+            position -= step
+            f.seek(position)
+            cut = f.read(step).rfind(b"\n")
+            if cut != -1:
+                f.truncate(position + cut + 1)
+                return
+        f.truncate(0)
+
+
+class JsonlCheckpoint:
+    """Append-only JSONL writer that remembers which articles are done"""
+
+    def __init__(self, path: PathLike):
+        self.path = Path(path)
+        self.manifest_path = self.path.with_name(self.path.name + ".checkpoint.json")
+        self.completed: Set[str] = set()
+        self.last_id: Optional[str] = None
+        self.written = 0
+        self._file = None
+
+    def open(self) -> "JsonlCheckpoint":
+        """Load finished IDs from an earlier run and open the file for appending"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            _repair_tail(self.path)
+            for record in iter_jsonl(self.path):
+                self.completed.add(record["article_id"])
+                self.last_id = record["article_id"]
+        self._file = open(self.path, "a", encoding="utf-8")
+        return self
+
+    @property
+    def resumed(self) -> int:
+        """Records carried over from earlier runs"""
+        return len(self.completed) - self.written
+
+    def manifest(self) -> Dict[str, Any]:
+        if self.manifest_path.exists():
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        return {}
+
+    def is_pending(self, article: Dict[str, Any]) -> bool:
+        """Tag the article with its article_id; True if it is not written yet"""
+        article["article_id"] = article_id(article)
+        return article["article_id"] not in self.completed
+
+    def pending(self, articles: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Articles not written yet, each tagged with its article_id"""
+        for article in articles:
+            if self.is_pending(article):
+                yield article
+
+    def write(self, record: Dict[str, Any], record_id: Optional[str] = None):
+        """Append one record and move the checkpoint past it"""
+        record_id = record_id or article_id(record)
+        record["article_id"] = record_id
+        self._file.write(json_line(record))
+        self._file.flush()
+        self.completed.add(record_id)
+        self.last_id = record_id
+        self.written += 1
+        self._save_manifest(complete=False)
+
+    def close(self, complete: bool = False):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._save_manifest(complete=complete)
+
+    def _save_manifest(self, complete: bool):
+        manifest = {
+            "file": self.path.name,
+            "completed": len(self.completed),
+            "last_id": self.last_id,
+            "complete": complete,
+            "updated_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        }
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    def __enter__(self) -> "JsonlCheckpoint":
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(complete=exc_type is None)
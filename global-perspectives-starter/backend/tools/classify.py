@@ -1,5 +1,4 @@
-
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator
 import re
 from .publisher_mapping import publisher_service
 
@@ -142,79 +141,88 @@ def get_credibility_info(source_name: str, url: Optional[str] = None) -> Dict[st
         "is_state_controlled": False
     }
 
+def classify_article(article: Dict[str, Any]) -> Dict[str, Any]:
+    """Classify one article in place (publisher, credibility, origin, local/foreign)"""
+    source_name = article.get("source_name") or ""
+    url = article.get("url")
+    
+    # Get publisher information
+    publisher_info = publisher_service.get_publisher_info(source_name)
+    
+    # Try URL-based lookup if direct lookup fails
+    if not publisher_info and url:
+        publisher_name = publisher_service.get_publisher_by_url(url)
+        if publisher_name:
+            publisher_info = publisher_service.get_publisher_info(publisher_name)
+            # Update source name if found via URL
+            article["source_name"] = publisher_name
+    
+    # Set publisher country
+    publisher_country = publisher_info.country if publisher_info else None
+    article["publisher_country"] = publisher_country
+    
+    # Add credibility information
+    credibility_info = get_credibility_info(source_name, url)
+    article.update(credibility_info)
+    
+    # Infer origin country from content
+    origin_country = infer_origin_country(
+        article.get("title"), 
+        article.get("description"),
+        url
+    )
+    article["origin_country_guess"] = origin_country
+    
+    # Enhanced classification logic
+    if publisher_info and publisher_service.is_wire_service(source_name):
+        # Wire services are generally neutral
+        article["classification"] = "neutral"
+    elif origin_country and publisher_country:
+        # Clear geographic match
+        if origin_country == publisher_country:
+            article["classification"] = "local"
+        else:
+            # Check if countries are in the same region for nuanced classification
+            pub_country_info = publisher_service.get_country_info(publisher_country)
+            origin_country_info = publisher_service.get_country_info(origin_country)
+            
+            if (pub_country_info and origin_country_info and 
+                pub_country_info.region == origin_country_info.region):
+                article["classification"] = "regional"
+            else:
+                article["classification"] = "foreign"
+    elif publisher_country:
+        # Publisher known but origin unclear - assume foreign coverage
+        article["classification"] = "foreign"
+    else:
+        # Unknown publisher - neutral classification
+        article["classification"] = "neutral"
+    
+    # Add country metadata if available
+    if publisher_country:
+        country_info = publisher_service.get_country_info(publisher_country)
+        if country_info:
+            article["publisher_country_name"] = country_info.name
+            article["publisher_region"] = country_info.region
+            article["publisher_flag"] = country_info.flag
+    
+    if origin_country:
+        origin_info = publisher_service.get_country_info(origin_country)
+        if origin_info:
+            article["origin_country_name"] = origin_info.name
+            article["origin_region"] = origin_info.region
+            article["origin_flag"] = origin_info.flag
+    
+    return article
+
+def iter_classify(articles: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    for article in articles:
+        yield classify_article(article)
+
 def classify_local_foreign(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Enhanced classification with comprehensive publisher mapping and credibility scoring"""
     for article in articles:
-        source_name = article.get("source_name") or ""
-        url = article.get("url")
-        
-        # Get publisher information
-        publisher_info = publisher_service.get_publisher_info(source_name)
-        
-        # Try URL-based lookup if direct lookup fails
-        if not publisher_info and url:
-            publisher_name = publisher_service.get_publisher_by_url(url)
-            if publisher_name:
-                publisher_info = publisher_service.get_publisher_info(publisher_name)
-                # Update source name if found via URL
-                article["source_name"] = publisher_name
-        
-        # Set publisher country
-        publisher_country = publisher_info.country if publisher_info else None
-        article["publisher_country"] = publisher_country
-        
-        # Add credibility information
-        credibility_info = get_credibility_info(source_name, url)
-        article.update(credibility_info)
-        
-        # Infer origin country from content
-        origin_country = infer_origin_country(
-            article.get("title"), 
-            article.get("description"),
-            url
-        )
-        article["origin_country_guess"] = origin_country
-        
-        # Enhanced classification logic
-        if publisher_info and publisher_service.is_wire_service(source_name):
-            # Wire services are generally neutral
-            article["classification"] = "neutral"
-        elif origin_country and publisher_country:
-            # Clear geographic match
-            if origin_country == publisher_country:
-                article["classification"] = "local"
-            else:
-                # Check if countries are in the same region for nuanced classification
-                pub_country_info = publisher_service.get_country_info(publisher_country)
-                origin_country_info = publisher_service.get_country_info(origin_country)
-                
-                if (pub_country_info and origin_country_info and 
-                    pub_country_info.region == origin_country_info.region):
-                    article["classification"] = "regional"
-                else:
-                    article["classification"] = "foreign"
-        elif publisher_country:
-            # Publisher known but origin unclear - assume foreign coverage
-            article["classification"] = "foreign"
-        else:
-            # Unknown publisher - neutral classification
-            article["classification"] = "neutral"
-        
-        # Add country metadata if available
-        if publisher_country:
-            country_info = publisher_service.get_country_info(publisher_country)
-            if country_info:
-                article["publisher_country_name"] = country_info.name
-                article["publisher_region"] = country_info.region
-                article["publisher_flag"] = country_info.flag
-        
-        if origin_country:
-            origin_info = publisher_service.get_country_info(origin_country)
-            if origin_info:
-                article["origin_country_name"] = origin_info.name
-                article["origin_region"] = origin_info.region
-                article["origin_flag"] = origin_info.flag
-    
+        classify_article(article)
     return articles
 
 def analyze_article_diversity(articles: List[Dict[str, Any]]) -> Dict[str, Any]:
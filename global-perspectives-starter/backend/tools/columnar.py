@@ -0,0 +1,174 @@
+"""
+Columnar Batch Storage
+
+Writes a day's processed articles as columns so later batch stages read only
+what they need and aggregate with NumPy instead of re-parsing a whole-day
+JSON list:
+
+    <dir>/manifest.json    row count and column names, category dictionaries
+    <dir>/columns.npz      scalar columns and dictionary-encoded categoricals
+    <dir>/text_<name>.json one list per text column, row-aligned
+    <dir>/articles.jsonl   the full articles, one per line, for stages that
+                           need every field (read back by row index)
+
+Categorical columns (countries, classification, ...) are stored as int32
+codes into a per-column list of values, like an Arrow dictionary column,
+so counts and grouped means are np.bincount calls.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .batch_io import json_line
+
+SCALAR_COLUMNS = {
+    # name: (dtype, value when missing)
+    "credibility_score": ("f8", 50),
+    "is_conflict": ("?", False),
+    "is_wire_service": ("?", False),
+    "is_state_controlled": ("?", False),
+}
+CATEGORICAL_COLUMNS = (
+    "classification", "credibility_category", "publisher_country",
+    "origin_country_guess", "source_name", "publisher_type", "language",
+)
+TEXT_COLUMNS = ("url", "title", "description", "published_at", "summary", "ai_summary")
+
+PathLike = Union[str, Path]
+
+
+def _encode(values: Iterable[Any]) -> Tuple[np.ndarray, List[Any]]:
+    """Dictionary-encode values into int32 codes and the list of distinct values"""
+    index: Dict[Any, int] = {}
+    codes = [index.setdefault(value, len(index)) for value in values]
+    return np.asarray(codes, dtype=np.int32), list(index)
+
+
+def write_columns(articles: Sequence[Dict[str, Any]], directory: PathLike,
+                  write_records: bool = True) -> Dict[str, Any]:
+    """
+    Write articles as a columnar batch directory; returns the manifest.
+    write_records=False leaves an existing articles.jsonl (e.g. one streamed
+    by a batch_io.JsonlCheckpoint, in the same row order) in place.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    arrays = {}
+    for name, (dtype, default) in SCALAR_COLUMNS.items():
+        values = [article.get(name) for article in articles]
+        arrays[name] = np.asarray([default if v is None else v for v in values], dtype=dtype)
+    categories = {}
+    for name in CATEGORICAL_COLUMNS:
+        arrays[name], categories[name] = _encode(article.get(name) for article in articles)
+    np.savez(directory / "columns.npz", **arrays)
+
+    for name in TEXT_COLUMNS:
+        with open(directory / f"text_{name}.json", "w", encoding="utf-8") as f:
+            json.dump([article.get(name) for article in articles], f, ensure_ascii=False)
+
+    if write_records:
+        with open(directory / "articles.jsonl", "w", encoding="utf-8") as f:
+            for article in articles:
+                f.write(json_line(article))
+
+    manifest = {
+        "rows": len(articles),
+        "scalar_columns": list(SCALAR_COLUMNS),
+        "categorical_columns": categories,
+        "text_columns": list(TEXT_COLUMNS),
+    }
+    with open(directory / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    return manifest
+
+
+class ColumnarBatch:
+    """Read side of a columnar batch directory; columns are loaded on first use"""
+
+    def __init__(self, directory: PathLike):
+        self.directory = Path(directory)
+        with open(self.directory / "manifest.json", "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self.rows = self.manifest["rows"]
+        self._npz = None
+        self._columns: Dict[str, np.ndarray] = {}
+        self._text: Dict[str, list] = {}
+
+    @classmethod
+    def exists(cls, directory: PathLike) -> bool:
+        return (Path(directory) / "manifest.json").exists()
+
+    def column(self, name: str) -> np.ndarray:
+        """A scalar column, or the int32 codes of a categorical column"""
+        if name not in self._columns:
+            if self._npz is None:
+                self._npz = np.load(self.directory / "columns.npz")
+            self._columns[name] = self._npz[name]
+        return self._columns[name]
+
+    def categories(self, name: str) -> List[Any]:
+        return self.manifest["categorical_columns"][name]
+
+    def decoded(self, name: str) -> List[Any]:
+        """A categorical column as its values"""
+        categories = self.categories(name)
+        return [categories[code] for code in self.column(name)]
+
+    def text(self, name: str) -> List[Optional[str]]:
+        if name not in self._text:
+            with open(self.directory / f"text_{name}.json", "r", encoding="utf-8") as f:
+                self._text[name] = json.load(f)
+        return self._text[name]
+
+    def records(self, rows: Optional[Iterable[int]] = None) -> Iterator[Dict[str, Any]]:
+        """Full articles, all or only the given row indices (in file order)"""
+        wanted = None if rows is None else set(int(row) for row in rows)
+        with open(self.directory / "articles.jsonl", "r", encoding="utf-8") as f:
+            for row, line in enumerate(f):
+                if wanted is None or row in wanted:
+                    yield json.loads(line)
+
+    def value_counts(self, name: str, skip_none: bool = True) -> Dict[Any, int]:
+        """Rows per value of a categorical column, most common first"""
+        counts = np.bincount(self.column(name), minlength=len(self.categories(name)))
+        order = np.argsort(-counts, kind="stable")
+        return {
+            self.categories(name)[code]: int(counts[code]) for code in order
+            if counts[code] and not (skip_none and self.categories(name)[code] is None)
+        }
+
+    def mean_by(self, value: str, group: str, skip_none: bool = True) -> Dict[Any, float]:
+        """Mean of a scalar column per value of a categorical column"""
+        codes = self.column(group)
+        size = len(self.categories(group))
+        counts = np.bincount(codes, minlength=size)
+        sums = np.bincount(codes, weights=self.column(value), minlength=size)
+        return {
+            category: round(float(sums[code] / counts[code]), 1)
+            for code, category in enumerate(self.categories(group))
+            if counts[code] and not (skip_none and category is None)
+        }
+
+    def rows_where(self, name: str) -> np.ndarray:
+        """Row indices where a boolean column is true"""
+        return np.flatnonzero(self.column(name))
+
+    def summary(self) -> Dict[str, Any]:
+        """Country, credibility and classification aggregates of the batch"""
+        credibility = self.column("credibility_score")
+        return {
+            "total_articles": self.rows,
+            "classification_breakdown": self.value_counts("classification"),
+            "publisher_distribution": self.value_counts("publisher_country"),
+            "origin_distribution": self.value_counts("origin_country_guess"),
+            "credibility_distribution": self.value_counts("credibility_category"),
+            "average_credibility": round(float(credibility.mean()), 1) if self.rows else 0,
+            "credibility_by_publisher_country": self.mean_by("credibility_score", "publisher_country"),
+            "wire_services": int(self.column("is_wire_service").sum()),
+            "state_controlled": int(self.column("is_state_controlled").sum()),
+            "conflict_articles": int(self.column("is_conflict").sum()),
+        }
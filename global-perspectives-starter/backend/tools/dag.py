@@ -0,0 +1,223 @@
+"""
+Pipeline Stage DAG
+
+Declarative runner for the article pipeline. Each Stage names the values it
+reads and the values it produces; the runner starts every stage as soon as
+its inputs exist, so independent stages overlap. CPU stages run in an
+executor (the default thread pool unless one is given) and I/O stages run as
+async tasks on the event loop.
+
+article_graph() builds the standard graph used by the API and the agent
+orchestrator (the batch summarizer streams articles through
+pipeline.iter_articles instead, see summarize_batch.py):
+
+    raw -> normalize -+-> classify  --+
+                      +-> summarize --+-> merge -> enhance -+-> stack
+                      +-> locations --+                     +-> perspective
+                      +-> (AI I/O) ---+
+
+classify, summarize, locations and any AI enrichment only read the
+normalized articles, so they run concurrently and return per-article field
+patches; merge applies them in declaration order.
+"""
+
+import asyncio
+import time
+from collections.abc import MutableMapping
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from . import normalize, classify, summarize, ner_geo, present
+
+CPU = "cpu"
+IO = "io"
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One pipeline step: fn(*inputs) -> outputs (a tuple when there are several)"""
+    name: str
+    fn: Callable[..., Any]
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+    kind: str = CPU
+
+
+class StageGraph:
+    """A validated set of stages that can be run many times"""
+
+    def __init__(self, stages: Sequence[Stage]):
+        self.stages = list(stages)
+        producers: Dict[str, str] = {}
+        for stage in self.stages:
+            if stage.kind not in (CPU, IO):
+                raise ValueError(f"Stage {stage.name} has unknown kind {stage.kind!r}")
+            for output in stage.outputs:
+                if output in producers:
+                    raise ValueError(f"{output!r} is produced by both {producers[output]} and {stage.name}")
+                producers[output] = stage.name
+        self.produced = set(producers)
+        self.required_inputs = {
+            name for stage in self.stages for name in stage.inputs if name not in producers
+        }
+        self._check_acyclic()
+
+    def _check_acyclic(self):
+        available = set(self.required_inputs)
+        remaining = list(self.stages)
+        while remaining:
+            ready = [s for s in remaining if available.issuperset(s.inputs)]
+            if not ready:
+                raise ValueError(f"Stages can never run (cycle): {[s.name for s in remaining]}")
+            for stage in ready:
+                available.update(stage.outputs)
+                remaining.remove(stage)
+
+    async def run(self, inputs: Dict[str, Any], executor: Optional[Executor] = None,
+                  timings: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """
+        Run the graph and return every value (inputs and outputs) by name.
+        The first stage failure cancels the rest and is re-raised.
+        """
+        missing = self.required_inputs - set(inputs)
+        if missing:
+            raise ValueError(f"Missing pipeline inputs: {sorted(missing)}")
+
+        loop = asyncio.get_running_loop()
+        values = dict(inputs)
+        pending = list(self.stages)
+        running: Dict[asyncio.Future, Tuple[Stage, float]] = {}
+
+        def start_ready():
+            for stage in [s for s in pending if all(name in values for name in s.inputs)]:
+                pending.remove(stage)
+                args = [values[name] for name in stage.inputs]
+                if stage.kind == IO:
+                    future = asyncio.ensure_future(stage.fn(*args))
+                else:
+                    future = loop.run_in_executor(executor, partial(stage.fn, *args))
+                running[future] = (stage, time.perf_counter())
+
+        try:
+            start_ready()
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    stage, started = running.pop(future)
+                    result = future.result()
+                    if timings is not None:
+                        timings[stage.name] = time.perf_counter() - started
+                    if len(stage.outputs) == 1:
+                        result = (result,)
+                    values.update(zip(stage.outputs, result))
+                start_ready()
+        finally:
+            for future in running:
+                future.cancel()
+        return values
+
+
+class PatchView(MutableMapping):
+    """
+    Read-through view of an article that records every write in `patch`
+    instead of changing the article, so in-place enrichments can run on
+    shared articles without copying them.
+    """
+    __slots__ = ("article", "patch")
+
+    def __init__(self, article: Dict[str, Any]):
+        self.article = article
+        self.patch: Dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.patch:
+            return self.patch[key]
+        return self.article[key]
+
+    def __setitem__(self, key: str, value: Any):
+        self.patch[key] = value
+
+    def __delitem__(self, key: str):
+        raise TypeError("PatchView does not support deleting article fields")
+
+    def __iter__(self):
+        yield from self.patch
+        yield from (key for key in self.article if key not in self.patch)
+
+    def __len__(self) -> int:
+        return len(self.article.keys() | self.patch.keys())
+
+
+def field_patches(enrich: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]:
+    """
+    Turn an in-place per-article enrichment into a stage that leaves the
+    articles untouched and returns the fields it set, one dict per article.
+    """
+    def stage(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        patches = []
+        for article in articles:
+            view = PatchView(article)
+            enrich(view)
+            patches.append(view.patch)
+        return patches
+    return stage
+
+
+def merge_patches(articles: List[Dict[str, Any]], *patch_lists: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Apply per-article field patches in order; updates the articles in place"""
+    for patches in patch_lists:
+        for article, patch in zip(articles, patches):
+            article.update(patch)
+    return articles
+
+
+def enhance_in_place(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [present.enhance_article(article, copy=False) for article in articles]
+
+
+def article_graph(locations: bool = True, enhance: bool = True, stack: bool = True,
+                  perspective: bool = True, enrichments: Sequence[Stage] = ()) -> StageGraph:
+    """
+    Standard article pipeline over `raw` NewsAPI-shaped articles.
+
+    Outputs: `articles` (merged, enhanced if requested), plus `stacks` and
+    `perspective_summary` when enabled. `enrichments` are extra stages (see
+    io_enrichment) that read `normalized` and produce one field-patch list
+    each, e.g. AI summaries.
+    """
+    stages = [
+        Stage("normalize", normalize.normalize_articles, ("raw",), ("normalized",)),
+        Stage("classify", field_patches(classify.classify_article), ("normalized",), ("classify_fields",)),
+        Stage("summarize", field_patches(summarize.summarize_article), ("normalized",), ("summary_fields",)),
+    ]
+    patch_names = ["classify_fields", "summary_fields"]
+    if locations:
+        stages.append(Stage("locations", field_patches(partial(ner_geo.locate_article, copy=False)),
+                            ("normalized",), ("location_fields",)))
+        patch_names.append("location_fields")
+    for enrichment in enrichments:
+        stages.append(enrichment)
+        patch_names.extend(enrichment.outputs)
+
+    merged = "merged" if enhance else "articles"
+    stages.append(Stage("merge", merge_patches, ("normalized", *patch_names), (merged,)))
+    if enhance:
+        stages.append(Stage("enhance", enhance_in_place, ("merged",), ("articles",)))
+    if stack:
+        stages.append(Stage("stack", present.stack_by_country, ("articles",), ("stacks",)))
+    if perspective:
+        stages.append(Stage("perspective", present.generate_perspective_summary, ("articles",), ("perspective_summary",)))
+    return StageGraph(stages)
+
+
+def io_enrichment(name: str, fn: Callable[[List[Dict[str, Any]]], Awaitable[List[Dict[str, Any]]]]) -> Stage:
+    """Declare an async enrichment for article_graph(); fn returns one patch per article"""
+    return Stage(name, fn, ("normalized",), (f"{name}_fields",), kind=IO)
+
+
+async def run_article_pipeline(raw: List[Dict[str, Any]], executor: Optional[Executor] = None,
+                               timings: Optional[Dict[str, float]] = None, **options) -> Dict[str, Any]:
+    """Build article_graph(**options) and run it over raw articles"""
+    return await article_graph(**options).run({"raw": raw}, executor=executor, timings=timings)
@@ -2,7 +2,7 @@
 import spacy
 import json
 import re
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Iterator
 from pathlib import Path
 import logging
 
@@ -320,53 +320,66 @@ class LocationDetector:
 # Global instance
 location_detector = LocationDetector()
 
-def add_locations(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+# Article fields produced by add_locations
+LOCATION_FIELDS = ("detected_locations", "geographic_analysis", "location_extraction_timestamp")
+
+def locate_article(article: Dict[str, Any], copy: bool = True) -> Dict[str, Any]:
+    """
+    Add location information to one article. Returns a copy unless copy=False,
+    in which case the article is updated in place; the article is returned
+    unchanged if extraction fails.
+    """
+    try:
+        # Extract text for analysis
+        text_content = ""
+        if article.get("title"):
+            text_content += article["title"] + " "
+        if article.get("description"):
+            text_content += article["description"] + " "
+        if article.get("content"):
+            text_content += article["content"]
+        
+        # Debug logging
+        logger.info(f"Processing article: {article.get('title', 'No title')[:50]}...")
+        logger.info(f"Text content length: {len(text_content)}")
+        logger.info(f"Text content preview: {text_content[:200]}...")
+        
+        # Extract locations
+        locations = location_detector.extract_locations_from_text(text_content)
+        logger.info(f"Extracted locations: {locations}")
+        
+        # Analyze geographic focus
+        geographic_analysis = location_detector.analyze_geographic_focus(locations)
+        logger.info(f"Geographic analysis: {geographic_analysis}")
+        
+        # Add location data to article
+        enhanced_article = article.copy() if copy else article
+        enhanced_article.update({
+            "detected_locations": locations,
+            "geographic_analysis": geographic_analysis,
+            "location_extraction_timestamp": "2024-01-01T00:00:00Z"  # Could use actual timestamp
+        })
+        return enhanced_article
+        
+    except Exception as e:
+        logger.error(f"Error processing article for locations: {e}")
+        # Return original article if processing fails
+        return article
+
+def iter_locations(articles: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Streaming add_locations; articles are updated in place"""
+    for article in articles:
+        yield locate_article(article, copy=False)
+
+def add_locations(articles: List[Dict[str, Any]], copy: bool = True) -> List[Dict[str, Any]]:
     """
     Add location information to articles using enhanced location detection.
+    Articles are copied unless copy=False, which updates them in place.
     """
     if not articles:
         return articles
     
-    enhanced_articles = []
-    
-    for article in articles:
-        try:
-            # Extract text for analysis
-            text_content = ""
-            if article.get("title"):
-                text_content += article["title"] + " "
-            if article.get("description"):
-                text_content += article["description"] + " "
-            if article.get("content"):
-                text_content += article["content"]
-            
-            # Debug logging
-            logger.info(f"Processing article: {article.get('title', 'No title')[:50]}...")
-            logger.info(f"Text content length: {len(text_content)}")
-            logger.info(f"Text content preview: {text_content[:200]}...")
-            
-            # Extract locations
-            locations = location_detector.extract_locations_from_text(text_content)
-            logger.info(f"Extracted locations: {locations}")
-            
-            # Analyze geographic focus
-            geographic_analysis = location_detector.analyze_geographic_focus(locations)
-            logger.info(f"Geographic analysis: {geographic_analysis}")
-            
-            # Add location data to article
-            enhanced_article = article.copy()
-            enhanced_article.update({
-                "detected_locations": locations,
-                "geographic_analysis": geographic_analysis,
-                "location_extraction_timestamp": "2024-01-01T00:00:00Z"  # Could use actual timestamp
-            })
-            
-            enhanced_articles.append(enhanced_article)
-            
-        except Exception as e:
-            logger.error(f"Error processing article for locations: {e}")
-            # Return original article if processing fails
-            enhanced_articles.append(article)
+    enhanced_articles = [locate_article(article, copy=copy) for article in articles]
     
     logger.info(f"Enhanced {len(enhanced_articles)} articles with location data")
     return enhanced_articles
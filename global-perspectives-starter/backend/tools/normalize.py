@@ -1,30 +1,36 @@
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator
 from rapidfuzz import fuzz
 
-def normalize_articles(raw: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    out = []
+def normalize_article(a: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "source_id": (a.get("source") or {}).get("id"),
+        "source_name": (a.get("source") or {}).get("name"),
+        "publisher_country": None,  # fill from mapping later
+        "origin_country_guess": None,
+        "url": a.get("url"),
+        "title": a.get("title") or "",
+        "description": a.get("description"),
+        "published_at": a.get("publishedAt"),
+        "language": a.get("language") or None,
+        "is_conflict": False,
+        "summary_phrases": [],
+        "locations": [],
+        "classification": None,
+    }
+
+def iter_normalize(raw: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
     for a in raw:
-        out.append({
-            "source_id": (a.get("source") or {}).get("id"),
-            "source_name": (a.get("source") or {}).get("name"),
-            "publisher_country": None,  # fill from mapping later
-            "origin_country_guess": None,
-            "url": a.get("url"),
-            "title": a.get("title") or "",
-            "description": a.get("description"),
-            "published_at": a.get("publishedAt"),
-            "language": a.get("language") or None,
-            "is_conflict": False,
-            "summary_phrases": [],
-            "locations": [],
-            "classification": None,
-        })
-    return dedupe(out)
+        yield normalize_article(a)
 
-def dedupe(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    unique = []
+def normalize_articles(raw: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return dedupe(iter_normalize(raw))
+
+def iter_dedupe(items: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Yield items whose URL and title are not near-duplicates of an earlier item.
+    Only the seen URLs and titles are buffered, not the articles."""
     seen = set()
+    titles = []
     for it in items:
         key = (it.get("url") or "").strip()
         title = (it.get("title") or "").lower().strip()
@@ -32,12 +38,15 @@ def dedupe(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
             continue
         # naive near-dup check against existing titles
         dup = False
-        for u in unique:
-            if fuzz.token_set_ratio(title, (u.get("title") or "").lower()) >= 90:
+        for u in titles:
+            if fuzz.token_set_ratio(title, u) >= 90:
                 dup = True
                 break
         if not dup:
             if key:
                 seen.add(key)
-            unique.append(it)
-    return unique
+            titles.append((it.get("title") or "").lower())
+            yield it
+
+def dedupe(items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return list(iter_dedupe(items))
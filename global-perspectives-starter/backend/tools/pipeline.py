@@ -0,0 +1,52 @@
+"""
+Streaming article pipeline
+
+Composes the tool stages as iterators over articles: normalize -> dedupe ->
+classify -> summarize -> locations -> enhance. Each article flows through
+every stage before the next one is read and is updated in place, so a
+consumer that writes articles out as they arrive holds roughly one article
+at a time. Only the stateful stages buffer: dedupe keeps the seen URLs and
+titles, and stack_by_country keeps the articles it groups.
+
+The list functions in each module (normalize_articles, classify_local_foreign,
+...) are unchanged and remain the API for small in-memory batches.
+
+records=True carries each article as a records.ArticleRecord (slotted
+fields instead of a 40-key dict) for large batches, as summarize_batch
+does; convert with to_dict(), or let responses.dumps() / batch_io.json_line()
+do it while serializing.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List
+
+from . import normalize, classify, summarize, ner_geo, present, records as article_records
+
+
+def iter_articles(raw: Iterable[Dict[str, Any]], dedupe: bool = True, locations: bool = True,
+                  enhance: bool = True, max_phrases: int = 5, records: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily run raw NewsAPI-shaped articles through the tool stages. With
+    records=True the articles are slotted ArticleRecords instead of dicts.
+    """
+    articles = normalize.iter_normalize(raw)
+    if records:
+        articles = article_records.iter_records(articles)
+    if dedupe:
+        articles = normalize.iter_dedupe(articles)
+    articles = classify.iter_classify(articles)
+    articles = summarize.iter_summarize(articles, max_phrases=max_phrases)
+    if locations:
+        articles = ner_geo.iter_locations(articles)
+    if enhance:
+        articles = present.iter_enhance(articles)
+    return articles
+
+
+def process_articles(raw: Iterable[Dict[str, Any]], **options) -> List[Dict[str, Any]]:
+    """Run the pipeline and collect the articles (one dict per article, no copies)"""
+    return list(iter_articles(raw, **options))
+
+
+def stack_articles(raw: Iterable[Dict[str, Any]], **options) -> List[Dict[str, Any]]:
+    """Run the pipeline straight into stack_by_country"""
+    return present.stack_by_country(iter_articles(raw, **options))
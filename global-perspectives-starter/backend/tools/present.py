@@ -1,69 +1,102 @@
 
-from typing import List, Dict, Any
-from collections import defaultdict
-from .classify import analyze_article_diversity
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 from .publisher_mapping import publisher_service
 
-def stack_by_country(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+class _OriginStack:
+    """Buckets and running statistics for one origin country"""
+    __slots__ = ("local", "regional", "neutral", "foreign", "foreign_credibility",
+                 "total", "credibility_sum", "publisher_countries")
+
+    def __init__(self):
+        self.local = []
+        self.regional = []
+        self.neutral = []
+        self.foreign = {}
+        self.foreign_credibility = {}
+        self.total = 0
+        self.credibility_sum = 0
+        self.publisher_countries = set()
+
+    def add(self, article: Dict[str, Any]):
+        self.total += 1
+        credibility = article.get("credibility_score", 50)
+        self.credibility_sum += credibility
+        publisher_country = article.get("publisher_country")
+        if publisher_country:
+            self.publisher_countries.add(publisher_country)
+
+        classification = article.get("classification")
+        if classification == "local":
+            self.local.append(article)
+        elif classification == "regional":
+            self.regional.append(article)
+        elif classification == "neutral":
+            self.neutral.append(article)
+        elif classification == "foreign":
+            country = publisher_country or "UNK"
+            bucket = self.foreign.get(country)
+            if bucket is None:
+                bucket = self.foreign[country] = []
+                self.foreign_credibility[country] = 0
+            bucket.append(article)
+            self.foreign_credibility[country] += credibility
+
+def stack_by_country(articles: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Enhanced country stacking with metadata and statistics"""
-    # Group by origin_country_guess; then split into local vs foreign buckets.
-    by_origin = defaultdict(list)
+    # Group by origin_country_guess and split into local/foreign/regional/neutral
+    # buckets with running statistics, in a single pass over the articles.
+    by_origin: Dict[str, _OriginStack] = {}
     for article in articles:
         origin = article.get("origin_country_guess") or "UNK"
-        by_origin[origin].append(article)
+        stack = by_origin.get(origin)
+        if stack is None:
+            stack = by_origin[origin] = _OriginStack()
+        stack.add(article)
+    
+    country_info_cache = {}
+    
+    def country_info(code):
+        if code not in country_info_cache:
+            country_info_cache[code] = publisher_service.get_country_info(code)
+        return country_info_cache[code]
     
     stacks = []
-    for origin, items in by_origin.items():
-        local = [x for x in items if x.get("classification") == "local"]
-        foreign_by_country = defaultdict(list)
-        regional = [x for x in items if x.get("classification") == "regional"]
-        neutral = [x for x in items if x.get("classification") == "neutral"]
-        
-        for article in items:
-            if article.get("classification") == "foreign":
-                publisher_country = article.get("publisher_country") or "UNK"
-                foreign_by_country[publisher_country].append(article)
-        
-        # Calculate statistics for this origin country
-        total_articles = len(items)
-        credibility_scores = [x.get("credibility_score", 50) for x in items]
-        avg_credibility = sum(credibility_scores) / len(credibility_scores) if credibility_scores else 50
-        
+    for origin, acc in by_origin.items():
         # Get country metadata
-        origin_info = publisher_service.get_country_info(origin) if origin != "UNK" else None
+        origin_info = country_info(origin) if origin != "UNK" else None
         
         stack_data = {
             "origin_country": origin,
             "origin_country_name": origin_info.name if origin_info else origin,
             "origin_country_flag": origin_info.flag if origin_info else "🌍",
             "origin_region": origin_info.region if origin_info else "Unknown",
-            "local": local,
-            "foreign_by_country": dict(foreign_by_country),
-            "regional": regional,
-            "neutral": neutral,
+            "local": acc.local,
+            "foreign_by_country": acc.foreign,
+            "regional": acc.regional,
+            "neutral": acc.neutral,
             "statistics": {
-                "total_articles": total_articles,
-                "local_count": len(local),
-                "foreign_count": sum(len(articles) for articles in foreign_by_country.values()),
-                "regional_count": len(regional),
-                "neutral_count": len(neutral),
-                "average_credibility": round(avg_credibility, 1),
-                "unique_foreign_countries": len(foreign_by_country),
-                "coverage_diversity": len(set(x.get("publisher_country") for x in items if x.get("publisher_country")))
+                "total_articles": acc.total,
+                "local_count": len(acc.local),
+                "foreign_count": sum(len(articles) for articles in acc.foreign.values()),
+                "regional_count": len(acc.regional),
+                "neutral_count": len(acc.neutral),
+                "average_credibility": round(acc.credibility_sum / acc.total, 1),
+                "unique_foreign_countries": len(acc.foreign),
+                "coverage_diversity": len(acc.publisher_countries)
             }
         }
         
         # Add foreign country metadata
         enhanced_foreign = {}
-        for country_code, country_articles in foreign_by_country.items():
-            country_info = publisher_service.get_country_info(country_code)
+        for country_code, country_articles in acc.foreign.items():
+            info = country_info(country_code)
             enhanced_foreign[country_code] = {
                 "articles": country_articles,
-                "country_name": country_info.name if country_info else country_code,
-                "country_flag": country_info.flag if country_info else "🌍",
-                "region": country_info.region if country_info else "Unknown",
+                "country_name": info.name if info else country_code,
+                "country_flag": info.flag if info else "🌍",
+                "region": info.region if info else "Unknown",
                 "article_count": len(country_articles),
-                "avg_credibility": round(sum(x.get("credibility_score", 50) for x in country_articles) / len(country_articles), 1) if country_articles else 50
+                "avg_credibility": round(acc.foreign_credibility[country_code] / len(country_articles), 1)
             }
         
         stack_data["foreign_by_country_enhanced"] = enhanced_foreign
@@ -73,9 +106,82 @@ def stack_by_country(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     stacks.sort(key=lambda x: x["statistics"]["total_articles"], reverse=True)
     return stacks
 
-def generate_perspective_summary(articles: List[Dict[str, Any]]) -> Dict[str, Any]:
+def generate_perspective_summary(articles: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
     """Generate comprehensive perspective analysis summary"""
-    if not articles:
+    # Every statistic, including the source diversity metrics that
+    # classify.analyze_article_diversity reports, is gathered in one pass.
+    # Classified articles already carry their publisher's country, region and
+    # credibility, so sources are only resolved for unclassified articles.
+    total_articles = 0
+    classifications = {}
+    publisher_countries = {}
+    origin_countries = {}
+    credibility_sum = 0
+    credibility_categories = {"high": 0, "medium": 0, "low": 0, "unknown": 0}
+    wire_services = 0
+    state_controlled = 0
+    
+    total_sources = 0
+    source_countries = set()
+    source_regions = set()
+    source_credibility = []
+    source_wire_services = 0
+    source_state_controlled = 0
+    resolved = {}
+    
+    for article in articles:
+        total_articles += 1
+        get = article.get
+        classification = get("classification", "unknown")
+        classifications[classification] = classifications.get(classification, 0) + 1
+        
+        pub_country = get("publisher_country")
+        if pub_country:
+            publisher_countries[pub_country] = publisher_countries.get(pub_country, 0) + 1
+        origin_country = get("origin_country_guess")
+        if origin_country:
+            origin_countries[origin_country] = origin_countries.get(origin_country, 0) + 1
+        
+        credibility_score = get("credibility_score", 50)
+        credibility_sum += credibility_score
+        # Unexpected categories raise KeyError, as analyze_article_diversity does
+        credibility_categories[get("credibility_category", "unknown")] += 1
+        if get("is_wire_service", False):
+            wire_services += 1
+        if get("is_state_controlled", False):
+            state_controlled += 1
+        
+        source = get("source_name")
+        if not source:
+            continue
+        total_sources += 1
+        if "publisher_type" in article:
+            # classify resolved this source name (or its URL, in which case it
+            # rewrote source_name to the publisher it found)
+            if pub_country is None:
+                continue
+            region = get("publisher_region")
+        else:
+            if source not in resolved:
+                info = publisher_service.get_publisher_info(source)
+                if info:
+                    country_info = publisher_service.get_country_info(info.country)
+                    resolved[source] = (info.country, country_info.region if country_info else None, info.credibility_score)
+                else:
+                    resolved[source] = None
+            if resolved[source] is None:
+                continue
+            pub_country, region, credibility_score = resolved[source]
+        source_countries.add(pub_country)
+        if region:
+            source_regions.add(region)
+        source_credibility.append(credibility_score)
+        if publisher_service.is_wire_service(source):
+            source_wire_services += 1
+        if publisher_service.is_state_controlled(source):
+            source_state_controlled += 1
+    
+    if not total_articles:
         return {
             "total_articles": 0,
             "perspective_breakdown": {},
@@ -84,148 +190,144 @@ def generate_perspective_summary(articles: List[Dict[str, Any]]) -> Dict[str, An
             "diversity_metrics": {}
         }
     
-    # Basic counts
-    total_articles = len(articles)
-    
-    # Classification breakdown
-    classifications = defaultdict(int)
-    for article in articles:
-        classification = article.get("classification", "unknown")
-        classifications[classification] += 1
-    
-    # Country coverage analysis
-    publisher_countries = defaultdict(int)
-    origin_countries = defaultdict(int)
-    
-    for article in articles:
-        pub_country = article.get("publisher_country")
-        if pub_country:
-            publisher_countries[pub_country] += 1
-        
-        origin_country = article.get("origin_country_guess")
-        if origin_country:
-            origin_countries[origin_country] += 1
-    
-    # Credibility analysis
-    credibility_scores = [article.get("credibility_score", 50) for article in articles]
-    credibility_categories = defaultdict(int)
-    
-    for article in articles:
-        category = article.get("credibility_category", "unknown")
-        credibility_categories[category] += 1
-    
-    # Wire services and state-controlled analysis
-    wire_services = sum(1 for article in articles if article.get("is_wire_service", False))
-    state_controlled = sum(1 for article in articles if article.get("is_state_controlled", False))
-    
-    # Use the diversity analysis function
-    diversity_metrics = analyze_article_diversity(articles)
+    local = classifications.get("local", 0)
+    foreign = classifications.get("foreign", 0)
+    reliable = credibility_categories["high"] + credibility_categories["medium"]
     
     return {
         "total_articles": total_articles,
         "perspective_breakdown": {
-            "local": classifications.get("local", 0),
-            "foreign": classifications.get("foreign", 0),
+            "local": local,
+            "foreign": foreign,
             "regional": classifications.get("regional", 0),
             "neutral": classifications.get("neutral", 0)
         },
         "country_coverage": {
             "unique_publisher_countries": len(publisher_countries),
             "unique_origin_countries": len(origin_countries),
-            "publisher_distribution": dict(publisher_countries),
-            "origin_distribution": dict(origin_countries)
+            "publisher_distribution": publisher_countries,
+            "origin_distribution": origin_countries
         },
         "credibility_analysis": {
-            "average_score": round(sum(credibility_scores) / len(credibility_scores), 1) if credibility_scores else 0,
-            "score_distribution": {
-                "high": credibility_categories.get("high", 0),
-                "medium": credibility_categories.get("medium", 0),
-                "low": credibility_categories.get("low", 0),
-                "unknown": credibility_categories.get("unknown", 0)
-            },
+            "average_score": round(credibility_sum / total_articles, 1),
+            "score_distribution": dict(credibility_categories),
             "wire_services": wire_services,
             "state_controlled": state_controlled
         },
-        "diversity_metrics": diversity_metrics,
+        "diversity_metrics": {
+            "unique_countries": len(source_countries),
+            "unique_regions": len(source_regions),
+            "average_credibility": round(sum(source_credibility) / len(source_credibility) if source_credibility else 0, 1),
+            "wire_services": source_wire_services,
+            "state_controlled": source_state_controlled,
+            "total_sources": total_sources,
+            "countries": list(source_countries),
+            "regions": list(source_regions),
+            "classification_breakdown": classifications,
+            "credibility_breakdown": credibility_categories
+        },
         "quality_indicators": {
             "geographic_diversity": len(publisher_countries) + len(origin_countries),
-            "source_reliability": round((credibility_categories.get("high", 0) + credibility_categories.get("medium", 0)) / total_articles * 100, 1) if total_articles > 0 else 0,
-            "perspective_balance": min(classifications.get("local", 0), classifications.get("foreign", 0)) / max(classifications.get("local", 1), classifications.get("foreign", 1)) if max(classifications.get("local", 1), classifications.get("foreign", 1)) > 0 else 0
+            "source_reliability": round(reliable / total_articles * 100, 1),
+            "perspective_balance": min(local, foreign) / max(classifications.get("local", 1), classifications.get("foreign", 1)) if max(classifications.get("local", 1), classifications.get("foreign", 1)) > 0 else 0
         }
     }
 
-def enhance_articles_metadata(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Add enhanced metadata to articles for frontend consumption"""
-    enhanced_articles = []
-    
-    for article in articles:
-        enhanced_article = article.copy()
-        
-        # Add formatted metadata for frontend
-        publisher_country = article.get("publisher_country")
-        origin_country = article.get("origin_country_guess")
-        
-        # Publisher metadata
-        if publisher_country:
-            pub_info = publisher_service.get_country_info(publisher_country)
-            if pub_info:
-                enhanced_article["publisher_metadata"] = {
-                    "country_code": publisher_country,
-                    "country_name": pub_info.name,
-                    "region": pub_info.region,
-                    "flag": pub_info.flag
-                }
-        
-        # Origin metadata
-        if origin_country:
-            origin_info = publisher_service.get_country_info(origin_country)
-            if origin_info:
-                enhanced_article["origin_metadata"] = {
-                    "country_code": origin_country,
-                    "country_name": origin_info.name,
-                    "region": origin_info.region,
-                    "flag": origin_info.flag
-                }
-        
-        # Credibility badge
-        credibility_score = article.get("credibility_score", 50)
-        credibility_category = article.get("credibility_category", "unknown")
-        
-        enhanced_article["credibility_badge"] = {
-            "score": credibility_score,
-            "category": credibility_category,
-            "color": {
-                "high": "green",
-                "medium": "yellow", 
-                "low": "red",
-                "unknown": "gray"
-            }.get(credibility_category, "gray"),
-            "label": {
-                "high": "High Credibility",
-                "medium": "Medium Credibility",
-                "low": "Low Credibility", 
-                "unknown": "Unknown Source"
-            }.get(credibility_category, "Unknown Source")
+# Badge and country metadata dicts are built once per category, score or
+# country and shared by every article that uses them; treat them as read-only.
+_CREDIBILITY_COLORS = {"high": "green", "medium": "yellow", "low": "red", "unknown": "gray"}
+_CREDIBILITY_LABELS = {
+    "high": "High Credibility",
+    "medium": "Medium Credibility",
+    "low": "Low Credibility",
+    "unknown": "Unknown Source"
+}
+_CLASSIFICATION_LABELS = {
+    "local": "Local Coverage",
+    "foreign": "Foreign Coverage",
+    "regional": "Regional Coverage",
+    "neutral": "Wire Service"
+}
+_CLASSIFICATION_COLORS = {"local": "blue", "foreign": "purple", "regional": "orange", "neutral": "gray"}
+_MAX_INTERNED = 4096
+
+_credibility_badges: Dict[Any, Dict[str, Any]] = {}
+_classification_badges: Dict[Any, Dict[str, Any]] = {}
+_country_metadata: Dict[str, Any] = {}
+
+def credibility_badge(score: Any, category: Any) -> Dict[str, Any]:
+    """Shared badge dict for a credibility score and category"""
+    key = (score, category)
+    badge = _credibility_badges.get(key)
+    if badge is None:
+        badge = {
+            "score": score,
+            "category": category,
+            "color": _CREDIBILITY_COLORS.get(category, "gray"),
+            "label": _CREDIBILITY_LABELS.get(category, "Unknown Source")
         }
-        
-        # Classification badge
-        classification = article.get("classification", "unknown")
-        enhanced_article["classification_badge"] = {
+        if len(_credibility_badges) < _MAX_INTERNED:
+            _credibility_badges[key] = badge
+    return badge
+
+def classification_badge(classification: Any) -> Dict[str, Any]:
+    """Shared badge dict for a classification"""
+    badge = _classification_badges.get(classification)
+    if badge is None:
+        badge = {
             "type": classification,
-            "label": {
-                "local": "Local Coverage",
-                "foreign": "Foreign Coverage",
-                "regional": "Regional Coverage",
-                "neutral": "Wire Service"
-            }.get(classification, "Unknown"),
-            "color": {
-                "local": "blue",
-                "foreign": "purple",
-                "regional": "orange",
-                "neutral": "gray"
-            }.get(classification, "gray")
+            "label": _CLASSIFICATION_LABELS.get(classification, "Unknown"),
+            "color": _CLASSIFICATION_COLORS.get(classification, "gray")
         }
-        
-        enhanced_articles.append(enhanced_article)
+        if len(_classification_badges) < _MAX_INTERNED:
+            _classification_badges[classification] = badge
+    return badge
+
+def country_metadata(country_code: str) -> Optional[Dict[str, Any]]:
+    """Shared publisher/origin metadata dict for a country, None if unknown"""
+    if country_code not in _country_metadata:
+        info = publisher_service.get_country_info(country_code)
+        _country_metadata[country_code] = {
+            "country_code": country_code,
+            "country_name": info.name,
+            "region": info.region,
+            "flag": info.flag
+        } if info else None
+    return _country_metadata[country_code]
+
+def enhance_article(article: Dict[str, Any], copy: bool = True) -> Dict[str, Any]:
+    """Add frontend metadata and badges to one article (in place if copy=False)"""
+    enhanced_article = article.copy() if copy else article
     
-    return enhanced_articles
+    # Add formatted metadata for frontend
+    publisher_country = article.get("publisher_country")
+    origin_country = article.get("origin_country_guess")
+    
+    # Publisher metadata
+    if publisher_country:
+        metadata = country_metadata(publisher_country)
+        if metadata:
+            enhanced_article["publisher_metadata"] = metadata
+    
+    # Origin metadata
+    if origin_country:
+        metadata = country_metadata(origin_country)
+        if metadata:
+            enhanced_article["origin_metadata"] = metadata
+    
+    # Credibility and classification badges
+    enhanced_article["credibility_badge"] = credibility_badge(
+        article.get("credibility_score", 50), article.get("credibility_category", "unknown")
+    )
+    enhanced_article["classification_badge"] = classification_badge(article.get("classification", "unknown"))
+    
+    return enhanced_article
+
+def iter_enhance(articles: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Streaming enhance_articles_metadata; articles are updated in place"""
+    for article in articles:
+        yield enhance_article(article, copy=False)
+
+def enhance_articles_metadata(articles: List[Dict[str, Any]], copy: bool = True) -> List[Dict[str, Any]]:
+    """Add enhanced metadata to articles for frontend consumption (in place if copy=False)"""
+    return [enhance_article(article, copy=copy) for article in articles]
@@ -0,0 +1,134 @@
+"""
+Slotted Article Records
+
+ArticleRecord is a compact stand-in for the article dicts that flow through
+the tools chain. The fields of backend.schemas.Article (plus ai_summary)
+live in __slots__; anything else goes to a small overflow dict. It behaves
+as a mutable mapping, so the stages keep using get/[]/in/update unchanged,
+and an unset field is simply an absent key.
+
+Records are converted back to plain dicts at the API boundary and in batch
+output (to_dict, or responses.dumps / batch_io.json_line, which do it while
+serializing).
+"""
+
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Dict, Iterable, Iterator, List
+
+from backend.schemas import Article
+
+ARTICLE_FIELDS = tuple(Article.model_fields) + ("ai_summary",)
+_FIELDS = frozenset(ARTICLE_FIELDS)
+_MISSING = object()
+
+
+class ArticleRecord(MutableMapping):
+    """Mutable mapping over slotted article fields plus overflow keys"""
+    __slots__ = ARTICLE_FIELDS + ("_extra",)
+
+    def __init__(self, fields: Any = (), **kwargs: Any):
+        self._extra = None
+        if fields:
+            self.update(fields)
+        if kwargs:
+            self.update(kwargs)
+
+    def __getitem__(self, key):
+        if key in _FIELDS:
+            value = getattr(self, key, _MISSING)
+        elif self._extra is not None:
+            value = self._extra.get(key, _MISSING)
+        else:
+            value = _MISSING
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        if key in _FIELDS:
+            return getattr(self, key, default)
+        if self._extra is None:
+            return default
+        return self._extra.get(key, default)
+
+    def __setitem__(self, key, value):
+        if key in _FIELDS:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in _FIELDS:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        if key in _FIELDS:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self) -> Iterator[str]:
+        for name in ARTICLE_FIELDS:
+            if hasattr(self, name):
+                yield name
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for name in ARTICLE_FIELDS if hasattr(self, name)) + len(self._extra or ())
+
+    def update(self, other: Any = (), **kwargs: Any):
+        items = other.items() if isinstance(other, Mapping) else other
+        for items in (items, kwargs.items()):
+            for key, value in items:
+                if key in _FIELDS:
+                    setattr(self, key, value)
+                else:
+                    if self._extra is None:
+                        self._extra = {}
+                    self._extra[key] = value
+
+    def copy(self) -> "ArticleRecord":
+        """Shallow copy, like dict.copy()"""
+        record = ArticleRecord.__new__(ArticleRecord)
+        for name in ARTICLE_FIELDS:
+            value = getattr(self, name, _MISSING)
+            if value is not _MISSING:
+                setattr(record, name, value)
+        record._extra = dict(self._extra) if self._extra else None
+        return record
+
+    def __copy__(self) -> "ArticleRecord":
+        return self.copy()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict in the public article shape"""
+        data = {}
+        for name in ARTICLE_FIELDS:
+            value = getattr(self, name, _MISSING)
+            if value is not _MISSING:
+                data[name] = value
+        if self._extra:
+            data.update(self._extra)
+        return data
+
+    def __repr__(self) -> str:
+        return f"ArticleRecord({self.to_dict()!r})"
+
+
+def iter_records(articles: Iterable[Dict[str, Any]]) -> Iterator[ArticleRecord]:
+    for article in articles:
+        yield article if isinstance(article, ArticleRecord) else ArticleRecord(article)
+
+
+def to_dicts(articles: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Convert records (and leave dicts) for code that needs real dicts"""
+    return [article.to_dict() if isinstance(article, ArticleRecord) else article for article in articles]
@@ -1,5 +1,5 @@
 
-from typing import List, Dict, Any, Union, Optional
+from typing import List, Dict, Any, Union, Optional, Iterable, Iterator
 import re
 
 def extractive_phrases(title: str, description: Optional[str], max_phrases: int = 5) -> List[str]:
@@ -24,7 +24,15 @@ def extractive_phrases(title: str, description: Optional[str], max_phrases: int
             break
     return result[:max_phrases]
 
+def summarize_article(a: Dict[str, Any], max_phrases: int = 5) -> Dict[str, Any]:
+    a["summary_phrases"] = extractive_phrases(a.get("title"), a.get("description"), max_phrases=max_phrases)
+    return a
+
+def iter_summarize(articles: Iterable[Dict[str, Any]], max_phrases: int = 5) -> Iterator[Dict[str, Any]]:
+    for a in articles:
+        yield summarize_article(a, max_phrases=max_phrases)
+
 def summarize(articles: List[Dict[str, Any]], max_phrases: int = 5) -> List[Dict[str, Any]]:
     for a in articles:
-        a["summary_phrases"] = extractive_phrases(a.get("title"), a.get("description"), max_phrases=max_phrases)
+        summarize_article(a, max_phrases=max_phrases)
     return articles
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Dict articles vs slotted ArticleRecords through the streaming pipeline.
+
+For each representation: memory held by the processed articles (tracemalloc,
+per 10k), end-to-end pipeline throughput (normalize -> classify ->
+summarize -> enhance -> stack_by_country + perspective summary, without
+dedupe or NER), and the cost of serializing the result at the API boundary.
+
+Usage:
+    python benchmarks/bench_article_records.py --articles 10000 --runs 3
+"""
+
+import argparse
+import logging
+import statistics
+import time
+import tracemalloc
+
+from bench_pipeline_memory import raw_articles
+
+from backend.responses import dumps
+from backend.tools import pipeline, present
+
+
+def run(n, records):
+    articles = pipeline.process_articles(raw_articles(n), dedupe=False, locations=False, records=records)
+    stacks = present.stack_by_country(articles)
+    summary = present.generate_perspective_summary(articles)
+    return articles, stacks, summary
+
+
+def held_bytes(n, records):
+    raw = list(raw_articles(n))
+    tracemalloc.start()
+    articles = pipeline.process_articles(raw, dedupe=False, locations=False, records=records)
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del articles
+    return held
+
+
+def main(args):
+    logging.disable(logging.INFO)
+    n = args.articles
+    print(f"{n} articles, {args.runs} runs")
+    print(f"{'articles as':<12}{'MB per 10k':>11}{'pipeline ms':>13}{'articles/s':>12}{'dumps ms':>10}")
+    for name, records in (("dicts", False), ("records", True)):
+        per_10k = held_bytes(n, records) / n * 10000
+        timings, dump_timings = [], []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            articles, stacks, summary = run(n, records)
+            timings.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            dumps({"stacks": stacks, "perspective_summary": summary})
+            dump_timings.append(time.perf_counter() - start)
+        median = statistics.median(timings)
+        print(f"{name:<12}{per_10k / 1e6:>11.1f}{median * 1000:>13.0f}{n / median:>12,.0f}"
+              f"{statistics.median(dump_timings) * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=3)
+    main(parser.parse_args())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+End-to-end batch run time against a local stub agent: the stages one after
+the other (as the old subprocess chain ran them) versus run_all_batch's
+in-process pipeline, where predictions start while summaries are still
+being written.
+
+NewsAPI returns --articles synthetic articles (every --conflict-every'th
+flagged as a conflict) and the stub agent answers every call after
+--latency seconds. Both variants use the real stage code, checkpoints and
+columnar output, each in its own temporary data directory.
+
+Usage:
+    python benchmarks/bench_batch_pipeline.py --articles 48 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "global-perspectives-batch"))
+
+import run_all_batch
+import summarize_batch
+import predict_batch
+from backend.services.bedrock_service import bedrock_service
+from backend.tools import newsapi, pipeline
+
+
+def install_stubs(args):
+    rng = random.Random(1)
+
+    def title():
+        # Distinct titles, so dedupe keeps every article
+        return " ".join("".join(rng.choices(string.ascii_lowercase, k=7)) for _ in range(6))
+
+    raw = [{"title": title(), "url": f"https://reuters.com/{i}", "description": "Officials said talks continue.",
+            "source": {"name": "Reuters"}, "publishedAt": "2026-01-01T05:00:00Z"} for i in range(args.articles)]
+
+    async def search_today(**kwargs):
+        return [dict(article) for article in raw]
+
+    iter_articles = pipeline.iter_articles
+
+    def flagged(*a, **k):
+        for i, article in enumerate(iter_articles(*a, **k)):
+            article["is_conflict"] = i % args.conflict_every == 0
+            yield article
+
+    def invoke_agent_once(input_text, agent_id, agent_alias_id, session_id):
+        time.sleep(args.latency)
+        return json.dumps({"escalation_risk": 5}) if agent_id == "predict" else "A summary."
+
+    newsapi.search_today = search_today
+    pipeline.iter_articles = flagged
+    bedrock_service.bedrock_agent_client = object()
+    bedrock_service.summarize_agent_id = "summarize"
+    bedrock_service.predict_agent_id = "predict"
+    bedrock_service._invoke_agent_once = invoke_agent_once
+
+
+async def sequential():
+    await summarize_batch.run()
+    await predict_batch.run()
+
+
+def timed(variant):
+    with tempfile.TemporaryDirectory() as tmp:
+        for module in (run_all_batch, summarize_batch, predict_batch):
+            module.DATA_DIR = Path(tmp)
+        os.environ["ROLLING_WINDOW_PATH"] = str(Path(tmp) / "rolling_24h.json")
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            asyncio.run(variant())
+        elapsed = time.perf_counter() - start
+        predictions = sum(1 for _ in open(next(Path(tmp).glob("predictions_*.jsonl"))))
+    return elapsed, predictions
+
+
+def main(args):
+    logging.disable(logging.ERROR)
+    install_stubs(args)
+    conflicts = len(range(0, args.articles, args.conflict_every))
+    print(f"{args.articles} articles ({conflicts} conflicts), stub agent latency {args.latency * 1000:.0f}ms")
+    for name, variant in (("sequential", sequential), ("pipelined", run_all_batch.main)):
+        elapsed, predictions = timed(variant)
+        print(f"  {name:<11} {elapsed:6.2f}s  {predictions} predictions")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=48)
+    parser.add_argument("--conflict-every", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.2)
+    main(parser.parse_args())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Whole-day batch output as pretty-printed JSON vs the columnar directory.
+
+For each format: write time and size, then the downstream reads a later
+stage does:
+  - aggregate: country/credibility/classification counts
+      json:     json.load the whole file + Python loops
+      columnar: load only the needed columns + np.bincount
+  - select:    conflict articles for predict_batch
+      json:     json.load the whole file + filter
+      columnar: is_conflict column, then parse only those JSONL rows
+
+Usage:
+    python benchmarks/bench_columnar.py --articles 20000
+"""
+
+import argparse
+import json
+import logging
+import shutil
+import tempfile
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from synthetic_articles import enriched_articles
+
+from backend.tools import columnar
+from backend.tools.columnar import ColumnarBatch
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def json_aggregate(path):
+    with open(path, "r", encoding="utf-8") as f:
+        articles = json.load(f)
+    scores = defaultdict(list)
+    for article in articles:
+        scores[article.get("publisher_country")].append(article.get("credibility_score", 50))
+    return {
+        "classification": Counter(a.get("classification") for a in articles),
+        "publisher": Counter(a.get("publisher_country") for a in articles if a.get("publisher_country")),
+        "origin": Counter(a.get("origin_country_guess") for a in articles if a.get("origin_country_guess")),
+        "credibility": Counter(a.get("credibility_category") for a in articles),
+        "credibility_by_country": {k: sum(v) / len(v) for k, v in scores.items() if k},
+    }
+
+
+def json_select(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [a for a in json.load(f) if a.get("is_conflict")]
+
+
+def columnar_select(directory):
+    batch = ColumnarBatch(directory)
+    return list(batch.records(batch.rows_where("is_conflict")))
+
+
+def size(path):
+    path = Path(path)
+    return sum(p.stat().st_size for p in path.iterdir()) if path.is_dir() else path.stat().st_size
+
+
+def main(args):
+    logging.disable(logging.INFO)
+    articles = enriched_articles(args.articles)
+    for i, article in enumerate(articles):
+        article["is_conflict"] = i % 10 == 0
+
+    workdir = Path(tempfile.mkdtemp())
+    try:
+        json_path, columns_dir = workdir / "summaries.json", workdir / "summaries"
+
+        def write_json():
+            with open(json_path, "w", encoding="utf-8") as f:
+                json.dump(articles, f, indent=2, ensure_ascii=False)
+
+        rows = [
+            ("json (indent=2)", write_json, json_path,
+             lambda: json_aggregate(json_path), lambda: json_select(json_path)),
+            ("columnar", lambda: columnar.write_columns(articles, columns_dir), columns_dir,
+             lambda: ColumnarBatch(columns_dir).summary(), lambda: columnar_select(columns_dir)),
+        ]
+        print(f"{args.articles} articles, {args.articles // 10} conflict")
+        print(f"{'format':<17}{'write ms':>9}{'MB':>7}{'aggregate ms':>14}{'select ms':>11}")
+        selected = []
+        for name, write, path, aggregate, select in rows:
+            write_ms, _ = timed(write)
+            aggregate_ms, _ = timed(aggregate)
+            select_ms, chosen = timed(select)
+            selected.append(chosen)
+            print(f"{name:<17}{write_ms:>9.0f}{size(path) / 1e6:>7.1f}{aggregate_ms:>14.1f}{select_ms:>11.1f}")
+        assert selected[0] == selected[1]
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=20000)
+    main(parser.parse_args())
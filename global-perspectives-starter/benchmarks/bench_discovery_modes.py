@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark ChatGPT discovery modes against a local OpenAI-compatible stub.
+
+Compares the discovery phase of an AI search (no scraping):
+  - sequential: keywords, perspectives and 3x find_local_sources, one after another
+  - concurrent: the same granular calls, fanned out with the async client
+  - combined:   one structured discover_search_plan call
+
+The stub answers each prompt after base latency + per-output-token latency,
+so the combined response pays for its larger output.
+
+Usage:
+    python benchmarks/bench_discovery_modes.py --runs 5 --base-latency 0.5 --per-token-ms 2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from aiohttp import web
+
+sys.path.append(str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "stub")
+
+from openai import OpenAI, AsyncOpenAI
+from backend.services.chatgpt_discovery_service import ChatGPTDiscoveryService
+
+REGIONS = ["Ukraine", "Russia", "Poland", "Germany"]
+
+
+def _sources(region):
+    return [{"name": f"{region} Daily {i}", "url": f"{region.lower()}{i}.example", "region": region, "language": "en"} for i in range(4)]
+
+
+def _stub_answer(prompt: str) -> dict:
+    if "Plan a global news search" in prompt:
+        return {
+            "keywords": ["ceasefire", "frontline", "sanctions", "talks", "drone strike", "energy"],
+            "perspectives": [
+                {"region": r, "perspective": f"{r} angle", "context": f"{r} context", "local_sources": _sources(r)}
+                for r in REGIONS
+            ],
+        }
+    if "search keywords" in prompt:
+        return ["ceasefire", "frontline", "sanctions", "talks", "drone strike", "energy"]
+    if "regional perspectives" in prompt:
+        return {"perspectives": [
+            {"region": r, "perspective": f"{r} angle", "context": f"{r} context", "sources": _sources(r)[:2]}
+            for r in REGIONS
+        ]}
+    return {"sources": _sources("Region")}
+
+
+def make_stub_app(base_latency: float, per_token_ms: float, counter: dict) -> web.Application:
+    async def completions(request):
+        body = await request.json()
+        prompt = body["messages"][-1]["content"]
+        content = json.dumps(_stub_answer(prompt))
+        output_tokens = len(content) // 4
+        counter["calls"] += 1
+        await asyncio.sleep(base_latency + output_tokens * per_token_ms / 1000)
+        return web.json_response({
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-4"),
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": output_tokens, "total_tokens": 0},
+        })
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", completions)
+    return app
+
+
+async def run_sequential(service, topic):
+    await asyncio.to_thread(lambda: [
+        service.generate_search_keywords(topic),
+        [service.find_local_sources(topic, p["region"]) for p in service.get_regional_perspectives(topic)[:3]],
+    ])
+
+
+async def run_concurrent(service, topic):
+    _, perspectives = await asyncio.gather(
+        service.generate_search_keywords_async(topic),
+        service.get_regional_perspectives_async(topic),
+    )
+    await service.find_local_sources_for_regions(topic, [p["region"] for p in perspectives[:3]])
+
+
+async def run_combined(service, topic):
+    plan = await service.discover_search_plan_async(topic)
+    assert plan["mode"] == "combined", plan
+
+
+async def main(args):
+    counter = {"calls": 0}
+    runner = web.AppRunner(make_stub_app(args.base_latency, args.per_token_ms, counter))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", args.port)
+    await site.start()
+    base_url = f"http://127.0.0.1:{args.port}/v1"
+
+    service = ChatGPTDiscoveryService()
+    service.client = OpenAI(api_key="stub", base_url=base_url, max_retries=0)
+    service.async_client = AsyncOpenAI(api_key="stub", base_url=base_url, max_retries=0)
+
+    print(f"stub latency: {args.base_latency:.2f}s + {args.per_token_ms:.1f}ms/output token, {args.runs} runs")
+    print(f"{'mode':<12}{'median s':>10}{'min s':>10}{'LLM calls':>11}")
+    for name, fn in (("sequential", run_sequential), ("concurrent", run_concurrent), ("combined", run_combined)):
+        timings = []
+        calls_before = counter["calls"]
+        for i in range(args.runs):
+            service.cache.clear()
+            start = time.perf_counter()
+            await fn(service, f"war in ukraine {i}")
+            timings.append(time.perf_counter() - start)
+        calls = (counter["calls"] - calls_before) / args.runs
+        print(f"{name:<12}{statistics.median(timings):>10.2f}{min(timings):>10.2f}{calls:>11.1f}")
+
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--base-latency", type=float, default=0.5)
+    parser.add_argument("--per-token-ms", type=float, default=2.0)
+    parser.add_argument("--port", type=int, default=8765)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Allocations and peak memory of the enrichment step (enhance_articles_metadata).
+
+Variants, each over the same classified and summarized articles:
+  - legacy:   copy every article and build fresh badge/metadata dicts
+  - copy:     copy every article, shared (interned) badge/metadata dicts
+  - in-place: enhance_articles_metadata(copy=False), shared dicts
+
+tracemalloc reports the peak and the blocks still allocated once the
+enriched list is built; RSS growth across the enrichment is measured in a
+fresh subprocess per variant, without tracemalloc.
+
+Usage:
+    python benchmarks/bench_enrichment_memory.py --articles 10000
+"""
+
+import argparse
+import logging
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from synthetic_articles import make_articles
+from legacy_present import legacy_enhance_articles_metadata
+
+from backend.tools import classify, summarize, present
+
+VARIANTS = {
+    "legacy": legacy_enhance_articles_metadata,
+    "copy": present.enhance_articles_metadata,
+    "in-place": lambda articles: present.enhance_articles_metadata(articles, copy=False),
+}
+
+
+def classified(n):
+    return summarize.summarize(classify.classify_local_foreign(make_articles(n)))
+
+
+def current_rss_kb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * resource.getpagesize() // 1024
+
+
+def rss_child(name, n):
+    """Runs in a subprocess: print RSS growth (KB) across enrichment"""
+    articles = classified(n)
+    before = current_rss_kb()
+    enriched = VARIANTS[name](articles)
+    print(max(current_rss_kb() - before, 0), len(enriched))
+
+
+def traced(name, n):
+    articles = classified(n)
+    tracemalloc.start()
+    start = time.perf_counter()
+    enriched = VARIANTS[name](articles)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = snapshot.statistics("filename")
+    blocks = sum(stat.count for stat in stats)
+    retained = sum(stat.size for stat in stats)
+    del enriched
+    return elapsed, peak, retained, blocks
+
+
+def main(args):
+    logging.disable(logging.INFO)
+    print(f"{args.articles} articles (ms measured under tracemalloc)")
+    print(f"{'variant':<10}{'ms':>8}{'peak MB':>9}{'kept MB':>9}{'blocks':>10}{'RSS MB':>8}")
+    for name in VARIANTS:
+        elapsed, peak, retained, blocks = traced(name, args.articles)
+        child = subprocess.run(
+            [sys.executable, __file__, "--articles", str(args.articles), "--rss-child", name],
+            capture_output=True, text=True, check=True,
+        )
+        rss_kb = int(child.stdout.split()[0])
+        print(f"{name:<10}{elapsed * 1000:>8.1f}{peak / 1e6:>9.1f}{retained / 1e6:>9.1f}"
+              f"{blocks:>10,}{rss_kb / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=10000)
+    parser.add_argument("--rss-child", choices=sorted(VARIANTS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.rss_child:
+        rss_child(args.rss_child, args.articles)
+    else:
+        main(args)
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Benchmark present.generate_perspective_summary against the multi-pass
+implementation that re-resolved every source through analyze_source_diversity.
+
+Usage:
+    python benchmarks/bench_perspective_summary.py --articles 10000 --runs 20 --unknown-sources 0.3
+"""
+
+import argparse
+import statistics
+import time
+
+from synthetic_articles import enriched_articles
+from legacy_present import legacy_generate_perspective_summary
+
+from backend.tools import present
+
+
+def timed(fn, articles, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn(articles)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), min(timings), result
+
+
+def main(args):
+    articles = enriched_articles(args.articles, unknown_sources=args.unknown_sources)
+    legacy_median, legacy_min, expected = timed(legacy_generate_perspective_summary, articles, args.runs)
+    median, best, result = timed(present.generate_perspective_summary, articles, args.runs)
+    assert result == expected, "single-pass summary differs from the legacy implementation"
+
+    print(f"{args.articles} articles ({args.unknown_sources:.0%} from unknown outlets), {args.runs} runs (outputs identical)")
+    print(f"{'implementation':<16}{'median ms':>11}{'min ms':>9}")
+    print(f"{'legacy':<16}{legacy_median:>11.2f}{legacy_min:>9.2f}")
+    print(f"{'single-pass':<16}{median:>11.2f}{best:>9.2f}  ({legacy_median / median:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--unknown-sources", type=float, default=0.3,
+                        help="share of articles from outlets missing from publishers.json")
+    main(parser.parse_args())
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Peak memory of the list-based tool chain vs the streaming pipeline.
+
+Both paths read raw articles from a generator and write each processed
+article as a JSON line to a sink (os.devnull), like a batch job would:
+  - lists:     normalize -> classify_local_foreign -> summarize ->
+               enhance_articles_metadata, each materializing a full list
+  - streaming: pipeline.iter_articles(), one article in flight at a time
+
+Near-duplicate dedupe (O(n^2) title matching) and location NER are skipped
+in both so large corpora finish quickly.
+
+Usage:
+    python benchmarks/bench_pipeline_memory.py --articles 20000
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+import tracemalloc
+
+from synthetic_articles import iter_articles
+
+from backend.tools import normalize, classify, summarize, present, pipeline
+
+
+def raw_articles(n):
+    # NewsAPI-shaped records, generated lazily
+    for a in iter_articles(n):
+        yield {
+            "source": {"id": None, "name": a["source_name"]},
+            "title": a["title"],
+            "description": a["description"],
+            "url": a["url"],
+            "publishedAt": a["published_at"],
+        }
+
+
+def run_lists(n, sink):
+    articles = [normalize.normalize_article(a) for a in raw_articles(n)]
+    articles = summarize.summarize(classify.classify_local_foreign(articles))
+    for article in present.enhance_articles_metadata(articles):
+        sink.write(json.dumps(article) + "\n")
+
+
+def run_streaming(n, sink):
+    for article in pipeline.iter_articles(raw_articles(n), dedupe=False, locations=False):
+        sink.write(json.dumps(article) + "\n")
+
+
+def measure(fn, n):
+    with open(os.devnull, "w") as sink:
+        tracemalloc.start()
+        start = time.perf_counter()
+        fn(n, sink)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(args):
+    logging.disable(logging.INFO)
+    print(f"{'articles':>9}{'path':>11}{'peak MB':>10}{'seconds':>9}")
+    for n in args.sizes or [args.articles // 10, args.articles]:
+        for name, fn in (("lists", run_lists), ("streaming", run_streaming)):
+            elapsed, peak = measure(fn, n)
+            print(f"{n:>9}{name:>11}{peak / 1e6:>10.1f}{elapsed:>9.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=20000)
+    parser.add_argument("--sizes", type=int, nargs="*")
+    main(parser.parse_args())
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Throughput of predict_batch's prediction loop against a local stub agent.
+
+The stub replaces BedrockService._invoke_agent_once with a blocking sleep of
+--latency seconds (the shape of a real invoke_agent round-trip), so every
+variant goes through the real _invoke_agent path: resilience wrapper,
+service concurrency limit and Bedrock thread pool.
+
+  - sequential:   one `await generate_predictions(art)` at a time (old loop)
+  - runner xN:    BedrockService.iter_predictions(..., concurrency=N)
+
+Usage:
+    python benchmarks/bench_predict_runner.py --articles 64 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from backend.services.bedrock_service import BedrockService
+
+
+def stub_service(latency, max_concurrency):
+    def invoke_agent_once(input_text, agent_id, agent_alias_id, session_id):
+        time.sleep(latency)
+        return json.dumps({"escalation_risk": 5, "timeline": "1-3 months"})
+
+    service = BedrockService()
+    service.bedrock_agent_client = object()
+    service.predict_agent_id = "stub-agent"
+    service.max_concurrency = max_concurrency
+    service._invoke_agent_once = invoke_agent_once
+    service.executor = ThreadPoolExecutor(max_workers=max_concurrency)
+    return service
+
+
+async def sequential(service, articles):
+    predictions = []
+    for art in articles:
+        predictions.append(await service.generate_predictions(art))
+    return predictions
+
+
+async def runner(service, articles, concurrency):
+    return [prediction async for _, prediction in service.iter_predictions(articles, concurrency=concurrency)]
+
+
+def main(args):
+    logging.disable(logging.INFO)
+    articles = [{"title": f"Conflict article {i}", "description": "..."} for i in range(args.articles)]
+    service = stub_service(args.latency, max(args.concurrency))
+
+    variants = [("sequential", lambda: sequential(service, articles))]
+    variants += [(f"runner x{n}", lambda n=n: runner(service, articles, n)) for n in args.concurrency]
+
+    print(f"{args.articles} articles, stub agent latency {args.latency * 1000:.0f}ms")
+    for name, run in variants:
+        start = time.perf_counter()
+        predictions = asyncio.run(run())
+        elapsed = time.perf_counter() - start
+        assert sum(p is not None for p in predictions) == args.articles
+        print(f"  {name:<12} {elapsed:7.2f}s  {args.articles / elapsed:7.1f} articles/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=64)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[4, 8, 16])
+    main(parser.parse_args())
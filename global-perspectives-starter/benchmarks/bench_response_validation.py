@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Per-request CPU spent building a /api/search response body, with and
+without pydantic validation.
+
+  - validated:      SearchResponse(...).model_dump() (the original endpoints)
+  - model_construct: SearchResponse.model_construct(...).model_dump()
+  - payload:        search_payload() dict, as served (VALIDATE_RESPONSES off)
+  - payload+check:  search_payload() + validate_search_payload() (tests only)
+
+Serialization is the same for every variant and is left out (see
+bench_serialization.py).
+
+Usage:
+    python benchmarks/bench_response_validation.py --articles 500 --runs 50
+"""
+
+import argparse
+import statistics
+import time
+
+from synthetic_articles import enriched_articles
+
+from backend.schemas import SearchResponse
+from backend.responses import search_payload, validate_search_payload
+from backend.tools import present
+
+
+def validated(stacks, extra):
+    data = SearchResponse(stacks=stacks, origin_country=None, map=None, trending=None).model_dump()
+    data.update(extra)
+    return data
+
+
+def constructed(stacks, extra):
+    data = SearchResponse.model_construct(stacks=stacks, origin_country=None, map=None, trending=None).model_dump()
+    data.update(extra)
+    return data
+
+
+def payload(stacks, extra):
+    return search_payload(stacks, **extra)
+
+
+def payload_checked(stacks, extra):
+    return validate_search_payload(search_payload(stacks, **extra))
+
+
+def main(args):
+    articles = enriched_articles(args.articles)
+    stacks = present.stack_by_country(articles)
+    extra = {"perspective_summary": present.generate_perspective_summary(articles),
+             "articles": articles, "enhanced_articles": articles}
+
+    print(f"{args.articles} articles, {len(stacks)} stacks, {args.runs} runs")
+    print(f"{'variant':<17}{'CPU ms':>8}{'saved ms':>10}")
+    baseline = None
+    for name, fn in (("validated", validated), ("model_construct", constructed),
+                     ("payload", payload), ("payload+check", payload_checked)):
+        timings = []
+        for _ in range(args.runs):
+            start = time.process_time()
+            fn(stacks, extra)
+            timings.append((time.process_time() - start) * 1000)
+        median = statistics.median(timings)
+        baseline = median if baseline is None else baseline
+        print(f"{name:<17}{median:>8.2f}{baseline - median:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=50)
+    main(parser.parse_args())
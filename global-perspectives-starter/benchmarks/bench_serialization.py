@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark building and serializing a /api/search response.
+
+Compares, for the same stacks and articles:
+  - legacy:          SearchResponse(...).model_dump() + stdlib JSONResponse
+  - payload+stdlib:  search_payload() dict + stdlib JSONResponse
+  - payload+orjson:  search_payload() dict + FastJSONResponse
+  - compact+orjson:  ?format=compact (articles listed once) + FastJSONResponse
+
+Usage:
+    python benchmarks/bench_serialization.py --articles 500 --runs 20
+"""
+
+import argparse
+import statistics
+import time
+
+from synthetic_articles import enriched_articles
+
+from fastapi.responses import JSONResponse
+from backend.schemas import SearchResponse
+from backend.responses import FastJSONResponse, search_payload, render_search, orjson
+from backend.tools import present
+
+
+def _extra(articles, perspective_summary, q):
+    return {
+        "perspective_summary": perspective_summary,
+        "articles": articles,
+        "enhanced_articles": articles,
+        "query_metadata": {"query": q, "language": "en", "total_articles": len(articles), "processing_timestamp": None},
+    }
+
+
+def legacy(stacks, extra):
+    resp = SearchResponse(stacks=stacks, origin_country=None, map=None, trending=None)
+    response_data = resp.model_dump()
+    response_data.update(extra)
+    return JSONResponse(response_data).body
+
+
+def payload_stdlib(stacks, extra):
+    return JSONResponse(search_payload(stacks, **extra)).body
+
+
+def payload_orjson(stacks, extra):
+    return FastJSONResponse(search_payload(stacks, **extra)).body
+
+
+def compact(stacks, extra):
+    return render_search(search_payload(stacks, **extra), "compact").body
+
+
+def main(args):
+    articles = enriched_articles(args.articles)
+    stacks = present.stack_by_country(articles)
+    extra = _extra(articles, present.generate_perspective_summary(articles), "benchmark")
+
+    variants = [("legacy", legacy), ("payload+stdlib", payload_stdlib)]
+    if orjson is not None:
+        variants.append(("payload+orjson", payload_orjson))
+    else:
+        print("orjson not installed; FastJSONResponse uses the stdlib encoder")
+    variants.append(("compact+orjson" if orjson is not None else "compact", compact))
+
+    print(f"{args.articles} articles, {len(stacks)} stacks, {args.runs} runs")
+    print(f"{'variant':<16}{'median ms':>11}{'min ms':>9}{'bytes':>11}")
+    baseline = None
+    for name, fn in variants:
+        timings = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            body = fn(stacks, extra)
+            timings.append((time.perf_counter() - start) * 1000)
+        median = statistics.median(timings)
+        baseline = baseline or median
+        print(f"{name:<16}{median:>11.2f}{min(timings):>9.2f}{len(body):>11,}  ({baseline / median:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=20)
+    main(parser.parse_args())
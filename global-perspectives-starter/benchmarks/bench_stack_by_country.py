@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Benchmark present.stack_by_country against the multi-pass implementation.
+
+Usage:
+    python benchmarks/bench_stack_by_country.py --articles 10000 --runs 20
+"""
+
+import argparse
+import statistics
+import time
+
+from synthetic_articles import enriched_articles
+from legacy_present import legacy_stack_by_country
+
+from backend.tools import present
+
+
+def timed(fn, articles, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn(articles)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), min(timings), result
+
+
+def main(args):
+    articles = enriched_articles(args.articles)
+    legacy_median, legacy_min, expected = timed(legacy_stack_by_country, articles, args.runs)
+    median, best, result = timed(present.stack_by_country, articles, args.runs)
+    assert result == expected, "single-pass output differs from the legacy implementation"
+
+    print(f"{args.articles} articles, {len(result)} stacks, {args.runs} runs (outputs identical)")
+    print(f"{'implementation':<16}{'median ms':>11}{'min ms':>9}")
+    print(f"{'legacy':<16}{legacy_median:>11.2f}{legacy_min:>9.2f}")
+    print(f"{'single-pass':<16}{median:>11.2f}{best:>9.2f}  ({legacy_median / median:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=20)
+    main(parser.parse_args())
@@ -1,51 +1,79 @@
-
-import asyncio, json, datetime, sys
+import asyncio, datetime, sys, os
 from pathlib import Path
+from typing import Any, Dict, Optional
 
 # Add the parent directory to the path to import backend modules
 sys.path.append(str(Path(__file__).parent.parent))
 
-from backend.services.bedrock_service import BedrockService
+from backend.services.bedrock_service import BedrockService, bedrock_service as default_bedrock_service
+from backend.tools.columnar import ColumnarBatch
+from backend.tools.batch_io import JsonlCheckpoint
+
+DATA_DIR = Path(__file__).parent / "data"
+
+async def _queued(conflicts: asyncio.Queue, checkpoint: JsonlCheckpoint):
+    """Articles from the summarize stage's queue until its None, minus those already predicted"""
+    while True:
+        article = await conflicts.get()
+        if article is None:
+            return
+        if checkpoint.is_pending(article):
+            yield article
 
-async def run():
+async def run(bedrock_service: Optional[BedrockService] = None,
+              conflicts: Optional[asyncio.Queue] = None) -> Dict[str, Any]:
+    """
+    Generate predictions for today's conflict articles: from the summaries
+    on disk, or (run_all_batch) from a queue fed by the summarize stage.
+    """
     today = datetime.date.today().isoformat()
-    in_path = Path("data") / f"summaries_{today}.json"
-    out_path = Path("data") / f"predictions_{today}.json"
-
-    if not in_path.exists():
-        print(f"[predict_batch] No summaries found at {in_path}")
-        return
-
-    with open(in_path, "r", encoding="utf-8") as f:
-        articles = json.load(f)
-
-    # Initialize Bedrock service for AI-powered predictions
-    print(f"[predict_batch] Initializing AWS Bedrock service...")
-    bedrock_service = BedrockService()
-
-    # Filter articles that need predictions (conflict-related)
-    conflict_articles = [art for art in articles if art.get("is_conflict")]
-    
-    if not conflict_articles:
-        print(f"[predict_batch] No conflict articles found for predictions")
-        return
-
-    print(f"[predict_batch] Generating AI predictions for {len(conflict_articles)} conflict articles using AWS Bedrock LLaMA...")
-    
-    # Generate predictions using AWS Bedrock LLaMA
-    preds = []
-    for art in conflict_articles:
-        try:
-            prediction = await bedrock_service.generate_predictions(art)
+    in_dir = DATA_DIR / f"summaries_{today}"
+    out_path = DATA_DIR / f"predictions_{today}.jsonl"
+    concurrency = int(os.getenv("BATCH_PREDICT_CONCURRENCY", 4))
+    timeout = float(os.getenv("BATCH_PREDICT_TIMEOUT_SECONDS", 60))
+
+    if conflicts is None:
+        if not ColumnarBatch.exists(in_dir):
+            print(f"[predict_batch] No summaries found at {in_dir}")
+            return {"predicted": 0}
+
+        # Filter articles that need predictions (conflict-related) from the
+        # is_conflict column; only those rows are parsed, one at a time
+        batch = ColumnarBatch(in_dir)
+        conflict_rows = batch.rows_where("is_conflict")
+
+        if not len(conflict_rows):
+            print(f"[predict_batch] No conflict articles found for predictions")
+            return {"predicted": 0}
+
+    # One Bedrock client per process, shared with the other stages
+    bedrock_service = bedrock_service or default_bedrock_service
+
+    # Each prediction is appended as soon as it is generated; a re-run skips
+    # the articles already predicted
+    with JsonlCheckpoint(out_path) as checkpoint:
+        if checkpoint.resumed:
+            print(f"[predict_batch] Resuming after {checkpoint.resumed} completed predictions (last {checkpoint.last_id})")
+        if conflicts is None:
+            print(f"[predict_batch] Generating AI predictions for {len(conflict_rows)} conflict articles using AWS Bedrock LLaMA...")
+            articles = checkpoint.pending(batch.records(conflict_rows))
+        else:
+            print(f"[predict_batch] Generating AI predictions for conflict articles as they are summarized...")
+            articles = _queued(conflicts, checkpoint)
+
+        # Generate predictions using AWS Bedrock LLaMA, several at a time;
+        # results come back (and are written) in article order
+        predictions = bedrock_service.iter_predictions(articles, concurrency=concurrency, timeout=timeout)
+        failed = 0
+        async for art, prediction in predictions:
             if prediction:
-                preds.append(prediction)
-        except Exception as e:
-            print(f"[predict_batch] Error generating prediction for article '{art.get('title', 'unknown')}': {e}")
-            continue
-
-    print(f"[predict_batch] Writing {len(preds)} AI-powered predictions to {out_path}")
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(preds, f, indent=2, ensure_ascii=False)
+                checkpoint.write(prediction, art["article_id"])
+            else:
+                failed += 1
+                print(f"[predict_batch] No prediction for article '{art.get('title', 'unknown')}'")
+
+    print(f"[predict_batch] Wrote {checkpoint.written} AI-powered predictions to {out_path} ({len(checkpoint.completed)} total)")
+    return {"predicted": checkpoint.written, "failed": failed, "total": len(checkpoint.completed)}
 
 if __name__ == "__main__":
     asyncio.run(run())
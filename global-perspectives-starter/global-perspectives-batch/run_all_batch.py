@@ -1,100 +1,138 @@
 #!/usr/bin/env python3
 """
 Master batch runner for AWS Bedrock AI processing pipeline.
-Orchestrates: summarization -> predictions -> analysis
+Orchestrates: summarization -> predictions
+
+The stages run in this process as coroutines sharing the module-level
+BedrockService (client, thread pool, concurrency limit) and the reference
+data loaded at import. Conflict articles are handed from summarization to
+predictions through a queue as soon as their summary is written, so the
+two overlap.
+Per-stage timing and results go to data/run_report_<date>.json.
 """
 
 import asyncio
-import subprocess
-import sys
 import datetime
+import json
+import sys
+import time
+import traceback
 from pathlib import Path
+from typing import Any, Awaitable, Dict
+
+import summarize_batch
+import predict_batch
+from backend.services.bedrock_service import bedrock_service
+
+DATA_DIR = Path(__file__).parent / "data"
 
-async def run_script(script_name: str, description: str):
-    """Run a batch script and handle errors gracefully."""
+def _now() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+async def run_stage(name: str, description: str, stage: Awaitable[Dict[str, Any]],
+                    report: Dict[str, Any], started: float) -> bool:
+    """Run one stage coroutine, recording its timing and result in the report."""
     print(f"\n{'='*60}")
     print(f"🚀 Starting {description}")
     print(f"{'='*60}")
-    
+
+    entry = {"name": name, "description": description, "ok": False, "started_at": _now(),
+             "start_offset_seconds": round(time.perf_counter() - started, 3)}
+    report["stages"].append(entry)
+    stage_start = time.perf_counter()
     try:
-        # Run the script using subprocess
-        result = subprocess.run([
-            sys.executable, script_name
-        ], cwd=Path(__file__).parent, capture_output=True, text=True)
-        
-        if result.returncode == 0:
-            print(f"✅ {description} completed successfully")
-            if result.stdout:
-                print("Output:", result.stdout)
-        else:
-            print(f"❌ {description} failed with return code {result.returncode}")
-            if result.stderr:
-                print("Error:", result.stderr)
-            if result.stdout:
-                print("Output:", result.stdout)
-            return False
-            
+        entry["result"] = await stage
+        entry["ok"] = True
+        print(f"✅ {description} completed successfully")
     except Exception as e:
+        entry["error"] = f"{type(e).__name__}: {e}"
         print(f"❌ {description} failed with exception: {e}")
-        return False
-    
-    return True
+        traceback.print_exc()
+    finally:
+        entry["finished_at"] = _now()
+        entry["duration_seconds"] = round(time.perf_counter() - stage_start, 3)
+    return entry["ok"]
+
+def output_files(today: str) -> Dict[str, Any]:
+    """Size in bytes of each output of the run (None if missing)"""
+    outputs = {}
+    for name in (f"summaries_{today}", f"predictions_{today}.jsonl"):
+        path = DATA_DIR / name
+        if path.is_dir():
+            outputs[name] = sum(p.stat().st_size for p in path.iterdir())
+        elif path.exists():
+            outputs[name] = path.stat().st_size
+        else:
+            outputs[name] = None
+    return outputs
 
 async def main():
     """Run the complete AWS Bedrock AI processing pipeline."""
     start_time = datetime.datetime.now()
+    started = time.perf_counter()
+    today = datetime.date.today().isoformat()
     print(f"🌍 Global Perspectives - AWS Bedrock AI Pipeline")
     print(f"⏰ Started at: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
-    
-    # Define the processing pipeline
-    pipeline = [
-        ("summarize_batch.py", "Article Summarization (AWS Bedrock LLaMA)"),
-        ("predict_batch.py", "Conflict Predictions (AWS Bedrock LLaMA)")
-    ]
-    
-    success_count = 0
-    
-    for script, description in pipeline:
-        success = await run_script(script, description)
-        if success:
-            success_count += 1
-        else:
-            print(f"\n⚠️  Pipeline interrupted at {description}")
-            break
-    
+
+    report = {"date": today, "started_at": _now(), "stages": []}
+
+    # Conflict articles flow from summarization into predictions; None ends the stream
+    conflicts: asyncio.Queue = asyncio.Queue()
+    summarize = asyncio.create_task(run_stage(
+        "summarize", "Article Summarization (AWS Bedrock LLaMA)",
+        summarize_batch.run(bedrock_service, conflicts), report, started,
+    ))
+    predict = asyncio.create_task(run_stage(
+        "predict", "Conflict Predictions (AWS Bedrock LLaMA)",
+        predict_batch.run(bedrock_service, conflicts), report, started,
+    ))
+    if not await summarize:
+        # The stage may have failed before it could end the stream
+        conflicts.put_nowait(None)
+        print(f"\n⚠️  Summarization failed; predicting only the articles already summarized")
+    await predict
+
     # Summary
     end_time = datetime.datetime.now()
     duration = end_time - start_time
-    
+    stages = report["stages"]
+    success_count = sum(stage["ok"] for stage in stages)
+
+    report.update({
+        "finished_at": _now(),
+        "duration_seconds": round(time.perf_counter() - started, 3),
+        "ok": success_count == len(stages),
+        "providers": {"bedrock": bedrock_service.resilience.metrics()},
+        "outputs": output_files(today),
+    })
+    report_path = DATA_DIR / f"run_report_{today}.json"
+    DATA_DIR.mkdir(exist_ok=True)
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, default=str)
+
     print(f"\n{'='*60}")
     print(f"📊 Pipeline Summary")
     print(f"{'='*60}")
-    print(f"✅ Completed: {success_count}/{len(pipeline)} stages")
+    print(f"✅ Completed: {success_count}/{len(stages)} stages")
+    for stage in stages:
+        print(f"   • {stage['name']}: {stage['duration_seconds']:.1f}s (started at +{stage['start_offset_seconds']:.1f}s)")
     print(f"⏱️  Duration: {duration}")
     print(f"🏁 Finished at: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
-    
-    if success_count == len(pipeline):
+    print(f"🧾 Run report: {report_path}")
+
+    if report["ok"]:
         print(f"🎉 All AWS Bedrock AI processing completed successfully!")
-        
+
         # Show output files
-        today = datetime.date.today().isoformat()
-        data_dir = Path("data")
-        output_files = [
-            f"summaries_{today}.json",
-            f"predictions_{today}.json"
-        ]
-        
         print(f"\n📁 Generated files:")
-        for file in output_files:
-            file_path = data_dir / file
-            if file_path.exists():
-                size = file_path.stat().st_size
-                print(f"   • {file} ({size:,} bytes)")
+        for name, size in report["outputs"].items():
+            if size is None:
+                print(f"   • {name} (not found)")
             else:
-                print(f"   • {file} (not found)")
+                print(f"   • {name} ({size:,} bytes)")
     else:
         print(f"⚠️  Pipeline completed with errors. Check logs above.")
         sys.exit(1)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
@@ -1,36 +1,93 @@
-
-import asyncio, json, datetime, sys, os
+import asyncio, datetime, sys, os
 from pathlib import Path
+from typing import Any, Dict, Optional
 
 # Add the parent directory to the path to import backend modules
 sys.path.append(str(Path(__file__).parent.parent))
 
-from backend.tools import newsapi, normalize, classify
-from backend.services.bedrock_service import BedrockService
+from backend.tools import newsapi, pipeline, columnar
+from backend.tools.batch_io import JsonlCheckpoint, iter_jsonl
+from backend.services.bedrock_service import BedrockService, bedrock_service as default_bedrock_service
+from backend.services.country_window import update_window_file, window_path
 
-DATA_DIR = Path("data")
-DATA_DIR.mkdir(exist_ok=True)
+DATA_DIR = Path(__file__).parent / "data"
 
-async def run():
+async def run(bedrock_service: Optional[BedrockService] = None,
+              conflicts: Optional[asyncio.Queue] = None) -> Dict[str, Any]:
+    """
+    Summarize today's articles. With a `conflicts` queue (run_all_batch),
+    every conflict article is put on it as soon as its summary is written,
+    followed by None when the stage ends.
+    """
     today = datetime.date.today().isoformat()
-    out_path = DATA_DIR / f"summaries_{today}.json"
-
-    print(f"[summarize_batch] Fetching today's articles...")
-    raw = await newsapi.search_today(q="*", language="en")
-    norm = normalize.normalize_articles(raw)
-    tagged = classify.classify_local_foreign(norm)
-    
-    # Initialize Bedrock service for AI-powered summarization
-    print(f"[summarize_batch] Initializing AWS Bedrock service...")
-    bedrock_service = BedrockService()
-    
-    # Use AWS Bedrock LLaMA for intelligent summarization
-    print(f"[summarize_batch] Generating AI summaries using AWS Bedrock LLaMA...")
-    summed = await bedrock_service.batch_process_articles(tagged, include_summary=True)
-
-    print(f"[summarize_batch] Writing {len(summed)} AI-powered summaries to {out_path}")
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(summed, f, indent=2, ensure_ascii=False)
+    out_dir = DATA_DIR / f"summaries_{today}"
+    concurrency = int(os.getenv("BATCH_SUMMARY_CONCURRENCY", 4))
+
+    # One Bedrock client per process, shared with the other stages
+    bedrock_service = bedrock_service or default_bedrock_service
+
+    # Each article is written to articles.jsonl as soon as its summary is
+    # back; a re-run skips the articles already in the file
+    checkpoint = JsonlCheckpoint(out_dir / "articles.jsonl").open()
+    pending = []
+    try:
+        if conflicts is not None:
+            # Summaries from an interrupted run may still need predictions
+            for article in iter_jsonl(checkpoint.path):
+                if article.get("is_conflict"):
+                    conflicts.put_nowait(article)
+
+        print(f"[summarize_batch] Fetching today's articles...")
+        raw = await newsapi.search_today(q="*", language="en")
+
+        # Unlike the API, this stage does not use dag.article_graph: the graph
+        # materializes every stage's output as a list of dicts, while the
+        # checkpoint needs a lazy per-article stream it can filter by
+        # article_id, and slotted records keep the day's pending articles
+        # compact in memory. Bedrock summaries are the slow part and still
+        # overlap, several at a time, below.
+        pending = list(checkpoint.pending(pipeline.iter_articles(raw, locations=False, enhance=False, records=True)))
+        if checkpoint.resumed:
+            print(f"[summarize_batch] Resuming after {checkpoint.resumed} completed articles (last {checkpoint.last_id})")
+
+        # Use AWS Bedrock LLaMA for intelligent summarization
+        print(f"[summarize_batch] Generating AI summaries for {len(pending)} articles using AWS Bedrock LLaMA...")
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def summarize(article):
+            async with semaphore:
+                article.update(await bedrock_service.article_summary_fields(article))
+                return article
+
+        for done in asyncio.as_completed([summarize(article) for article in pending]):
+            article = await done
+            checkpoint.write(article, article["article_id"])
+            if conflicts is not None and article.get("is_conflict"):
+                conflicts.put_nowait(article)
+    finally:
+        checkpoint.close(complete=checkpoint.written == len(pending))
+        if conflicts is not None:
+            conflicts.put_nowait(None)
+
+    # Columnar output built from the streamed file: later stages read only the columns they need
+    summed = list(iter_jsonl(checkpoint.path))
+    print(f"[summarize_batch] Writing {len(summed)} AI-powered summaries to {out_dir}")
+    columnar.write_columns(summed, out_dir, write_records=False)
+
+    # Fold articles not counted yet (the file is append-only, so they are the
+    # rows past the saved offset) into the rolling 24h-by-country statistics
+    offset_path = out_dir / "rolling_window.offset"
+    folded = int(offset_path.read_text()) if offset_path.exists() else 0
+    snapshot = update_window_file(summed[folded:])
+    offset_path.write_text(str(len(summed)))
+    print(f"[summarize_batch] Updated {window_path()}: {len(snapshot['countries'])} countries in the last 24h")
+
+    return {
+        "articles": len(summed),
+        "summarized": checkpoint.written,
+        "resumed": checkpoint.resumed,
+        "countries_last24h": len(snapshot["countries"]),
+    }
 
 if __name__ == "__main__":
     asyncio.run(run())
@@ -0,0 +1,4 @@
+import os
+
+# Responses skip pydantic validation in production; check them in tests
+os.environ.setdefault("VALIDATE_RESPONSES", "true")
@@ -0,0 +1,144 @@
+import asyncio
+import json
+import os
+import random
+
+import httpx
+
+from backend.tools import present
+from backend.tools.aggregates import PerspectiveCounts, RollingWindow
+
+HOUR = 3600
+NOW = 1_700_000_000
+
+def _articles(n, seed=0):
+    rng = random.Random(seed)
+    countries = ["US", "GB", "JP", "FR", None]
+    return [
+        {
+            "origin_country_guess": rng.choice(countries),
+            "publisher_country": rng.choice(countries),
+            "classification": rng.choice(["local", "foreign", "regional", "neutral"]),
+            "credibility_score": rng.randint(20, 95),
+            "credibility_category": rng.choice(["high", "medium", "low", "unknown"]),
+            "is_wire_service": rng.random() < 0.2,
+            "is_state_controlled": rng.random() < 0.1,
+        }
+        for _ in range(n)
+    ]
+
+def test_counts_merge_and_subtract_like_a_single_pass():
+    articles = _articles(300)
+    whole = PerspectiveCounts.from_articles(articles)
+    shards = [PerspectiveCounts.from_articles(articles[i::3]) for i in range(3)]
+    merged = shards[0] + shards[1] + shards[2]
+    assert merged == whole
+    assert merged.subtract(shards[2]) == shards[0] + shards[1]
+    assert PerspectiveCounts.from_dict(json.loads(json.dumps(whole.to_dict()))) == whole
+
+def test_counts_summary_matches_perspective_summary():
+    articles = _articles(200, seed=1)
+    expected = present.generate_perspective_summary(articles)
+    summary = PerspectiveCounts.from_articles(articles).summary()
+    for section in ("total_articles", "perspective_breakdown", "credibility_analysis"):
+        assert summary[section] == expected[section]
+    coverage = summary["country_coverage"]
+    assert coverage["publisher_distribution"] == expected["country_coverage"]["publisher_distribution"]
+    assert coverage["unique_origin_countries"] == expected["country_coverage"]["unique_origin_countries"]
+
+def test_counts_statistics_match_country_stacks():
+    articles = _articles(200, seed=2)
+    for stack in present.stack_by_country(articles):
+        origin = stack["origin_country"]
+        mine = [a for a in articles if (a["origin_country_guess"] or "UNK") == origin]
+        statistics = PerspectiveCounts.from_articles(mine).summary()["statistics"]
+        for key in ("total_articles", "local_count", "foreign_count", "regional_count",
+                    "neutral_count", "unique_foreign_countries", "coverage_diversity"):
+            assert statistics[key] == stack["statistics"][key]
+
+def test_rolling_window_expires_buckets_incrementally():
+    window = RollingWindow(window_seconds=24 * HOUR, bucket_seconds=HOUR)
+    old, recent = _articles(50, seed=3), _articles(50, seed=4)
+    for article in old:
+        window.add(article, timestamp=NOW - 30 * HOUR)
+    for article in recent:
+        window.add(article, timestamp=NOW - 2 * HOUR)
+    assert sum(c.total for c in window.totals.values()) == 100
+
+    assert window.advance(NOW) == 1
+    expected = {}
+    for article in recent:
+        expected.setdefault(article["origin_country_guess"] or "UNK", []).append(article)
+    assert set(window.totals) == set(expected)
+    for origin, items in expected.items():
+        assert window.get(origin) == PerspectiveCounts.from_articles(items).summary()
+    # Articles older than the window are ignored once it has advanced
+    assert not window.add(old[0], timestamp=NOW - 30 * HOUR)
+    assert not window.add({"published_at": None})
+
+def test_rolling_window_shards_merge_and_round_trip():
+    articles = _articles(120, seed=5)
+    whole, shards = RollingWindow(), [RollingWindow(), RollingWindow()]
+    for i, article in enumerate(articles):
+        timestamp = NOW - (i % 5) * HOUR
+        whole.add(article, timestamp=timestamp)
+        shards[i % 2].add(article, timestamp=timestamp)
+    merged = shards[0].merge(shards[1])
+    assert merged.totals == whole.totals
+
+    restored = RollingWindow.from_snapshot(json.loads(json.dumps(whole.snapshot())))
+    assert restored.totals == whole.totals
+    assert restored.snapshot()["by_country"] == whole.snapshot()["by_country"]
+
+def test_rolling_window_parses_published_at():
+    window = RollingWindow()
+    assert window.add({"published_at": "2024-05-01T10:30:00Z", "origin_country_guess": "JP"})
+    assert window.get("JP")["total_articles"] == 1
+
+# 2024-05-01T12:00:00Z
+NOON = 1714564800
+
+def test_country_endpoint_serves_batch_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", os.getenv("OPENAI_API_KEY", "test"))
+    monkeypatch.setenv("ROLLING_WINDOW_PATH", str(tmp_path / "rolling_24h.json"))
+    from backend import api
+    from backend.services.country_window import CountryWindowStore, update_window_file
+
+    monkeypatch.setattr(api, "country_window", CountryWindowStore(clock=lambda: NOON))
+    articles = [dict(a, published_at="2024-05-01T10:00:00Z") for a in _articles(40, seed=6)]
+    update_window_file(articles, now=NOON)
+
+    async def requests():
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            listing = (await client.get("/api/countries/last24h")).json()["countries"]
+            top = listing[0]["origin_country"]
+            body = (await client.get(f"/api/countries/{top.lower()}/last24h")).json()
+            missing = await client.get("/api/countries/ZZ/last24h")
+            return listing, body, missing
+
+    listing, body, missing = asyncio.run(requests())
+    assert sum(row["total_articles"] for row in listing) == 40
+    assert body["total_articles"] == listing[0]["total_articles"]
+    assert missing.status_code == 404
+
+def test_country_store_expires_buckets_without_new_batches(tmp_path):
+    from backend.services.country_window import CountryWindowStore, update_window_file
+
+    path = tmp_path / "rolling_24h.json"
+    early = [dict(a, published_at="2024-05-01T01:00:00Z") for a in _articles(30, seed=7)]
+    late = [dict(a, published_at="2024-05-01T11:00:00Z") for a in _articles(10, seed=8)]
+    update_window_file(early + late, path=path, now=NOON)
+
+    now = [NOON]
+    store = CountryWindowStore(path=path, clock=lambda: now[0])
+    assert sum(row["total_articles"] for row in store.countries()) == 40
+
+    # 01:00 has left the window by 01:30 the next day; 11:00 has not
+    now[0] = NOON + 13.5 * 3600
+    assert sum(row["total_articles"] for row in store.countries()) == 10
+
+    # A day later nothing is left, even though the file never changed
+    now[0] = NOON + 2 * 24 * 3600
+    assert store.countries() == []
+    assert all(store.get(country) is None for country in ("US", "GB", "JP", "FR", "UNK"))
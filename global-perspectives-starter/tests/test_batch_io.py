@@ -0,0 +1,63 @@
+import json
+
+from backend.tools.batch_io import JsonlCheckpoint, article_id, iter_jsonl
+
+def _articles(n):
+    return [{"title": f"story {i}", "url": f"https://example.com/{i}"} for i in range(n)]
+
+def test_checkpoint_resumes_after_a_crash(tmp_path):
+    path = tmp_path / "articles.jsonl"
+    checkpoint = JsonlCheckpoint(path).open()
+    for article in list(checkpoint.pending(_articles(10)))[:6]:
+        checkpoint.write(dict(article, summary="s"), article["article_id"])
+    # Simulate dying mid-write: no close(), half a line at the end
+    checkpoint._file.write('{"article_id": "half')
+    checkpoint._file.flush()
+    manifest = checkpoint.manifest()
+    assert manifest["completed"] == 6 and not manifest["complete"]
+
+    resumed = JsonlCheckpoint(path).open()
+    assert resumed.resumed == 6 and resumed.last_id == article_id(_articles(10)[5])
+    pending = list(resumed.pending(_articles(10)))
+    assert [a["title"] for a in pending] == [f"story {i}" for i in range(6, 10)]
+    for article in pending:
+        resumed.write(article)
+    resumed.close(complete=True)
+
+    records = list(iter_jsonl(path))
+    assert [r["title"] for r in records] == [f"story {i}" for i in range(10)]
+    assert len({r["article_id"] for r in records}) == 10
+    assert resumed.manifest()["complete"] and resumed.manifest()["completed"] == 10
+
+def test_iter_jsonl_skips_truncated_tail(tmp_path):
+    path = tmp_path / "out.jsonl"
+    path.write_text(json.dumps({"a": 1}) + "\n" + '{"a": ')
+    assert list(iter_jsonl(path)) == [{"a": 1}]
+
+def test_article_id_is_stable():
+    article = {"url": "https://example.com/x", "title": "t"}
+    assert article_id(article) == article_id(dict(article, title="other"))
+    assert article_id({"title": "only title"}) != article_id({"title": "another"})
+    assert article_id({"article_id": "given", "url": "u"}) == "given"
+
+
+def test_is_pending_tags_and_skips_completed(tmp_path):
+    with JsonlCheckpoint(tmp_path / "out.jsonl") as checkpoint:
+        checkpoint.write({"title": "done"}, article_id({"url": "https://a"}))
+        first, second = {"url": "https://a"}, {"url": "https://b"}
+        assert not checkpoint.is_pending(first)
+        assert checkpoint.is_pending(second)
+        assert second["article_id"] == article_id({"url": "https://b"})
+
+
+def test_checkpoint_writes_article_records_as_objects(tmp_path):
+    from backend.tools.records import ArticleRecord
+
+    path = tmp_path / "out.jsonl"
+    with JsonlCheckpoint(path) as checkpoint:
+        record = ArticleRecord(title="Talks resume", url="https://a", custom="kept")
+        checkpoint.write(record, article_id(record))
+
+    (line,) = iter_jsonl(path)
+    assert line == {"title": "Talks resume", "url": "https://a", "custom": "kept", "article_id": article_id({"url": "https://a"})}
+    assert JsonlCheckpoint(path).open().completed == {line["article_id"]}
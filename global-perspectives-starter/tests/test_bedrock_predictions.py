@@ -0,0 +1,129 @@
+import asyncio
+import json
+import threading
+import time
+
+from backend.services.bedrock_service import BedrockService
+from backend.services.resilience import CircuitBreaker, ProviderResilience, RetryPolicy
+
+
+class StubAgent:
+    """Blocking invoke_agent stand-in that records peak concurrency"""
+
+    def __init__(self, latency=0.05, slow_titles=()):
+        self.latency = latency
+        self.slow_titles = set(slow_titles)
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, input_text, agent_id, agent_alias_id, session_id):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            slow = any(title in input_text for title in self.slow_titles)
+            time.sleep(self.latency * (20 if slow else 1))
+            return json.dumps({"escalation_risk": 5})
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def _resilience(max_attempts=3, breaker=None):
+    return ProviderResilience(
+        "bedrock-test",
+        retry_policy=RetryPolicy(max_attempts=max_attempts, base_delay=0, max_delay=0),
+        breaker=breaker or CircuitBreaker(failure_threshold=5, reset_timeout=60),
+    )
+
+
+def _service(agent, max_concurrency=8, resilience=None):
+    service = BedrockService()
+    service.resilience = resilience or _resilience()
+    service.bedrock_agent_client = object()
+    service.predict_agent_id = "stub-agent"
+    service.max_concurrency = max_concurrency
+    service._invoke_agent_once = agent
+    return service
+
+
+def _collect(service, articles, **kwargs):
+    async def run():
+        return [item async for item in service.iter_predictions(articles, **kwargs)]
+    return asyncio.run(run())
+
+
+def test_iter_predictions_bounds_concurrency_and_keeps_order():
+    agent = StubAgent()
+    articles = [{"title": f"Article {i}"} for i in range(20)]
+
+    start = time.perf_counter()
+    results = _collect(_service(agent), iter(articles), concurrency=4)
+    elapsed = time.perf_counter() - start
+
+    assert [article["title"] for article, _ in results] == [a["title"] for a in articles]
+    assert all(prediction == {"escalation_risk": 5} for _, prediction in results)
+    assert agent.peak == 4
+    # 20 calls of 50ms, four at a time
+    assert elapsed < 20 * agent.latency / 2
+
+
+def test_service_limit_caps_runner_concurrency():
+    agent = StubAgent()
+    articles = [{"title": f"Article {i}"} for i in range(8)]
+
+    _collect(_service(agent, max_concurrency=2), articles, concurrency=8)
+
+    assert agent.peak == 2
+
+
+def test_iter_predictions_times_out_slow_articles():
+    agent = StubAgent(latency=0.02, slow_titles=["Slow"])
+    articles = [{"title": "Fast 1"}, {"title": "Slow"}, {"title": "Fast 2"}]
+
+    results = _collect(_service(agent, resilience=_resilience(max_attempts=1)), articles, concurrency=3, timeout=0.2)
+
+    assert [article["title"] for article, _ in results] == ["Fast 1", "Slow", "Fast 2"]
+    assert [prediction is not None for _, prediction in results] == [True, False, True]
+
+
+def test_timed_out_half_open_probe_reopens_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    agent = StubAgent(latency=0.02, slow_titles=["Slow"])
+    service = _service(agent, max_concurrency=1, resilience=_resilience(max_attempts=1, breaker=breaker))
+    # The first call opens the breaker, the second is the half-open probe
+    articles = [{"title": "Slow 1"}, {"title": "Slow 2"}, {"title": "Fast"}]
+
+    results = _collect(service, articles, concurrency=1, timeout=0.1)
+
+    assert [prediction is not None for _, prediction in results] == [False, False, True]
+    assert breaker.state == CircuitBreaker.CLOSED
+    # Timed-out calls keep their slot until the agent call returns
+    assert agent.peak == 1
+
+
+def test_iter_predictions_reads_from_a_queue():
+    agent = StubAgent(latency=0.01)
+
+    async def run():
+        queue = asyncio.Queue()
+
+        async def queued():
+            while (article := await queue.get()) is not None:
+                yield article
+
+        async def producer():
+            for i in range(6):
+                await asyncio.sleep(0.01)
+                queue.put_nowait({"title": f"Article {i}"})
+            queue.put_nowait(None)
+
+        feeding = asyncio.ensure_future(producer())
+        results = [item async for item in _service(agent).iter_predictions(queued(), concurrency=2)]
+        await feeding
+        return results
+
+    results = asyncio.run(run())
+    assert [article["title"] for article, _ in results] == [f"Article {i}" for i in range(6)]
+    assert all(prediction for _, prediction in results)
@@ -0,0 +1,84 @@
+import asyncio
+import json
+import os
+
+import pytest
+from botocore.exceptions import ClientError
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from backend import api
+from backend.services.resilience import CircuitBreaker, ProviderResilience, RetryPolicy
+
+
+class StubAgentClient:
+    """invoke_agent stand-in returning the given completion chunks, or raising"""
+
+    def __init__(self, chunks=(), error=None):
+        self.chunks = chunks
+        self.error = error
+
+    def invoke_agent(self, **kwargs):
+        if self.error:
+            raise self.error
+        return {"completion": [{"chunk": {"bytes": chunk}} for chunk in self.chunks]}
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    def install(client):
+        monkeypatch.setattr(api.bedrock_service, "bedrock_agent_client", client)
+        monkeypatch.setattr(api.bedrock_service, "summarize_agent_id", "stub-agent")
+        monkeypatch.setattr(api.bedrock_service, "resilience", ProviderResilience(
+            "bedrock-test",
+            retry_policy=RetryPolicy(max_attempts=1, base_delay=0, max_delay=0),
+            breaker=CircuitBreaker(failure_threshold=5, reset_timeout=60),
+        ))
+    return install
+
+
+def _events():
+    import httpx
+
+    async def post():
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post("/api/bedrock/summary/stream", json={"title": "T", "description": "D"})
+
+    response = asyncio.run(post())
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines.get("event", "message"), json.loads(lines["data"])))
+    return events
+
+
+def test_stream_yields_text_then_done(agent):
+    agent(StubAgentClient([b"Talks ", b"resumed."]))
+
+    events = _events()
+
+    assert [data["text"] for event, data in events if event == "message"] == ["Talks ", "resumed."]
+    assert events[-1][0] == "done"
+
+
+def test_multibyte_character_split_across_chunks(agent):
+    encoded = "Zürich – 東京".encode("utf-8")
+    # Cut inside "ü" and inside "東"
+    agent(StubAgentClient([encoded[:2], encoded[2:13], encoded[13:]]))
+
+    events = _events()
+
+    assert "".join(data["text"] for event, data in events if event == "message") == "Zürich – 東京"
+    assert events[-1][0] == "done"
+
+
+def test_agent_error_is_sent_as_error_event(agent):
+    error = ClientError({"Error": {"Code": "AccessDeniedException", "Message": "denied"}}, "InvokeAgent")
+    agent(StubAgentClient(error=error))
+
+    events = _events()
+
+    assert [event for event, _ in events] == ["error"]
+    assert "AccessDeniedException" in events[0][1]["detail"]
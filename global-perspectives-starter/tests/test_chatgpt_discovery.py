@@ -0,0 +1,100 @@
+import asyncio
+import json
+import os
+from types import SimpleNamespace
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from backend.services.chatgpt_discovery_service import ChatGPTDiscoveryService
+from backend.services.resilience import CircuitBreaker, ProviderResilience, RetryPolicy
+
+PLAN = {
+    "keywords": ["ceasefire", "talks"],
+    "perspectives": [
+        {"region": "Egypt", "perspective": "Mediator", "context": "Border",
+         "local_sources": [{"name": "Ahram", "url": "ahram.org.eg"}]},
+        {"region": "Qatar", "perspective": "Host", "context": "Talks",
+         "local_sources": [{"name": "Peninsula", "url": "thepeninsulaqatar.com"}]},
+    ],
+}
+
+
+class StubCompletions:
+    """AsyncOpenAI chat.completions stand-in answering by system prompt"""
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.calls = []
+
+    async def create(self, model, messages, **kwargs):
+        system = messages[0]["content"]
+        self.calls.append(system)
+        await asyncio.sleep(0)
+        content = next(answer for marker, answer in self.answers.items() if marker in system)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def _service(answers):
+    service = ChatGPTDiscoveryService()
+    completions = StubCompletions(answers)
+    service.async_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    service.resilience = ProviderResilience(
+        "chatgpt-test",
+        retry_policy=RetryPolicy(max_attempts=1, base_delay=0, max_delay=0),
+        breaker=CircuitBreaker(failure_threshold=5, reset_timeout=60),
+    )
+    return service, completions
+
+
+def test_async_plan_is_cached_and_seeds_granular_calls():
+    service, completions = _service({"": json.dumps(PLAN)})
+
+    async def discover():
+        plan = await service.discover_search_plan_async("Gaza  ceasefire", max_regions=2)
+        again = await service.discover_search_plan_async("gaza ceasefire", max_regions=2)
+        keywords = await service.generate_search_keywords_async("gaza ceasefire")
+        sources = await service.find_local_sources_for_regions("gaza ceasefire", ["Egypt", "Qatar"])
+        return plan, again, keywords, sources
+
+    plan, again, keywords, sources = asyncio.run(discover())
+
+    assert len(completions.calls) == 1
+    assert plan["mode"] == "combined" and again == plan
+    assert keywords == ["ceasefire", "talks"]
+    assert sources["Egypt"] == [{"name": "Ahram", "url": "ahram.org.eg", "region": "Egypt"}]
+
+
+def test_cached_results_are_copies():
+    service, completions = _service({"": json.dumps(PLAN)})
+
+    async def discover():
+        first = await service.discover_search_plan_async("gaza")
+        first["perspectives"][0]["region"] = "changed"
+        first["keywords"].append("added")
+        return await service.discover_search_plan_async("gaza")
+
+    plan = asyncio.run(discover())
+
+    assert len(completions.calls) == 1
+    assert plan["perspectives"][0]["region"] == "Egypt"
+    assert plan["keywords"] == ["ceasefire", "talks"]
+
+
+def test_async_granular_fallback_runs_concurrently_and_skips_empty_results():
+    service, completions = _service({
+        "local news sources worldwide": "not json",
+        "search optimization": json.dumps(["ceasefire"]),
+        "regional perspectives": json.dumps({"perspectives": [{"region": "Egypt"}, {"region": "Qatar"}]}),
+        "global media": json.dumps({"sources": []}),
+    })
+
+    plan = asyncio.run(service.discover_search_plan_async("gaza"))
+
+    assert plan["mode"] == "granular"
+    assert plan["keywords"] == ["ceasefire"]
+    assert plan["sources_by_region"] == {"Egypt": [], "Qatar": []}
+    # Combined call, keywords, perspectives and one sources call per region
+    assert len(completions.calls) == 5
+    # Empty source lists are not cached, so they are asked for again
+    asyncio.run(service.find_local_sources_async("gaza", "Egypt"))
+    assert len(completions.calls) == 6
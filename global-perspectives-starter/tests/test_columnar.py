@@ -0,0 +1,65 @@
+from collections import Counter
+
+import numpy as np
+
+from backend.tools import columnar, present
+from backend.tools.columnar import ColumnarBatch
+
+def _articles():
+    rows = [
+        ("GB", "US", "foreign", 90, "high", True),
+        ("GB", "GB", "local", 90, "high", False),
+        ("US", None, "foreign", 70, "medium", False),
+        (None, "JP", "neutral", 50, "unknown", True),
+        ("RU", "UA", "foreign", 30, "low", False),
+    ]
+    return [
+        {
+            "publisher_country": pub, "origin_country_guess": origin, "classification": cls,
+            "credibility_score": score, "credibility_category": cat, "is_conflict": conflict,
+            "title": f"story {i}", "url": f"https://example.com/{i}", "summary_phrases": [f"p{i}"],
+            "source_name": "Reuters" if i % 2 else "BBC News",
+        }
+        for i, (pub, origin, cls, score, cat, conflict) in enumerate(rows)
+    ]
+
+def test_columns_round_trip(tmp_path):
+    articles = _articles()
+    manifest = columnar.write_columns(articles, tmp_path / "batch")
+    assert manifest["rows"] == len(articles)
+
+    batch = ColumnarBatch(tmp_path / "batch")
+    assert batch.decoded("publisher_country") == [a["publisher_country"] for a in articles]
+    assert batch.text("title") == [a["title"] for a in articles]
+    assert batch.text("summary") == [None] * len(articles)
+    assert batch.column("credibility_score").dtype == np.float64
+    assert list(batch.records()) == articles
+    assert list(batch.records(batch.rows_where("is_conflict"))) == [articles[0], articles[3]]
+
+def test_article_records_are_written_as_objects(tmp_path):
+    from backend.tools.records import iter_records
+
+    articles = _articles()
+    columnar.write_columns(list(iter_records(dict(a) for a in articles)), tmp_path / "batch")
+
+    batch = ColumnarBatch(tmp_path / "batch")
+    assert list(batch.records()) == articles
+    assert batch.decoded("classification") == [a["classification"] for a in articles]
+
+def test_vectorized_aggregates_match_python(tmp_path):
+    articles = _articles()
+    columnar.write_columns(articles, tmp_path)
+    summary = ColumnarBatch(tmp_path).summary()
+    expected = present.generate_perspective_summary(articles)
+
+    assert summary["publisher_distribution"] == dict(Counter(a["publisher_country"] for a in articles if a["publisher_country"]).most_common())
+    assert summary["origin_distribution"] == expected["country_coverage"]["origin_distribution"]
+    assert summary["average_credibility"] == expected["credibility_analysis"]["average_score"]
+    assert summary["classification_breakdown"] == {"foreign": 3, "local": 1, "neutral": 1}
+    assert summary["credibility_by_publisher_country"] == {"GB": 90.0, "US": 70.0, "RU": 30.0}
+    assert summary["conflict_articles"] == 2
+
+def test_empty_batch(tmp_path):
+    columnar.write_columns([], tmp_path)
+    summary = ColumnarBatch(tmp_path).summary()
+    assert summary["total_articles"] == 0 and summary["publisher_distribution"] == {}
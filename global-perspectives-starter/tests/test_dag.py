@@ -0,0 +1,77 @@
+import time
+import asyncio
+import pytest
+from backend.tools import dag, normalize, classify, summarize, present
+
+RAW = [
+    {"title": "Tokyo braces for typhoon", "description": "Officials in Japan ordered evacuations.",
+     "url": "https://www.japantimes.co.jp/news/1", "source": {"name": "The Japan Times"}},
+    {"title": "Ukraine grain deal talks resume", "description": "Negotiators met in Istanbul; Russia attended.",
+     "url": "https://www.reuters.com/world/3", "source": {"name": "Reuters"}},
+    {"title": "Brazil central bank holds rates", "description": None,
+     "url": "https://www.ft.com/content/4", "source": {"name": "Financial Times"}},
+]
+
+
+def _fake_locate(article, copy=True):
+    article = article.copy() if copy else article
+    article["detected_locations"] = {"countries": [article["title"].split()[0]]}
+    return article
+
+
+def test_article_graph_matches_linear_chain(monkeypatch):
+    monkeypatch.setattr(dag.ner_geo, "locate_article", _fake_locate)
+    articles = summarize.summarize(classify.classify_local_foreign(normalize.normalize_articles(RAW)))
+    expected = present.enhance_articles_metadata([_fake_locate(a) for a in articles])
+
+    async def ai_fields(articles):
+        return [{"summary": f"AI: {a['title']}"} for a in articles]
+
+    result = asyncio.run(dag.run_article_pipeline(RAW, enrichments=[dag.io_enrichment("ai", ai_fields)]))
+    assert result["articles"] == [dict(a, summary=f"AI: {a['title']}") for a in expected]
+    assert result["stacks"] == present.stack_by_country(result["articles"])
+    assert result["perspective_summary"]["total_articles"] == 3
+
+
+def test_field_patches_record_writes_without_copying():
+    articles = normalize.normalize_articles(RAW)
+    before = [dict(a) for a in articles]
+
+    patches = dag.field_patches(classify.classify_article)(articles)
+
+    assert articles == before
+    for patch, article in zip(patches, before):
+        # Applying the patch gives what the in-place enrichment produces
+        assert dict(article, **patch) == classify.classify_article(dict(article))
+        assert "title" not in patch and "url" not in patch
+
+
+def test_independent_cpu_and_io_stages_overlap():
+    def cpu(x):
+        time.sleep(0.2)
+        return x + 1
+
+    async def io(x):
+        await asyncio.sleep(0.2)
+        return x * 10
+
+    graph = dag.StageGraph([
+        dag.Stage("cpu", cpu, ("x",), ("a",)),
+        dag.Stage("io", io, ("x",), ("b",), kind=dag.IO),
+        dag.Stage("sum", lambda a, b: a + b, ("a", "b"), ("total",)),
+    ])
+    timings = {}
+    start = time.perf_counter()
+    values = asyncio.run(graph.run({"x": 1}, timings=timings))
+    assert values["total"] == 12
+    assert time.perf_counter() - start < 0.35
+    assert set(timings) == {"cpu", "io", "sum"}
+
+
+def test_graph_validation():
+    with pytest.raises(ValueError):
+        dag.StageGraph([dag.Stage("a", len, ("x",), ("y",)), dag.Stage("b", len, ("x",), ("y",))])
+    with pytest.raises(ValueError):
+        dag.StageGraph([dag.Stage("a", len, ("y",), ("z",)), dag.Stage("b", len, ("z",), ("y",))])
+    with pytest.raises(ValueError):
+        asyncio.run(dag.StageGraph([dag.Stage("a", len, ("x",), ("y",))]).run({}))
@@ -0,0 +1,239 @@
+import asyncio
+import json
+import re
+
+from backend.services.gemini_verification_service import GeminiVerificationService
+from backend.services.resilience import CircuitBreaker, ProviderResilience, RetryPolicy
+from backend.services.source_credibility_cache import SourceCredibilityCache
+
+
+class StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class StubModel:
+    """generate_content stand-in answering batch prompts by article ID"""
+
+    def __init__(self, max_batch=None, error=None):
+        self.max_batch = max_batch
+        self.error = error
+        self.prompts = []
+
+    def _answer(self, prompt):
+        self.prompts.append(prompt)
+        if self.error:
+            raise self.error
+        ids = re.findall(r"\[ID: ([^\]]+)\]", prompt)
+        if self.max_batch and len(ids) > self.max_batch:
+            # A partial answer: the last article is missing
+            ids = ids[:-1]
+        return StubResponse(json.dumps({"verdicts": {i: {"authenticity_score": 80} for i in ids}}))
+
+    def generate_content(self, prompt):
+        return self._answer(prompt)
+
+    async def generate_content_async(self, prompt):
+        return self._answer(prompt)
+
+
+class ReplyModel:
+    """generate_content stand-in giving the same reply to every prompt"""
+
+    def __init__(self, reply=None, error=None):
+        self.reply = reply
+        self.error = error
+        self.prompts = []
+
+    def _answer(self, prompt):
+        self.prompts.append(prompt)
+        if self.error:
+            raise self.error
+        return StubResponse(json.dumps(self.reply))
+
+    def generate_content(self, prompt):
+        return self._answer(prompt)
+
+    async def generate_content_async(self, prompt):
+        await asyncio.sleep(0)
+        return self._answer(prompt)
+
+
+def _service(model):
+    service = GeminiVerificationService()
+    service.model = model
+    service.resilience = ProviderResilience(
+        "gemini-test",
+        retry_policy=RetryPolicy(max_attempts=2, base_delay=0, max_delay=0),
+        breaker=CircuitBreaker(failure_threshold=5, reset_timeout=60),
+    )
+    return service
+
+
+def _articles(n):
+    return [{"id": f"a{i}", "title": f"Title {i}", "content": "Body"} for i in range(n)]
+
+
+def test_partial_batch_response_is_split_until_complete():
+    model = StubModel(max_batch=1)
+    verdicts = _service(model).verify_articles_batch(_articles(4))
+
+    assert set(verdicts) == {"a0", "a1", "a2", "a3"}
+    assert all(v["authenticity_score"] == 80 for v in verdicts.values())
+    # 4 -> 2 + 2 -> 1 + 1 + 1 + 1
+    assert len(model.prompts) == 7
+
+
+def test_call_errors_fall_back_without_splitting():
+    model = StubModel(error=TimeoutError("deadline exceeded"))
+    verdicts = _service(model).verify_articles_batch(_articles(4))
+
+    assert set(verdicts) == {"a0", "a1", "a2", "a3"}
+    assert all(v["fallback"] for v in verdicts.values())
+    # One batch, two attempts, no halves
+    assert len(model.prompts) == 2
+
+
+def test_async_batch_splits_and_falls_back_like_sync():
+    split = StubModel(max_batch=2)
+    verdicts = asyncio.run(_service(split).verify_articles_batch_async(_articles(4)))
+    assert not any(v.get("fallback") for v in verdicts.values())
+    assert len(split.prompts) == 3
+
+    failing = StubModel(error=ValueError("quota exceeded"))
+    verdicts = asyncio.run(_service(failing).verify_articles_batch_async(_articles(4)))
+    assert all(v["fallback"] for v in verdicts.values())
+    assert len(failing.prompts) == 1
+
+
+def test_repeated_ids_are_kept_apart():
+    articles = [{"url": "https://x/1"}, {"url": "https://x/1"}, {"id": "b"}]
+    verdicts = _service(StubModel()).verify_articles_batch(articles)
+
+    assert list(verdicts) == ["https://x/1", "https://x/1#2", "b"]
+
+
+def test_async_authenticity_matches_sync():
+    model = ReplyModel({"authenticity_score": 91, "recommendation": "trust"})
+    service = _service(model)
+
+    sync = service.verify_article_authenticity("Officials said talks continue.", "https://reuters.com/a")
+    result = asyncio.run(service.verify_article_authenticity_async("Officials said talks continue.", "https://reuters.com/a"))
+
+    assert model.prompts[0] == model.prompts[1]
+    assert result["authenticity_score"] == 91
+    assert result["source_url"] == "https://reuters.com/a"
+    assert result.keys() == sync.keys()
+
+
+def test_async_authenticity_falls_back_on_errors_and_bad_responses():
+    failing = ReplyModel(error=TimeoutError("deadline exceeded"))
+    result = asyncio.run(_service(failing).verify_article_authenticity_async("Body", "https://x.org/a"))
+    assert result["fallback"] is True
+    # Timeouts are retried once
+    assert len(failing.prompts) == 2
+
+    # The reply is JSON null, not an analysis
+    unparsable = _service(ReplyModel())
+    assert asyncio.run(unparsable.verify_article_authenticity_async("Body", "https://x.org/a"))["fallback"] is True
+
+    no_model = _service(None)
+    assert asyncio.run(no_model.verify_article_authenticity_async("Body", "https://x.org/a"))["fallback"] is True
+
+
+def test_async_source_credibility_caches_only_real_analyses(tmp_path):
+    model = ReplyModel({"credibility_score": 72})
+    service = _service(model)
+    service.credibility_cache = SourceCredibilityCache(path=tmp_path / "cache.json")
+
+    first = asyncio.run(service.analyze_source_credibility_async("Example", "https://example.org/a"))
+    again = asyncio.run(service.analyze_source_credibility_async("Example", "https://www.example.org/b"))
+
+    assert first["credibility_score"] == 72 and "cached" not in first
+    assert again["cached"] is True and again["source_url"] == "https://www.example.org/b"
+    assert len(model.prompts) == 1
+
+    model.error = ValueError("quota exceeded")
+    fallback = asyncio.run(service.analyze_source_credibility_async("Other", "https://other.org"))
+    assert fallback["fallback"] is True
+    assert service.credibility_cache.get("other.org") is None
+
+
+class PatternModel(ReplyModel):
+    """Answers pattern prompts with the article numbers it was given"""
+
+    def _answer(self, prompt):
+        self.prompts.append(prompt)
+        numbers = [int(n) for n in re.findall(r"Article (\d+):", prompt)]
+        return StubResponse(json.dumps({
+            "overall_reliability": "low" if 1 in numbers else "high",
+            "consistency_score": 40 if 1 in numbers else 80,
+            "misinformation_risk": "medium",
+            "reliable_sources": numbers,
+            "recommendations": ["Cross-check casualty figures"],
+            "summary": f"{len(numbers)} articles",
+        }))
+
+
+def test_pattern_analysis_covers_articles_past_the_token_budget():
+    model = PatternModel()
+    service = _service(model)
+    service.batch_token_budget = 200
+    articles = [{"title": f"Title {i}", "source": "BBC", "content": "x" * 300} for i in range(10)]
+
+    analysis = service.detect_misinformation_patterns(articles)
+
+    assert len(model.prompts) > 1
+    assert analysis["batches"] == len(model.prompts)
+    # Every article was analyzed once, numbered by its position in the input
+    assert sorted(analysis["reliable_sources"]) == list(range(1, 11))
+    assert analysis["articles_count"] == analysis["articles_analyzed"] == 10
+    assert analysis["overall_reliability"] == "low"
+    assert 40 < analysis["consistency_score"] < 80
+    assert analysis["recommendations"] == ["Cross-check casualty figures"]
+
+
+def test_fact_check_merges_batches_and_skips_failed_ones():
+    class FactCheckModel(ReplyModel):
+        def _answer(self, prompt):
+            self.prompts.append(prompt)
+            if len(self.prompts) == 2:
+                raise ValueError("quota exceeded")
+            first = "Title 0" in prompt
+            return StubResponse(json.dumps({
+                "overall_accuracy": "high",
+                "confidence_level": 90,
+                "verified_facts": ["Talks resumed"] + (["Envoy arrived"] if first else []),
+                "source_reliability": {"highly_reliable": ["BBC" if first else "Reuters"]},
+                "fact_check_verdict": "true" if first else "mostly_true",
+                "explanation": "First." if first else "Later.",
+            }))
+
+    model = FactCheckModel()
+    service = _service(model)
+    service.batch_token_budget = 300
+    service.max_concurrency = 1
+    articles = [{"title": f"Title {i}", "source": "BBC", "content": "x" * 500} for i in range(6)]
+
+    summary = service.generate_fact_check_summary("talks", articles)
+
+    assert summary["batches"] == len(model.prompts) >= 3
+    assert summary["articles_analyzed"] < summary["articles_count"] == 6
+    assert summary["verified_facts"] == ["Talks resumed", "Envoy arrived"]
+    assert summary["source_reliability"] == {"highly_reliable": ["BBC", "Reuters"]}
+    assert summary["overall_accuracy"] == "high"
+    assert summary["fact_check_verdict"] == "mixed"
+    assert summary["explanation"].startswith("First.")
+
+
+def test_source_credibility_without_url_is_cached_by_name(tmp_path):
+    model = ReplyModel({"credibility_score": 64})
+    service = _service(model)
+    service.credibility_cache = SourceCredibilityCache(path=tmp_path / "cache.json")
+
+    first = service.analyze_source_credibility("Local Gazette", "")
+    again = asyncio.run(service.analyze_source_credibility_async("local gazette", None))
+
+    assert first["credibility_score"] == 64
+    assert again["cached"] is True and again["credibility_score"] == 64
+    assert len(model.prompts) == 1
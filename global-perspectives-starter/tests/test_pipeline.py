@@ -0,0 +1,34 @@
+from backend.tools import normalize, classify, summarize, present, pipeline
+
+RAW = [
+    {"title": "Tokyo braces for typhoon", "description": "Officials in Japan ordered evacuations. Trains halted.",
+     "url": "https://www.japantimes.co.jp/news/1", "source": {"name": "The Japan Times"}},
+    {"title": "Tokyo braces for typhoon", "description": "Duplicate title from another outlet.",
+     "url": "https://www.bbc.co.uk/news/2", "source": {"name": "BBC News"}},
+    {"title": "Ukraine grain deal talks resume", "description": "Negotiators met in Istanbul; Russia attended.",
+     "url": "https://www.reuters.com/world/3", "source": {"name": "Reuters"}},
+    {"title": "Brazil central bank holds rates", "description": None,
+     "url": "https://www.ft.com/content/4", "source": {"name": "Financial Times"}},
+]
+
+def _legacy():
+    articles = classify.classify_local_foreign(normalize.normalize_articles(RAW))
+    return present.enhance_articles_metadata(summarize.summarize(articles))
+
+def test_streaming_pipeline_matches_list_stages():
+    streamed = pipeline.process_articles(RAW, locations=False)
+    assert streamed == _legacy()
+    assert len(streamed) == 3
+    assert pipeline.stack_articles(RAW, locations=False) == present.stack_by_country(_legacy())
+
+def test_pipeline_is_lazy():
+    pulled = []
+
+    def source():
+        for article in RAW:
+            pulled.append(article["url"])
+            yield article
+
+    articles = pipeline.iter_articles(source(), locations=False)
+    first = next(articles)
+    assert first["classification_badge"] and len(pulled) == 1
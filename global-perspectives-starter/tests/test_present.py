@@ -0,0 +1,101 @@
+import random
+import sys
+from pathlib import Path
+
+from backend.tools import present
+from backend.tools.publisher_mapping import publisher_service
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+from legacy_present import legacy_stack_by_country
+
+def _articles(n, seed=0):
+    rng = random.Random(seed)
+    countries = ["US", "GB", "JP", "FR", "DE", "CN", "RU", "IN", "ZZ", None]
+    articles = []
+    for i in range(n):
+        article = {
+            "title": f"story {i}",
+            "origin_country_guess": rng.choice(countries),
+            "publisher_country": rng.choice(countries),
+            "classification": rng.choice(["local", "foreign", "regional", "neutral", None, "other"]),
+        }
+        if rng.random() < 0.8:
+            article["credibility_score"] = rng.choice([35, 50, 72, 88.5, 95])
+        articles.append(article)
+    return articles
+
+def test_single_pass_stacks_match_legacy_output():
+    for seed in range(5):
+        articles = _articles(400, seed)
+        assert present.stack_by_country(articles) == legacy_stack_by_country(articles)
+    assert present.stack_by_country([]) == []
+
+def test_stacks_keep_key_order_and_references():
+    articles = _articles(50)
+    stacks = present.stack_by_country(iter(articles))
+    legacy = legacy_stack_by_country(articles)
+    assert [list(s) for s in stacks] == [list(s) for s in legacy]
+    assert all(any(a is b for b in articles) for s in stacks for a in s["local"])
+
+def _classified_articles():
+    from backend.tools import classify
+    rows = [
+        ("Reuters", "https://www.reuters.com/world/1", "Ukraine talks resume"),
+        ("BBC", "https://www.bbc.co.uk/news/2", "Japan floods"),
+        ("", "https://apnews.com/article/3", "Gaza ceasefire"),
+        ("wire desk", "https://www.reuters.com/world/4", "India election"),
+        ("RT", "https://www.rt.com/news/5", "Summit in France"),
+        ("Unknown Blog", "https://blog.example/6", "Brazil protests"),
+        ("", "", "No source at all"),
+    ]
+    return classify.classify_local_foreign([
+        {"source_name": name, "url": url, "title": title, "description": title, "publisher_country": None}
+        for name, url, title in rows
+    ])
+
+def test_perspective_diversity_matches_source_resolution(monkeypatch):
+    from backend.tools import classify
+    articles = _classified_articles()
+    expected = classify.analyze_article_diversity(articles)
+
+    # Classified articles carry their publisher, so nothing is resolved again
+    def fail(name):
+        raise AssertionError(f"re-resolved {name}")
+    monkeypatch.setattr(publisher_service, "get_publisher_info", fail)
+    summary = present.generate_perspective_summary(articles)
+    assert summary["diversity_metrics"] == expected
+    assert summary["total_articles"] == len(articles)
+    assert sum(summary["perspective_breakdown"].values()) == len(articles)
+
+def test_perspective_summary_resolves_unclassified_articles():
+    from backend.tools import classify
+    articles = [{"source_name": name} for name in ["Reuters", "RT", "Reuters", "Nobody"]]
+    summary = present.generate_perspective_summary(iter(articles))
+    assert summary["diversity_metrics"] == classify.analyze_article_diversity(articles)
+    assert summary["credibility_analysis"]["average_score"] == 50
+    assert present.generate_perspective_summary([])["total_articles"] == 0
+
+def test_enhance_shares_badges_and_updates_in_place():
+    articles = _classified_articles()
+    copies = present.enhance_articles_metadata(articles)
+    assert all(copy is not article for copy, article in zip(copies, articles))
+    assert "credibility_badge" not in articles[0]
+
+    reuters = copies[0]
+    assert reuters["credibility_badge"] == {
+        "score": articles[0]["credibility_score"],
+        "category": articles[0]["credibility_category"],
+        "color": "green",
+        "label": "High Credibility",
+    }
+    assert reuters["classification_badge"] == {"type": "neutral", "label": "Wire Service", "color": "gray"}
+    assert reuters["publisher_metadata"]["country_code"] == "GB"
+    assert copies[1]["publisher_metadata"] is reuters["publisher_metadata"]
+    assert copies[5]["credibility_badge"]["label"] == "Unknown Source"
+    assert "publisher_metadata" not in copies[5]
+
+    enhanced = present.enhance_articles_metadata(articles, copy=False)
+    assert all(e is a for e, a in zip(enhanced, articles))
+    assert enhanced == copies
+    assert articles[0]["classification_badge"] is copies[0]["classification_badge"]
@@ -0,0 +1,46 @@
+import copy
+import json
+
+from backend.responses import dumps
+from backend.tools import pipeline, present
+from backend.tools.records import ArticleRecord, to_dicts
+
+def _raw(n):
+    names = ["Reuters", "BBC News", "Al Jazeera English", "Some Blog"]
+    places = ["Ukraine", "Japan", "Brazil", "France"]
+    return [
+        {
+            "source": {"id": None, "name": names[i % 4]},
+            "title": f"{places[i % 4]} story number {i} about event {i * 7}",
+            "description": f"Officials in {places[i % 4]} responded. Analysts expect more news soon.",
+            "url": f"https://example.com/{i}",
+            "publishedAt": "2024-05-01T10:00:00Z",
+        }
+        for i in range(n)
+    ]
+
+def test_record_behaves_like_a_dict():
+    record = ArticleRecord({"title": "t", "url": "u"}, custom=1)
+    assert record["title"] == "t" and record.get("custom") == 1
+    assert "summary" not in record and record.get("summary", "x") == "x"
+    record["summary"] = None
+    assert "summary" in record and record["summary"] is None
+    record.update({"classification": "local", "another": [1]})
+    assert record == {"title": "t", "url": "u", "summary": None, "classification": "local",
+                      "custom": 1, "another": [1]}
+    clone = record.copy()
+    clone["title"] = "changed"
+    del clone["custom"]
+    assert record["title"] == "t" and "custom" in record
+    assert copy.copy(record) == record
+    assert len(record) == 6 and set(record) == set(record.to_dict())
+    assert not hasattr(record, "__dict__")
+
+def test_pipeline_records_match_dicts():
+    dicts = pipeline.process_articles(_raw(40), dedupe=False, locations=False)
+    records = pipeline.process_articles(_raw(40), dedupe=False, locations=False, records=True)
+    assert all(isinstance(r, ArticleRecord) for r in records)
+    assert to_dicts(records) == dicts
+    assert present.stack_by_country(records) == present.stack_by_country(dicts)
+    assert present.generate_perspective_summary(records) == present.generate_perspective_summary(dicts)
+    assert json.loads(dumps({"articles": records})) == json.loads(dumps({"articles": dicts}))
@@ -0,0 +1,152 @@
+import asyncio
+import pytest
+from backend.services.resilience import (
+    ProviderResilience, RetryPolicy, CircuitBreaker, RetryableError, CircuitOpenError,
+)
+
+def _provider(**kwargs):
+    return ProviderResilience(
+        "test",
+        retry_policy=RetryPolicy(max_attempts=3, base_delay=0, max_delay=0),
+        breaker=kwargs.pop("breaker", CircuitBreaker(failure_threshold=3, reset_timeout=60)),
+        **kwargs,
+    )
+
+def test_retries_transient_errors_then_succeeds():
+    provider = _provider()
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise RetryableError("503")
+        return "ok"
+
+    assert asyncio.run(provider.call(flaky)) == "ok"
+    assert len(calls) == 3
+    assert provider.metrics()["retries"] == 2
+    assert provider.metrics()["breaker"]["state"] == "closed"
+
+def test_non_retryable_errors_are_not_retried():
+    provider = _provider()
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise ValueError("bad prompt")
+
+    with pytest.raises(ValueError):
+        provider.call_sync(broken)
+    assert len(calls) == 1
+
+def test_breaker_opens_and_fails_fast():
+    provider = _provider()
+
+    def down():
+        raise TimeoutError("provider down")
+
+    with pytest.raises(TimeoutError):
+        provider.call_sync(down)
+    assert provider.metrics()["breaker"]["state"] == "open"
+
+    with pytest.raises(CircuitOpenError):
+        provider.call_sync(lambda: "never called")
+    assert provider.metrics()["short_circuits"] == 1
+
+def test_half_open_probe_closes_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    provider = _provider(breaker=breaker)
+
+    with pytest.raises(TimeoutError):
+        provider.call_sync(lambda: (_ for _ in ()).throw(TimeoutError()))
+    assert provider.call_sync(lambda: "recovered") == "recovered"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_hedged_request_returns_faster_backup():
+    provider = _provider(hedge_delay=0.01)
+    started = []
+
+    async def slow_then_fast():
+        started.append(1)
+        await asyncio.sleep(1 if len(started) == 1 else 0)
+        return len(started)
+
+    assert asyncio.run(provider.call(slow_then_fast)) == 2
+    assert provider.metrics()["hedges"] == 1
+    assert provider.metrics()["hedge_wins"] == 1
+
+def test_non_retryable_half_open_probe_frees_the_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    provider = _provider(breaker=breaker)
+
+    with pytest.raises(TimeoutError):
+        provider.call_sync(lambda: (_ for _ in ()).throw(TimeoutError()))
+    with pytest.raises(ValueError):
+        provider.call_sync(lambda: (_ for _ in ()).throw(ValueError("bad prompt")))
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    # The next call is let through as a fresh probe
+    assert provider.call_sync(lambda: "recovered") == "recovered"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_cancelled_half_open_probe_is_neutral():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    provider = _provider(breaker=breaker)
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    async def ok():
+        return "recovered"
+
+    async def run():
+        with pytest.raises(TimeoutError):
+            await provider.call(lambda: (_ for _ in ()).throw(TimeoutError()))
+        # A client going away says nothing about the provider
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(provider.call(hang), timeout=0.01)
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        return await provider.call(ok)
+
+    assert asyncio.run(run()) == "recovered"
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert provider.metrics()["cancellations"] == 1
+    assert provider.metrics()["failures"] == 1
+
+def test_cancelled_disconnects_do_not_open_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    provider = _provider(breaker=breaker)
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    async def burst():
+        tasks = [asyncio.ensure_future(provider.call(hang)) for _ in range(10)]
+        await asyncio.sleep(0.01)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    asyncio.run(burst())
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_cancelling_a_hedged_call_cancels_the_primary():
+    provider = _provider(hedge_delay=1.0)
+    started = []
+
+    async def slow():
+        task = asyncio.current_task()
+        started.append(task)
+        await asyncio.sleep(10)
+
+    async def run():
+        call = asyncio.ensure_future(provider.call(slow))
+        await asyncio.sleep(0.01)
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+        await asyncio.sleep(0.01)
+        # Checked before asyncio.run cancels whatever is left over
+        return [task.cancelled() for task in started]
+
+    assert asyncio.run(run()) == [True]
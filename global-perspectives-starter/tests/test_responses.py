@@ -0,0 +1,161 @@
+import json
+from fastapi.responses import JSONResponse
+from backend.schemas import SearchResponse
+from backend.responses import FastJSONResponse, search_payload
+
+STACKS = [{"origin_country": "JP", "local": [{"title": "東京", "flag": "🇯🇵", "score": 87.5}], "foreign_by_country": {}}]
+
+def test_search_payload_matches_model_dump():
+    expected = SearchResponse(stacks=STACKS, origin_country=None, map=None, trending=None).model_dump()
+    assert search_payload(STACKS) == expected
+    assert search_payload(STACKS, articles=[])["articles"] == []
+
+def test_fast_response_matches_stdlib_encoding():
+    payload = search_payload(STACKS, tags={"b"}, counts={1: "one"})
+    body = FastJSONResponse(payload).body
+    assert json.loads(body) == json.loads(JSONResponse(search_payload(STACKS, tags=["b"], counts={"1": "one"})).body)
+
+def _expand(compact):
+    table = compact["articles_by_id"]
+    full = {k: v for k, v in compact.items() if k not in ("format", "articles_by_id")}
+    full["articles"] = [table[i] for i in compact["articles"]]
+    full["stacks"] = []
+    for stack in compact["stacks"]:
+        stack = dict(stack, local=[table[i] for i in stack["local"]])
+        stack["foreign_by_country"] = {c: [table[i] for i in ids] for c, ids in stack["foreign_by_country"].items()}
+        stack["foreign_by_country_enhanced"] = {
+            c: dict(info, articles=[table[i] for i in info["articles"]])
+            for c, info in stack["foreign_by_country_enhanced"].items()
+        }
+        full["stacks"].append(stack)
+    return full
+
+def test_compact_payload_lists_each_article_once():
+    from backend.responses import compact_payload
+    a, b, c = ({"title": t} for t in "abc")
+    stacks = [{
+        "origin_country": "JP", "local": [a], "regional": [], "neutral": [],
+        "foreign_by_country": {"US": [b, c]},
+        "foreign_by_country_enhanced": {"US": {"articles": [b, c], "article_count": 2}},
+    }]
+    payload = search_payload(stacks, articles=[a, b, c])
+    compact = compact_payload(payload)
+    assert compact["format"] == "compact"
+    assert len(compact["articles_by_id"]) == 3
+    assert compact["stacks"][0]["foreign_by_country"]["US"] == compact["articles"][1:]
+    assert _expand(compact) == payload
+
+def _stacks(n):
+    stacks, articles = [], []
+    for i in range(n):
+        local = [{"title": f"s{i}-{j}", "url": f"u{i}-{j}", "detected_locations": {"countries": ["JP"]}} for j in range(2)]
+        articles.extend(local)
+        stacks.append({"origin_country": f"C{i}", "local": local, "regional": [], "neutral": [], "foreign_by_country": {}})
+    return search_payload(stacks, articles=articles, perspective_summary={"total_articles": len(articles)})
+
+def test_cursor_pagination_walks_every_stack():
+    import pytest
+    from backend.responses import paginate_payload, decode_cursor, result_version
+    payload, key = _stacks(5), ("search", "q", "en")
+    seen, offset = [], 0
+    while True:
+        page = paginate_payload(payload, offset, 2, key)
+        seen.extend(s["origin_country"] for s in page["stacks"])
+        assert [a["title"] for a in page["articles"]] == [a["title"] for s in page["stacks"] for a in s["local"]]
+        assert page["perspective_summary"]["total_articles"] == 10
+        if not page["page"]["next_cursor"]:
+            break
+        offset, version = decode_cursor(page["page"]["next_cursor"], key)
+        assert version == result_version(payload)
+    assert seen == [f"C{i}" for i in range(5)]
+    with pytest.raises(ValueError):
+        decode_cursor(paginate_payload(payload, 0, 2, key)["page"]["next_cursor"], ("search", "other", "en"))
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor", key)
+
+def test_cursor_from_recomputed_results_is_rejected():
+    import pytest
+    from backend.responses import paginate_payload, decode_cursor, StaleCursorError
+    payload, key = _stacks(5), ("search", "q", "en")
+    offset, version = decode_cursor(paginate_payload(payload, 0, 2, key)["page"]["next_cursor"], key)
+    assert paginate_payload(payload, offset, 2, key, version)["stacks"][0]["origin_country"] == "C2"
+
+    # The cache expired and the stacks came back in another order
+    recomputed = dict(payload, stacks=payload["stacks"][::-1])
+    with pytest.raises(StaleCursorError):
+        paginate_payload(recomputed, offset, 2, key, version)
+
+def test_search_endpoint_answers_stale_cursors_with_410(monkeypatch):
+    import asyncio, os
+    import httpx
+    monkeypatch.setenv("OPENAI_API_KEY", os.getenv("OPENAI_API_KEY", "test"))
+    from backend import api
+    from backend.responses import encode_cursor
+    from backend.services.singleflight import search_key
+
+    async def cached_search(q, language, with_locations=True):
+        return _stacks(3)
+
+    monkeypatch.setattr(api, "_cached_search", cached_search)
+    key = search_key("search", "gaza", "en")
+
+    async def get(cursor):
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/api/search", params={"q": "gaza", "cursor": cursor, "limit": 1})
+
+    assert asyncio.run(get(encode_cursor(1, key, "stale"))).status_code == 410
+    assert asyncio.run(get("not-a-cursor")).status_code == 400
+    first = asyncio.run(get(None)).json()
+    assert asyncio.run(get(first["page"]["next_cursor"])).json()["stacks"][0]["origin_country"] == "C1"
+
+def test_projection_keeps_shared_articles_shared():
+    from backend.responses import project_payload, compact_payload, parse_fields
+    projected = project_payload(_stacks(2), parse_fields("title, url"))
+    assert projected["articles"][0] == {"title": "s0-0", "url": "u0-0"}
+    assert projected["articles"][0] is projected["stacks"][0]["local"][0]
+    assert len(compact_payload(projected)["articles_by_id"]) == 4
+
+def test_search_skips_location_ner_unless_requested(monkeypatch):
+    import asyncio, os
+    monkeypatch.setenv("OPENAI_API_KEY", os.getenv("OPENAI_API_KEY", "test"))
+    from backend import api
+    from backend.services.singleflight import search_flights
+    ner_calls = []
+
+    async def fake_search_today(q, language="en"):
+        return [{"title": f"Tokyo story {i}", "url": f"https://bbc.co.uk/{i}", "source": {"name": "BBC"}} for i in range(3)]
+
+    monkeypatch.setattr(api.newsapi, "search_today", fake_search_today)
+    monkeypatch.setattr(api.ner_geo, "locate_article", lambda article, copy=True: ner_calls.append(1) or article)
+    search_flights.clear()
+    async def get(params):
+        import httpx
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/api/search", params=params)
+
+    light = asyncio.run(get({"q": "tokyo", "fields": "title,url,classification", "limit": 1}))
+    assert light.status_code == 200 and ner_calls == []
+    assert "credibility_badge" not in light.text and light.json()["page"]["total_stacks"] >= 1
+    asyncio.run(get({"q": "tokyo", "fields": "title,geographic_analysis"}))
+    # One locate_article call per article; the three near-identical titles dedupe to one
+    assert ner_calls == [1]
+    assert asyncio.run(get({"q": "tokyo", "cursor": "bogus"})).status_code == 400
+    search_flights.clear()
+
+def test_validation_toggle_checks_rendered_payloads(monkeypatch):
+    import pydantic
+    import pytest
+    from backend import responses
+    good = {"title": "ok", "url": "https://example.com/1"}
+    payload = search_payload([{"origin_country": "JP", "local": [good], "foreign_by_country": {"US": [good]}}],
+                             articles=[good])
+    assert responses.validate_search_payload(payload) is payload
+
+    broken = search_payload([{"origin_country": "JP", "local": [{"title": "no url"}]}])
+    monkeypatch.setattr(responses, "VALIDATE_RESPONSES", True)
+    with pytest.raises(pydantic.ValidationError):
+        responses.render_search(broken)
+    monkeypatch.setattr(responses, "VALIDATE_RESPONSES", False)
+    assert json.loads(responses.render_search(broken).body)["stacks"][0]["local"] == [{"title": "no url"}]
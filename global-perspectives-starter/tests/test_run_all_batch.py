@@ -0,0 +1,79 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "global-perspectives-batch"))
+
+import run_all_batch
+
+
+@pytest.fixture
+def batch(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_all_batch, "DATA_DIR", tmp_path)
+    seen = {"services": [], "predicted": []}
+
+    def install(fail_summarize=False):
+        async def summarize(bedrock_service, conflicts):
+            seen["services"].append(bedrock_service)
+            if fail_summarize:
+                # Dies before it can end the stream itself
+                conflicts.put_nowait({"title": "resumed"})
+                raise RuntimeError("newsapi down")
+            for title in ("first", "second"):
+                await asyncio.sleep(0.01)
+                conflicts.put_nowait({"title": title})
+            conflicts.put_nowait(None)
+            return {"articles": 5, "summarized": 5}
+
+        async def predict(bedrock_service, conflicts):
+            seen["services"].append(bedrock_service)
+            while (article := await conflicts.get()) is not None:
+                seen["predicted"].append(article["title"])
+            return {"predicted": len(seen["predicted"])}
+
+        monkeypatch.setattr(run_all_batch.summarize_batch, "run", summarize)
+        monkeypatch.setattr(run_all_batch.predict_batch, "run", predict)
+        return seen
+
+    return install
+
+
+def _report(tmp_path):
+    (path,) = tmp_path.glob("run_report_*.json")
+    return json.loads(path.read_text())
+
+
+def test_stages_share_one_service_and_pipeline_through_the_queue(batch, tmp_path):
+    seen = batch()
+
+    asyncio.run(run_all_batch.main())
+
+    assert seen["predicted"] == ["first", "second"]
+    assert seen["services"] == [run_all_batch.bedrock_service] * 2
+    report = _report(tmp_path)
+    assert report["ok"] is True
+    assert [stage["name"] for stage in report["stages"]] == ["summarize", "predict"]
+    assert report["stages"][0]["result"] == {"articles": 5, "summarized": 5}
+    assert report["stages"][1]["result"] == {"predicted": 2}
+    # The predict stage started before summarization finished
+    summarize, predict = report["stages"]
+    assert predict["start_offset_seconds"] < summarize["start_offset_seconds"] + summarize["duration_seconds"]
+    assert "bedrock" in report["providers"]
+
+
+def test_failed_summarize_ends_the_stream_and_exits_nonzero(batch, tmp_path):
+    seen = batch(fail_summarize=True)
+
+    with pytest.raises(SystemExit) as exit_info:
+        asyncio.run(run_all_batch.main())
+
+    assert exit_info.value.code == 1
+    assert seen["predicted"] == ["resumed"]
+    report = _report(tmp_path)
+    assert report["ok"] is False
+    summarize, predict = report["stages"]
+    assert summarize["ok"] is False and summarize["error"] == "RuntimeError: newsapi down"
+    assert predict["ok"] is True and predict["result"] == {"predicted": 1}
@@ -0,0 +1,84 @@
+import os
+import json
+import asyncio
+import time
+import pytest
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from backend.services import search_stream
+
+
+@pytest.fixture
+def fake_pipeline(monkeypatch):
+    async def fake_search_today(q, language="en"):
+        titles = ["Tokyo braces for typhoon", "Yen slides against dollar", "Osaka expo draws record crowds", "Diet passes budget bill"]
+        return [{"title": titles[i], "description": "Officials in Japan said talks continue.",
+                 "url": f"https://bbc.co.uk/{i}", "source": {"name": "BBC News"}} for i in range(4)]
+
+    def slow_locations(article, copy=True):
+        time.sleep(0.05)
+        return dict(article, detected_locations={"countries": ["JP"]}, geographic_analysis={})
+
+    async def slow_summary(title, description):
+        await asyncio.sleep(0.1)
+        return f"summary of {title}"
+
+    monkeypatch.setattr(search_stream.newsapi, "search_today", fake_search_today)
+    monkeypatch.setattr(search_stream.ner_geo, "locate_article", slow_locations)
+    monkeypatch.setattr(search_stream.bedrock_service, "generate_summary", slow_summary)
+
+
+def test_articles_are_emitted_before_enrichment(fake_pipeline):
+    async def collect():
+        events, start = [], time.perf_counter()
+        async for event, data in search_stream.stream_enhanced_search("tokyo", concurrency=4):
+            events.append((event, data, time.perf_counter() - start))
+        return events
+
+    events = asyncio.run(collect())
+    first_event, payload, first_at = events[0]
+    assert first_event == "articles" and first_at < 0.05
+    assert len(payload["articles_by_id"]) == 4
+
+    patches = [data for event, data, _ in events if event == "patch"]
+    assert {(p["id"], p["stage"]) for p in patches} == {(i, s) for i in payload["articles"] for s in ("summary", "locations")}
+    assert events[-1][0] == "done" and events[-1][1]["patches"] == 8
+
+
+def test_initial_stages_run_off_the_event_loop(fake_pipeline, monkeypatch):
+    import threading
+    process_articles = search_stream.pipeline.process_articles
+    threads = []
+
+    def recording(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return process_articles(*args, **kwargs)
+
+    monkeypatch.setattr(search_stream.pipeline, "process_articles", recording)
+
+    async def first_event():
+        stream = search_stream.stream_enhanced_search("tokyo", with_locations=False)
+        event, _ = await stream.__anext__()
+        await stream.aclose()
+        return event, threading.current_thread()
+
+    event, loop_thread = asyncio.run(first_event())
+    assert event == "articles"
+    assert threads and threads[0] is not loop_thread
+
+
+def test_ndjson_stream_endpoint(fake_pipeline):
+    import httpx
+    from backend import api
+
+    async def get():
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/api/search/enhanced/stream", params={"q": "tokyo", "format": "ndjson", "locations": "false"})
+
+    response = asyncio.run(get())
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert [r["event"] for r in records] == ["articles"] + ["patch"] * 4 + ["done"]
+    assert all(r["data"]["stage"] == "summary" for r in records[1:-1])
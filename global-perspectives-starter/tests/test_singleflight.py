@@ -0,0 +1,105 @@
+import os
+import asyncio
+import pytest
+from backend.services.singleflight import SingleFlight, search_key
+
+def test_search_key_normalizes_query():
+    assert search_key("search", "  Gaza   Ceasefire ", "EN") == search_key("search", "gaza ceasefire", "en")
+    assert search_key("search", "gaza", "en") != search_key("search_ai", "gaza", "en")
+
+def test_burst_collapses_to_one_computation():
+    flights = SingleFlight(ttl_seconds=60)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"articles": [1, 2, 3]}
+
+    async def burst():
+        results = await asyncio.gather(*[flights.do(("search", "q", "en"), compute) for _ in range(200)])
+        # Requests after the burst are answered from the TTL cache
+        results.append(await flights.do(("search", "q", "en"), compute))
+        return results
+
+    results = asyncio.run(burst())
+    assert len(calls) == 1
+    assert all(r == {"articles": [1, 2, 3]} for r in results)
+    assert flights.stats()["coalesced"] == 199
+    assert flights.stats()["cache_hits"] == 1
+
+def test_waiters_share_a_payload_that_rendering_leaves_unchanged():
+    import copy
+    from backend.responses import parse_fields, render_search, search_payload
+
+    flights = SingleFlight(ttl_seconds=60)
+    key = ("search", "q", "en")
+
+    async def compute():
+        await asyncio.sleep(0.01)
+        local = [{"title": f"Story {i}", "url": f"u{i}", "source": "BBC"} for i in range(4)]
+        stacks = [{"origin_country": "GB", "local": local[:2], "regional": [], "neutral": [],
+                   "foreign_by_country": {"US": local[2:]}},
+                  {"origin_country": "FR", "local": local[2:], "regional": [], "neutral": [], "foreign_by_country": {}}]
+        return search_payload(stacks, articles=local, perspective_summary={"total_articles": 4})
+
+    async def burst():
+        results = await asyncio.gather(*[flights.do(key, compute) for _ in range(3)])
+        results.append(await flights.do(key, compute))
+        return results
+
+    results = asyncio.run(burst())
+    # No per-request copies: every waiter and cache hit gets the same object
+    assert all(r is results[0] for r in results)
+
+    payload = results[0]
+    snapshot = copy.deepcopy(payload)
+    for format in ("full", "compact"):
+        for projection in (None, parse_fields("title")):
+            for limit in (None, 1):
+                render_search(payload, format, projection, 0, limit, key)
+    assert payload == snapshot
+
+def test_failures_are_shared_but_not_cached():
+    flights = SingleFlight(ttl_seconds=60)
+    calls = []
+
+    async def broken():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def burst():
+        return await asyncio.gather(*[flights.do("k", broken) for _ in range(10)], return_exceptions=True)
+
+    assert all(isinstance(r, RuntimeError) for r in asyncio.run(burst()))
+    assert len(calls) == 1
+    asyncio.run(burst())
+    assert len(calls) == 2
+
+def test_search_endpoint_burst_hits_upstream_once(monkeypatch):
+    httpx = pytest.importorskip("httpx")
+    monkeypatch.setenv("OPENAI_API_KEY", os.getenv("OPENAI_API_KEY", "test"))
+    from backend import api
+    from backend.services.singleflight import search_flights
+
+    calls = []
+
+    async def fake_search_today(q, language="en"):
+        calls.append(q)
+        await asyncio.sleep(0.05)
+        return [{"title": f"Story {i}", "url": f"https://bbc.co.uk/{i}", "source": {"name": "BBC"}} for i in range(5)]
+
+    monkeypatch.setattr(api.newsapi, "search_today", fake_search_today)
+    search_flights.clear()
+
+    async def burst():
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            queries = ["Election Results", "election  results", "ELECTION RESULTS"] * 34
+            return await asyncio.gather(*[client.get("/api/search", params={"q": q}) for q in queries])
+
+    responses = asyncio.run(burst())
+    assert all(r.status_code == 200 for r in responses)
+    assert len(calls) == 1
+    search_flights.clear()
@@ -0,0 +1,48 @@
+import time
+from backend.services.source_credibility_cache import SourceCredibilityCache, domain_for
+from backend.tools.publisher_mapping import publisher_service
+
+def test_domain_for_strips_scheme_and_www():
+    assert domain_for("https://www.reuters.com/world/x") == "reuters.com"
+    assert domain_for("bbc.co.uk") == "bbc.co.uk"
+    assert domain_for("") is None
+
+def test_seeded_publishers_are_served_without_llm(tmp_path):
+    cache = SourceCredibilityCache(path=tmp_path / "cache.json")
+    assert cache.seed_from_publishers(publisher_service) > 0
+
+    analysis, stale = cache.get(domain_for("https://edition.reuters.com/article"))
+    assert analysis["credibility_score"] == publisher_service.get_publisher_info("Reuters").credibility_score
+    assert stale is False
+
+def test_entries_persist_and_go_stale(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = SourceCredibilityCache(path=path, ttl_seconds=100, refresh_after_seconds=10)
+    cache.put("example.org", {"credibility_score": 61})
+    cache.put("fallback.org", {"credibility_score": 50, "fallback": True})
+
+    reloaded = SourceCredibilityCache(path=path, ttl_seconds=100, refresh_after_seconds=10)
+    assert reloaded.get("example.org") == ({"credibility_score": 61}, False)
+    assert reloaded.get("fallback.org") is None
+
+    reloaded._entries["example.org"]["cached_at"] = time.time() - 50
+    assert reloaded.get("example.org")[1] is True
+    reloaded._entries["example.org"]["cached_at"] = time.time() - 500
+    assert reloaded.get("example.org") is None
+
+def test_sources_without_a_url_are_keyed_by_name(tmp_path):
+    from backend.services.source_credibility_cache import credibility_key
+    assert credibility_key("https://www.example.org/a", "Example") == "example.org"
+    assert credibility_key("", "  Example   News ") == "name:example news"
+    assert credibility_key(None, "") is None
+
+    cache = SourceCredibilityCache(path=tmp_path / "cache.json")
+    cache.seed_from_publishers(publisher_service)
+    # Known publishers are answered by name too
+    analysis, stale = cache.get(credibility_key(None, "Reuters"))
+    assert analysis["credibility_score"] == publisher_service.get_publisher_info("Reuters").credibility_score
+
+    cache.put(credibility_key(None, "Local Gazette"), {"credibility_score": 58})
+    assert cache.get(credibility_key("", "local gazette")) == ({"credibility_score": 58}, False)
+    # Name keys are matched exactly, never as parent domains
+    assert cache.get("name:gazette") is None
@@ -0,0 +1,41 @@
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "global-perspectives-batch"))
+
+import summarize_batch
+from backend.tools.batch_io import iter_jsonl
+from backend.tools.columnar import ColumnarBatch
+from backend.tools.records import ArticleRecord
+
+
+def test_summarize_stage_streams_article_records(tmp_path, monkeypatch):
+    raw = [
+        {"title": title, "description": "Officials said talks continue.", "url": f"https://reuters.com/{i}",
+         "source": {"name": "Reuters"}, "publishedAt": "2026-01-01T05:00:00Z"}
+        for i, title in enumerate(["Tokyo braces for typhoon", "Parliament passes budget bill", "Yen slides again"])
+    ]
+    summarized = []
+
+    async def search_today(**kwargs):
+        return raw
+
+    async def article_summary_fields(article):
+        summarized.append(article)
+        return {"summary": f"summary of {article['title']}"}
+
+    monkeypatch.setattr(summarize_batch, "DATA_DIR", tmp_path)
+    monkeypatch.setenv("ROLLING_WINDOW_PATH", str(tmp_path / "rolling_24h.json"))
+    monkeypatch.setattr(summarize_batch.newsapi, "search_today", search_today)
+    monkeypatch.setattr(summarize_batch.default_bedrock_service, "article_summary_fields", article_summary_fields)
+
+    result = asyncio.run(summarize_batch.run())
+
+    assert result["articles"] == result["summarized"] == 3
+    assert all(isinstance(article, ArticleRecord) for article in summarized)
+    (out_dir,) = tmp_path.glob("summaries_*")
+    lines = list(iter_jsonl(out_dir / "articles.jsonl"))
+    assert sorted(line["summary"] for line in lines) == sorted(f"summary of {a['title']}" for a in raw)
+    assert all(line["article_id"] and line["source_name"] == "Reuters" for line in lines)
+    assert ColumnarBatch(out_dir).rows == 3
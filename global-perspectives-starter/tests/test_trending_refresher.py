@@ -0,0 +1,75 @@
+import asyncio
+import os
+
+import pytest
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from backend.services import trending_refresher as module
+from backend.services.trending_refresher import TrendingRefresher
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = {"topics": 0, "headlines": 0, "search": []}
+
+    def discover_trending_topics():
+        calls["topics"] += 1
+        return [{"title": "Summit", "search_keywords": ["summit"]}]
+
+    def get_todays_headlines(topics):
+        calls["headlines"] += 1
+        return {"success": True, "topics": [{"title": t["title"], "search_keywords": t["search_keywords"]} for t in topics]}
+
+    async def search_today(q, language):
+        calls["search"].append(language)
+        return [{"title": f"{q} ({language})", "url": f"https://example.org/{language}", "source": {"name": "Example"}}]
+
+    monkeypatch.setattr(module.gemini_verification, "discover_trending_topics", discover_trending_topics)
+    monkeypatch.setattr(module.ai_orchestrator, "get_todays_headlines", get_todays_headlines)
+    monkeypatch.setattr(module.newsapi, "search_today", search_today)
+    return calls
+
+
+def test_topics_are_computed_once_for_all_languages(calls):
+    refresher = TrendingRefresher()
+
+    async def run():
+        return await refresher.get("en"), await refresher.get("fr")
+
+    en, fr = asyncio.run(run())
+
+    assert calls["topics"] == 1 and calls["headlines"] == 1
+    assert calls["search"] == ["en", "fr"]
+    assert en["headlines"]["topics"][0]["articles"][0]["language"] == "en"
+    assert fr["headlines"]["topics"][0]["articles"][0]["language"] == "fr"
+
+
+def test_unsupported_languages_share_the_default_snapshot(calls):
+    refresher = TrendingRefresher()
+
+    async def run():
+        return [await refresher.get(language) for language in ("en", "xx", "EN", "made-up", None)]
+
+    snapshots = asyncio.run(run())
+
+    assert all(snapshot is snapshots[0] for snapshot in snapshots)
+    assert set(refresher._snapshots) == {"en"}
+    assert calls["search"] == ["en"]
+
+
+def test_stale_snapshot_is_served_while_refreshing(calls):
+    refresher = TrendingRefresher()
+    refresher.interval_seconds = 0
+
+    async def run():
+        first = await refresher.get("en")
+        second = await refresher.get("en")
+        await refresher._inflight["en"]
+        return first, second, await refresher.get("en")
+
+    first, second, third = asyncio.run(run())
+
+    assert second is first
+    assert third is not first
+    assert calls["topics"] == 2
@@ -0,0 +1,52 @@
+from backend.services import ttl_cache
+from backend.services.ttl_cache import TTLCache
+
+
+def _clock(monkeypatch, start=1000.0):
+    now = [start]
+    monkeypatch.setattr(ttl_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = _clock(monkeypatch)
+    cache = TTLCache(ttl_seconds=10)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl_seconds=30)
+
+    now[0] += 9
+    assert cache.get("a") == 1
+    now[0] += 1
+    assert cache.get("a") is None
+    assert cache.get("a", "missing") == "missing"
+    # Per-entry ttl overrides the default
+    assert cache.get("b") == 2
+    assert len(cache) == 1
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_least_recently_used_entry_is_evicted(monkeypatch):
+    _clock(monkeypatch)
+    cache = TTLCache(ttl_seconds=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    # Reading "a" makes "b" the oldest
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_copy_values_isolates_callers():
+    shared = TTLCache(ttl_seconds=60)
+    copied = TTLCache(ttl_seconds=60, copy_values=True)
+    for cache in (shared, copied):
+        value = [{"name": "Reuters"}]
+        cache.set("k", value)
+        value.append({"name": "set after caching"})
+        cache.get("k")[0]["name"] = "changed by a caller"
+
+    assert shared.get("k") == [{"name": "changed by a caller"}, {"name": "set after caching"}]
+    assert copied.get("k") == [{"name": "Reuters"}]